@@ -70,6 +70,11 @@ HK_TALK = parse_hotkey("HOTKEY_TALK", "Ctrl+Alt+Shift+T")
 HK_MODEL = parse_hotkey("HOTKEY_MODEL", "Ctrl+Alt+Shift+M")
 HK_ENGINE = parse_hotkey("HOTKEY_ENGINE", "Ctrl+Alt+Shift+E")
 HK_SKILL = parse_hotkey("HOTKEY_SKILL", "Ctrl+Alt+Shift+S")
+HK_CANCEL = parse_hotkey("HOTKEY_CANCEL", "Ctrl+Alt+Shift+X")
+# Same vectors, but skip the response cache and always ask the model (registered only with the cache on)
+HK_PIXEL_FRESH = parse_hotkey("HOTKEY_PIXEL_FRESH", "Ctrl+Alt+P")
+HK_TALK_FRESH = parse_hotkey("HOTKEY_TALK_FRESH", "Ctrl+Alt+T")
+HK_FUSED = parse_hotkey("HOTKEY_FUSED", "Ctrl+Alt+Shift+V")
 
 HK_MOVE_UP = parse_hotkey("HOTKEY_MOVE_UP", "Ctrl+Alt+Up")
 HK_MOVE_DOWN = parse_hotkey("HOTKEY_MOVE_DOWN", "Ctrl+Alt+Down")
@@ -90,13 +95,68 @@ MODEL_PRO = os.getenv("MODEL_PRO", "models/gemini-3-pro-preview")
 GROQ_MODEL = os.getenv("GROQ_MODEL", "meta-llama/llama-4-maverick-17b-128e-instruct")
 GROQ_STT_MODEL = os.getenv("GROQ_STT_MODEL", "whisper-large-v3-turbo")
 THINKING_LEVEL = os.getenv("THINKING_LEVEL", "high")
+# "fixed" always uses THINKING_LEVEL; "adaptive" picks a level per turn (THINKING_LEVEL is the ceiling)
+THINKING_MODE = os.getenv("SIDECAR_THINKING_MODE", "fixed").lower()
+# Adaptive mode thinks one level harder when the skill prompt is at least this long
+THINKING_LARGE_CONTEXT_CHARS = int(os.getenv("SIDECAR_THINKING_LARGE_CONTEXT_CHARS", 16000))
+# False: thoughts are neither streamed by Gemini nor forwarded to the UI
+SHOW_THOUGHTS = os.getenv("SIDECAR_SHOW_THOUGHTS", "True").lower() == "true"
+# Sends each turn to Gemini and Groq concurrently and streams whichever answers first
+SIDECAR_RACE_MODE = os.getenv("SIDECAR_RACE_MODE", "False").lower() == "true"
 AUDIO_SAMPLE_RATE = int(os.getenv("AUDIO_SAMPLE_RATE", 16000))
 
+# --- Response Cache Configuration ---
+# Replays the stored answer when the exact same turn (screen, words, skill, history) repeats
+RESPONSE_CACHE_ENABLED = os.getenv("SIDECAR_RESPONSE_CACHE", "False").lower() == "true"
+RESPONSE_CACHE_TTL = int(os.getenv("SIDECAR_RESPONSE_CACHE_TTL", 600))
+RESPONSE_CACHE_SIZE = int(os.getenv("SIDECAR_RESPONSE_CACHE_SIZE", 64))
+_cache_file = os.getenv("SIDECAR_RESPONSE_CACHE_PATH", "")
+RESPONSE_CACHE_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, _cache_file)) if _cache_file else None
+
+# --- Record & Replay ---
+# SIDECAR_RECORD_PATH appends every live turn (chunks + timing) to a JSONL file;
+# SIDECAR_ENGINE=replay streams those turns back offline for benchmarks and bug repros
+_record_file = os.getenv("SIDECAR_RECORD_PATH", "")
+RECORD_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, _record_file)) if _record_file else None
+REPLAY_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, os.getenv("SIDECAR_REPLAY_PATH", "recordings.jsonl")))
+REPLAY_SPEED = float(os.getenv("SIDECAR_REPLAY_SPEED", 1.0)) # 2.0 = twice as fast, 0 = no delays
+REPLAY_JITTER_MS = float(os.getenv("SIDECAR_REPLAY_JITTER_MS", 0))
+REPLAY_FAILURE_RATE = float(os.getenv("SIDECAR_REPLAY_FAILURE_RATE", 0.0)) # Chance a turn fails mid-stream
+
+# --- Prompt Cache Configuration ---
+# Large skill prompts are uploaded once as Gemini cached content and referenced by name
+PROMPT_CACHE_ENABLED = os.getenv("SIDECAR_PROMPT_CACHE", "True").lower() == "true"
+PROMPT_CACHE_MIN_CHARS = int(os.getenv("SIDECAR_PROMPT_CACHE_MIN_CHARS", 16000)) # ~4k tokens, below this caching does not pay off
+PROMPT_CACHE_TTL = int(os.getenv("SIDECAR_PROMPT_CACHE_TTL", 900))
+PROMPT_CACHE_REFRESH_MARGIN = 60 # Seconds before expiry at which an active session extends the TTL
+
+# --- Image Upload (Gemini) ---
+# Opt-in: captures are uploaded to the Files API in the background and sent as references.
+# Uploaded screenshots stay in the provider's file store for up to 48h.
+IMAGE_UPLOAD_ENABLED = os.getenv("SIDECAR_IMAGE_UPLOAD", "False").lower() == "true"
+IMAGE_UPLOAD_WAIT_MS = int(os.getenv("SIDECAR_IMAGE_UPLOAD_WAIT_MS", 1500)) # Max wait for an in-flight upload (queued and View+Voice turns only)
+
+# --- Connection Configuration ---
+# Provider endpoints; override to route traffic through a proxy or a local stub server
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com").rstrip("/")
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "").rstrip("/") or None # None = SDK default
+# Idle seconds before a keep-alive ping re-warms provider connections (0 disables)
+KEEPALIVE_INTERVAL = int(os.getenv("SIDECAR_KEEPALIVE_INTERVAL", 60))
+# Pings land one interval after the last traffic, so pooled sockets outlive the gap by a full interval
+POOL_KEEPALIVE_EXPIRY = max(5.0, KEEPALIVE_INTERVAL * 2.0)
+
 # --- Ghost Configuration ---
 GHOST_MODE_AUTO = os.getenv("GHOST_MODE_AUTO", "False").lower() == "true"
 GHOST_OPACITY = float(os.getenv("GHOST_OPACITY", 0.78))
 GHOST_FONT_SIZE = int(os.getenv("GHOST_FONT_SIZE", 10))
 GHOST_FONT_FAMILY = os.getenv("GHOST_FONT_FAMILY", "Consolas")
+# Lines kept in the ghost terminal. Opt-in: with a path set, older lines move to an
+# on-disk transcript (rewritten each session); otherwise they are dropped.
+GHOST_SCROLLBACK_LINES = int(os.getenv("GHOST_SCROLLBACK_LINES", 1000))
+GHOST_SCROLLBACK_PATH = os.getenv("GHOST_SCROLLBACK_PATH", "")
+# Streamed text is merged into frames of this many ms (or chars) before reaching the UI
+CHUNK_FRAME_MS = int(os.getenv("SIDECAR_CHUNK_FRAME_MS", 16))
+CHUNK_MAX_CHARS = int(os.getenv("SIDECAR_CHUNK_MAX_CHARS", 256))
 
 # --- Debug Configuration ---
 SAVE_DEBUG_SNAPSHOTS = os.getenv("SIDECAR_DEBUG", "False").lower() == "true"
@@ -1,6 +1,6 @@
 import ctypes
 from ctypes import wintypes
-import time
+from core.utils.wakeups import wakeups
 
 # Constants
 MOD_ALT = 0x0001
@@ -12,7 +12,9 @@ WM_HOTKEY = 0x0312
 class HotkeyManager:
     def __init__(self):
         self.user32 = ctypes.windll.user32
+        self.kernel32 = ctypes.windll.kernel32
         self.hotkeys = {}
+        self.thread_id = None # Thread that owns the registrations and the message queue
 
     def register_hotkey(self, id, vk_code, callback, modifiers=None):
         """
@@ -36,26 +38,31 @@ class HotkeyManager:
     def listen(self, exit_callback=None):
         """
         Starts the message loop. 
-        Blocking call until WM_QUIT is received or interrupted.
+        Blocking call until WM_QUIT is received (see 'stop') or interrupted.
+        GetMessage sleeps in the kernel until a message arrives, so an idle
+        loop costs no wakeups (unlike a Peek + sleep poll).
         """
+        self.thread_id = self.kernel32.GetCurrentThreadId()
         msg = wintypes.MSG()
         try:
-            while True:
-                if self.user32.PeekMessageA(ctypes.byref(msg), None, 0, 0, 1):
-                    if msg.message == WM_QUIT:
-                        break
-                    
-                    if msg.message == WM_HOTKEY:
-                        id = msg.wParam
-                        if id in self.hotkeys:
-                            self.hotkeys[id]()
-                    
-                    self.user32.TranslateMessage(ctypes.byref(msg))
-                    self.user32.DispatchMessageA(ctypes.byref(msg))
-                else:
-                    time.sleep(0.05)
+            # 0 = WM_QUIT, -1 = error
+            while self.user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                wakeups.tick("hotkeys")
+                if msg.message == WM_HOTKEY:
+                    id = msg.wParam
+                    if id in self.hotkeys:
+                        self.hotkeys[id]()
+                
+                self.user32.TranslateMessage(ctypes.byref(msg))
+                self.user32.DispatchMessageW(ctypes.byref(msg))
         except KeyboardInterrupt:
             if exit_callback:
                 exit_callback()
         finally:
             self.unregister_all()
+
+    def stop(self):
+        """Ends 'listen' from any thread by posting WM_QUIT to the listening thread."""
+        if self.thread_id:
+            return bool(self.user32.PostThreadMessageW(self.thread_id, WM_QUIT, 0, 0))
+        return False
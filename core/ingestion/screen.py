@@ -1,4 +1,5 @@
 import os
+import threading
 import mss
 import mss.tools
 from datetime import datetime
@@ -8,7 +9,15 @@ from core.utils import monitor_utils
 class ScreenCapture:
     def __init__(self, monitor_index=None):
         self.monitor_index = monitor_index
-        self.sct = mss.mss()
+        self._local = threading.local()
+
+    @property
+    def sct(self):
+        # mss handles (GDI device contexts on Windows) are bound to the creating
+        # thread, and captures now run on the worker's prep pool
+        if not hasattr(self._local, "sct"):
+            self._local.sct = mss.mss()
+        return self._local.sct
 
     def set_monitor(self, index):
         self.monitor_index = index
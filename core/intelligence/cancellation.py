@@ -0,0 +1,75 @@
+import socket
+import threading
+from typing import Callable
+
+# Appended to interrupted responses so every engine records them the same way
+CANCELLED_MARKER = "[Response cancelled by user]"
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag for a single in-flight generation.
+
+    The worker creates one token per turn and hands it down to the engine.
+    Engines poll 'cancelled' between chunks and register a closer for their
+    HTTP stream via 'on_cancel', so a cancel issued from the hotkey thread
+    aborts a blocking read instead of waiting for the next token.
+    """
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self.keep_partial = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, keep_partial: bool = True):
+        """
+        Flags the generation as cancelled and fires registered closers (idempotent).
+        With keep_partial=False the engine rolls the turn back instead of recording it.
+        """
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.keep_partial = keep_partial
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            self._run_safely(callback)
+
+    def on_cancel(self, callback: Callable[[], None]):
+        """Registers a closer. Runs immediately if the token is already cancelled."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        self._run_safely(callback)
+
+    @staticmethod
+    def _run_safely(callback):
+        try:
+            callback()
+        except Exception:
+            pass # A failing closer must never break the cancelling thread
+
+def mark_cancelled(partial_text: str) -> str:
+    """Builds the assistant history entry for an interrupted response."""
+    partial_text = (partial_text or "").rstrip()
+    return f"{partial_text}\n\n{CANCELLED_MARKER}" if partial_text else CANCELLED_MARKER
+
+def abort_http_response(response):
+    """
+    Unblocks a read that is waiting on a stalled streaming response (httpx).
+    Closing the response alone only takes effect once the next byte arrives,
+    so the socket is shut down first to wake the reader immediately.
+    """
+    try:
+        network_stream = response.extensions.get("network_stream")
+        sock = network_stream.get_extra_info("socket") if network_stream else None
+        if sock:
+            sock.shutdown(socket.SHUT_RDWR)
+    except Exception:
+        pass
+    response.close()
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import List
+
+# Stand-in for screenshots from earlier turns (Context Bloat Protection)
+IMAGE_PLACEHOLDER = "[Screen capture from an earlier turn omitted]"
+
+@dataclass
+class ConversationTurn:
+    """
+    Engine-agnostic unit of conversation history.
+    Engines export their native history into these turns and render them back
+    into their own wire format, so context survives engine and model switches.
+    """
+    role: str # "user" or "assistant"
+    text: str
+
+def merge_turns(turns: List[ConversationTurn]) -> List[ConversationTurn]:
+    """Collapses consecutive same-role turns so every history renders as strictly alternating."""
+    merged = []
+    for turn in turns:
+        if merged and merged[-1].role == turn.role:
+            merged[-1] = ConversationTurn(turn.role, f"{merged[-1].text}\n\n{turn.text}")
+        else:
+            merged.append(ConversationTurn(turn.role, turn.text))
+    return merged
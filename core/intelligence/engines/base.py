@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Generator
-from core.intelligence.events import SidecarEvent
+from typing import Generator, List, Optional
+from core.intelligence.events import SidecarEvent, SidecarEventType
+from core.intelligence.cancellation import CancellationToken
+from core.intelligence.conversation import ConversationTurn
 
 class BaseEngine(ABC):
     @abstractmethod
@@ -9,14 +11,19 @@ class BaseEngine(ABC):
         pass
 
     @abstractmethod
-    def stream_analysis(self, png_bytes: bytes, additional_text: str = "") -> Generator[SidecarEvent, None, None]:
-        """Streams analysis events (text, status, etc.)"""
+    def stream_analysis(self, png_bytes: bytes, additional_text: str = "", cancel_token: Optional[CancellationToken] = None) -> Generator[SidecarEvent, None, None]:
+        """Streams analysis events (text, status, etc.). Stops early and records the partial turn if cancel_token fires."""
         pass
 
-    @abstractmethod
     def stream_pivot(self, skill_data: dict, assembled_prompt: str) -> Generator[SidecarEvent, None, None]:
-        """Pivots the session with event streaming."""
-        pass
+        """
+        Pivots the session locally with event streaming.
+        The session is rebuilt with the new system prompt and the compacted history,
+        so a skill swap costs no network round trip and leaves no override turn behind.
+        """
+        self.import_history(assembled_prompt, self.export_history())
+        yield SidecarEvent(SidecarEventType.TEXT_CHUNK, content=f"Pivot applied. System re-tasked to {skill_data['identity'][:20]}...")
+        yield SidecarEvent(SidecarEventType.FINISH)
 
     @abstractmethod
     def get_model_name(self):
@@ -32,3 +39,29 @@ class BaseEngine(ABC):
     def add_user_message(self, content: str):
         """Adds a user message to the session history."""
         pass
+
+    @abstractmethod
+    def export_history(self) -> List[ConversationTurn]:
+        """Returns the session history as engine-agnostic turns (images as placeholders)."""
+        pass
+
+    @abstractmethod
+    def import_history(self, system_prompt: str, turns: List[ConversationTurn]):
+        """Resets the session and renders the given turns into the native wire format."""
+        pass
+
+    def warm_up(self):
+        """Optional: opens the provider connection ahead of the first request."""
+        pass
+
+    def prefetch_image(self, png_bytes: bytes, patient: bool = False):
+        """
+        Optional: starts uploading a capture so the next request can reference it instead of inlining it.
+        'patient' marks a capture whose turn starts late anyway, so its request may wait for the upload.
+        """
+        pass
+
+    @abstractmethod
+    def record_exchange(self, user_text: str, assistant_text: str):
+        """Commits a completed text-only turn to the history without a network call."""
+        pass
@@ -1,97 +1,418 @@
+import hashlib
+import io
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from google import genai
 from google.genai import types
-from typing import Generator
+from typing import Generator, List, Optional
 from core.config import settings
 from core.intelligence.engines.base import BaseEngine
 from core.intelligence.events import SidecarEvent, SidecarEventType
+from core.intelligence.conversation import ConversationTurn, IMAGE_PLACEHOLDER, merge_turns
+from core.intelligence.cancellation import CancellationToken, abort_http_response, mark_cancelled
+from core.utils.connection_warmer import pool_limits
+from core.intelligence.telemetry import StreamTimer
+from core.intelligence.upload_manager import UploadManager
+from core.utils.logger import logger
+
+THINKING_LEVELS = ["minimal", "low", "medium", "high"]
+# Gemini Pro only accepts low/high; other levels are rounded to the nearest supported one
+PRO_THINKING_LEVELS = {"minimal": "low", "low": "low", "medium": "high", "high": "high"}
+LONG_UTTERANCE_CHARS = 280
+# The Files API deletes uploads after 48h; references are dropped an hour earlier
+FILE_REFERENCE_TTL = 47 * 3600
+
+def adaptive_thinking_level(has_image: bool, text: str, system_prompt_chars: int) -> str:
+    """
+    Latency-target policy: think only as hard as the turn needs.
+    1. Short Talk follow-ups -> low; long utterances or a bare Pixel view -> medium;
+       a view plus a spoken question -> high.
+    2. A large skill context raises the level one step.
+    3. THINKING_LEVEL is the ceiling.
+    """
+    if has_image and text:
+        level = 3
+    elif has_image or len(text or "") >= LONG_UTTERANCE_CHARS:
+        level = 2
+    else:
+        level = 1
+    if system_prompt_chars >= settings.THINKING_LARGE_CONTEXT_CHARS:
+        level += 1
+    
+    ceiling = settings.THINKING_LEVEL.lower()
+    ceiling = THINKING_LEVELS.index(ceiling) if ceiling in THINKING_LEVELS else len(THINKING_LEVELS) - 1
+    return THINKING_LEVELS[min(level, ceiling)]
 
 class GeminiEngine(BaseEngine):
     def __init__(self, api_key):
-        self.client = genai.Client(api_key=api_key)
+        self._local = threading.local() # Per-thread receiver for the streaming response of a turn
+        self.client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(
+                base_url=settings.GEMINI_BASE_URL,
+                client_args={"limits": pool_limits(), "event_hooks": {"response": [self._on_response]}}
+            )
+        )
         self.use_pro_model = False
         self.chat_session = None
         self.current_system_prompt = ""
+        self.model_id = settings.MODEL_FLASH
+        self.session_config = None
+        
+        # Provider-side cache of the system prompt: (prompt hash, model) -> cached content name
+        self.prompt_cache_name = None
+        self._prompt_cache_key = None
+        self._prompt_cache_expires = 0.0
+        # Handles are created and deleted off the calling thread; a new one is adopted at the next send
+        self._prompt_cache_future: Optional[Future] = None
+        self._prompt_cache_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sidecar-prompt-cache")
+        
+        # Captures pushed to the Files API ahead of the request and sent as URI references
+        self.uploads = None
+        if settings.IMAGE_UPLOAD_ENABLED:
+            self.uploads = UploadManager(self._upload_image, ttl=FILE_REFERENCE_TTL, wait_ms=settings.IMAGE_UPLOAD_WAIT_MS)
 
-    def init_session(self, system_prompt):
+    def init_session(self, system_prompt, history: Optional[list] = None):
         self.current_system_prompt = system_prompt
-        model_id = settings.MODEL_PRO if self.use_pro_model else settings.MODEL_FLASH
-        
-        config = types.GenerateContentConfig(
-            system_instruction=self.current_system_prompt,
-            temperature=1.0,
-            thinking_config=types.ThinkingConfig(
-                include_thoughts=True,
-                thinking_level=settings.THINKING_LEVEL
+        self.model_id = settings.MODEL_PRO if self.use_pro_model else settings.MODEL_FLASH
+        self._build_session_config()
+        self._rebuild_session(history or [])
+
+    def _build_session_config(self):
+        thinking_config = self._thinking_config(settings.THINKING_LEVEL)
+        self._schedule_prompt_cache()
+        if self.prompt_cache_name:
+            # The system instruction lives in the cached content; it must not be sent again
+            self.session_config = types.GenerateContentConfig(
+                cached_content=self.prompt_cache_name,
+                temperature=1.0,
+                thinking_config=thinking_config
+            )
+        else:
+            self.session_config = types.GenerateContentConfig(
+                system_instruction=self.current_system_prompt,
+                temperature=1.0,
+                thinking_config=thinking_config
+            )
+
+    def _thinking_config(self, level: str) -> types.ThinkingConfig:
+        if self.use_pro_model:
+            level = PRO_THINKING_LEVELS.get(level.lower(), level)
+        # Without visible thoughts the model still reasons, but the thought text is never streamed
+        return types.ThinkingConfig(include_thoughts=settings.SHOW_THOUGHTS, thinking_level=level)
+
+    def _turn_config(self, png_bytes: bytes, additional_text: str):
+        """Per-request config override carrying this turn's thinking level (None = session default)."""
+        if settings.THINKING_MODE != "adaptive":
+            return None, settings.THINKING_LEVEL
+        level = adaptive_thinking_level(bool(png_bytes), additional_text, len(self.current_system_prompt or ""))
+        config = self.session_config.model_copy(update={"thinking_config": self._thinking_config(level)})
+        return config, level
+
+    def _schedule_prompt_cache(self):
+        """
+        Starts creating a cached-content handle for the current system prompt in the background.
+        Large skill contexts are uploaded once and referenced by name instead of being
+        resent with every request. A new skill, pivot or model drops the old handle.
+        Until the handle is ready the prompt travels inline, so no session change waits on it.
+        """
+        prompt = self.current_system_prompt
+        if not settings.PROMPT_CACHE_ENABLED or len(prompt or "") < settings.PROMPT_CACHE_MIN_CHARS:
+            self.invalidate_prompt_cache()
+            return
+
+        key = (hashlib.sha256(prompt.encode("utf-8")).hexdigest(), self.model_id)
+        if key == self._prompt_cache_key:
+            return
+
+        self.invalidate_prompt_cache()
+        # Remember the key even on failure so an uncacheable prompt is not retried every turn
+        self._prompt_cache_key = key
+        self._prompt_cache_future = self._prompt_cache_pool.submit(self._create_prompt_cache, prompt, self.model_id)
+
+    def _create_prompt_cache(self, prompt: str, model_id: str) -> Optional[str]:
+        try:
+            cache = self.client.caches.create(
+                model=model_id,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=prompt,
+                    display_name="sidecar-skill",
+                    ttl=f"{settings.PROMPT_CACHE_TTL}s"
+                )
+            )
+        except Exception as e:
+            logger.debug(f"Prompt cache unavailable, sending the system prompt inline: {e}")
+            return None
+        logger.debug(f"Prompt cache created: {cache.name} ({len(prompt)} chars)")
+        return cache.name
+
+    def _adopt_prompt_cache(self):
+        """Switches the session to the cached prompt once its handle is ready (local rebuild, never waits)."""
+        future = self._prompt_cache_future
+        if future is None or not future.done():
+            return
+        self._prompt_cache_future = None
+        name = future.result()
+        if not name:
+            return
+        self.prompt_cache_name = name
+        self._prompt_cache_expires = time.time() + settings.PROMPT_CACHE_TTL
+        history = self.chat_session.get_history(curated=True) if self.chat_session else []
+        self._build_session_config()
+        self._rebuild_session(history)
+
+    def _refresh_prompt_cache(self):
+        """Extends the cache TTL shortly before it expires; recreates it if it is already gone."""
+        if not self.prompt_cache_name:
+            return
+        if time.time() < self._prompt_cache_expires - settings.PROMPT_CACHE_REFRESH_MARGIN:
+            return
+        try:
+            self.client.caches.update(
+                name=self.prompt_cache_name,
+                config=types.UpdateCachedContentConfig(ttl=f"{settings.PROMPT_CACHE_TTL}s")
             )
+            self._prompt_cache_expires = time.time() + settings.PROMPT_CACHE_TTL
+        except Exception as e:
+            logger.debug(f"Prompt cache refresh failed, recreating: {e}")
+            history = self.chat_session.get_history(curated=True)
+            self.prompt_cache_name = None
+            self._prompt_cache_key = None
+            self._build_session_config()
+            self._rebuild_session(history)
+
+    def invalidate_prompt_cache(self):
+        """Drops the provider-side prompt cache; the delete runs in the background (best effort, it expires by TTL anyway)."""
+        if self.prompt_cache_name or self._prompt_cache_future:
+            self._prompt_cache_pool.submit(self._delete_prompt_cache, self.prompt_cache_name, self._prompt_cache_future)
+        self.prompt_cache_name = None
+        self._prompt_cache_key = None
+        self._prompt_cache_expires = 0.0
+        self._prompt_cache_future = None
+
+    def _delete_prompt_cache(self, name: Optional[str], pending: Optional[Future]):
+        # The pool has one worker, so a pending create has finished by the time this runs
+        if pending is not None and not pending.cancelled():
+            name = name or pending.result()
+        if not name:
+            return
+        try:
+            self.client.caches.delete(name=name)
+        except Exception as e:
+            logger.debug(f"Prompt cache delete failed: {e}")
+
+    def _upload_image(self, png_bytes: bytes) -> str:
+        uploaded = self.client.files.upload(
+            file=io.BytesIO(png_bytes),
+            config=types.UploadFileConfig(mime_type="image/png", display_name="sidecar-capture")
         )
-        self.chat_session = self.client.chats.create(model=model_id, config=config)
+        return uploaded.uri
+
+    def prefetch_image(self, png_bytes: bytes, patient: bool = False):
+        if self.uploads:
+            self.uploads.prefetch(png_bytes, patient=patient)
+
+    def _image_part(self, png_bytes: bytes) -> types.Part:
+        """A file reference when the capture's upload has finished (or its turn may wait for it), else the inline bytes."""
+        uri = self.uploads.reference(png_bytes) if self.uploads else None
+        if uri:
+            return types.Part.from_uri(file_uri=uri, mime_type="image/png")
+        return types.Part.from_bytes(data=png_bytes, mime_type="image/png")
+
+    def _rebuild_session(self, history):
+        """Recreates the chat with the current model/config and the given history (no network call)."""
+        self.chat_session = self.client.chats.create(
+            model=self.model_id,
+            config=self.session_config,
+            history=history
+        )
+
+    def _prune_history_images(self):
+        """
+        Context Bloat Protection: blinds images from previous turns.
+        The chat re-sends its full history with every request, so image parts
+        (inline or file references) are swapped for a short text placeholder
+        before the next send.
+        """
+        history = self.chat_session.get_history(curated=True)
+        if not any(part.inline_data or part.file_data for content in history for part in (content.parts or [])):
+            return
+
+        pruned = []
+        for content in history:
+            parts = [
+                types.Part.from_text(text=IMAGE_PLACEHOLDER) if part.inline_data or part.file_data else part
+                for part in (content.parts or [])
+            ]
+            pruned.append(types.Content(role=content.role, parts=parts))
+        self._rebuild_session(pruned)
 
-    def stream_analysis(self, png_bytes: bytes, additional_text: str = "") -> Generator[SidecarEvent, None, None]:
+    def export_history(self) -> List[ConversationTurn]:
+        """
+        Model-neutral copy of the chat history.
+        Images become placeholders, thought parts (and their model-bound signatures)
+        are dropped, and the per-chunk model contents recorded by the SDK while
+        streaming are merged into a single turn.
+        """
+        if not self.chat_session:
+            return []
+
+        turns = []
+        for content in self.chat_session.get_history(curated=True):
+            texts = []
+            for part in (content.parts or []):
+                if part.thought:
+                    continue
+                if part.inline_data or part.file_data:
+                    texts.append(IMAGE_PLACEHOLDER)
+                elif part.text:
+                    texts.append(part.text)
+            
+            role = "assistant" if content.role == "model" else "user"
+            # Model chunks are fragments of one stream; user parts are separate blocks
+            text = "".join(texts) if role == "assistant" else "\n".join(texts)
+            if turns and turns[-1].role == role and role == "assistant":
+                turns[-1].text += text
+            else:
+                turns.append(ConversationTurn(role, text))
+        return merge_turns(turns)
+
+    def import_history(self, system_prompt: str, turns: List[ConversationTurn]):
+        """Starts a fresh chat whose history is rendered from neutral turns (no network call; prompt caching runs in the background)."""
+        history = [
+            types.Content(
+                role="model" if turn.role == "assistant" else "user",
+                parts=[types.Part.from_text(text=turn.text or "...")]
+            )
+            for turn in merge_turns(turns)
+        ]
+        self.init_session(system_prompt, history)
+
+    def stream_analysis(self, png_bytes: bytes, additional_text: str = "", cancel_token: Optional[CancellationToken] = None) -> Generator[SidecarEvent, None, None]:
         if not self.chat_session:
             self.init_session(self.current_system_prompt)
 
+        content_parts = []
+        full_response = ""
+        timer = None
         try:
-            content_parts = []
             if png_bytes:
-                content_parts.append("Analyze this view.")
-                image_part = types.Part.from_bytes(data=png_bytes, mime_type="image/png")
-                content_parts.append(image_part)
+                content_parts.append(types.Part.from_text(text="Analyze this view."))
+                content_parts.append(self._image_part(png_bytes))
             
             if additional_text:
-                content_parts.append(f"\n[CONVERSATION TURN]: {additional_text}")
+                content_parts.append(types.Part.from_text(text=f"\n[CONVERSATION TURN]: {additional_text}"))
             
             if not content_parts:
                  yield SidecarEvent(SidecarEventType.ERROR, content="No visual or verbal context provided.")
                  return
             
-            stream = self.chat_session.send_message_stream(message=content_parts)
+            self._prune_history_images()
+            self._adopt_prompt_cache()
+            self._refresh_prompt_cache()
+            
+            turn_config, level = self._turn_config(png_bytes, additional_text)
+            # Samples are split by thinking level so its effect on TTFT shows in the percentiles
+            timer = StreamTimer("gemini", f"{self.model_id} [{level}]")
+            if cancel_token:
+                self._bind_cancel(cancel_token)
+            stream = self.chat_session.send_message_stream(message=content_parts, config=turn_config)
             for chunk in stream:
+                if cancel_token and cancel_token.cancelled:
+                    # Closing the generator tears down the SDK's HTTP stream
+                    stream.close()
+                    break
+                
+                timer.mark_byte()
+                if chunk.usage_metadata:
+                    usage = chunk.usage_metadata
+                    timer.completion_tokens = (usage.candidates_token_count or 0) + (usage.thoughts_token_count or 0) or None
+                    
                 if chunk.candidates[0].content and chunk.candidates[0].content.parts:
                     for part in chunk.candidates[0].content.parts:
                         if part.thought:
+                            if not settings.SHOW_THOUGHTS:
+                                continue
+                            timer.mark_chunk(part.text or "", is_thought=True)
                             yield SidecarEvent(SidecarEventType.TEXT_CHUNK, content=part.text, metadata={"is_thought": True})
                         elif part.text:
+                            timer.mark_chunk(part.text)
+                            full_response += part.text
                             yield SidecarEvent(SidecarEventType.TEXT_CHUNK, content=part.text)
                     
-            yield SidecarEvent(SidecarEventType.FINISH)
-                    
         except Exception as e:
-            yield SidecarEvent(SidecarEventType.ERROR, content=str(e))
-
-    def stream_pivot(self, skill_data: dict, assembled_prompt: str) -> Generator[SidecarEvent, None, None]:
-        self.current_system_prompt = assembled_prompt
-        override_msg = f"""[SYSTEM OVERRIDE]: Re-tasking sequence initiated. 
-# NEW IDENTITY
-{skill_data['identity']}
-# NEW OPERATIONAL INSTRUCTIONS
-{skill_data['instructions']}
-# NEW SESSION DATA (CONTEXT)
-{skill_data['context']}
-Please acknowledge you have absorbed these new instructions."""
-        
-        try:
-            stream = self.chat_session.send_message_stream(override_msg)
-            for chunk in stream:
-                for candidate in chunk.candidates:
-                    if candidate.content and candidate.content.parts:
-                        for part in candidate.content.parts:
-                            if part.text:
-                                yield SidecarEvent(SidecarEventType.TEXT_CHUNK, content=part.text)
-            yield SidecarEvent(SidecarEventType.FINISH)
-        except Exception as e:
-            yield SidecarEvent(SidecarEventType.ERROR, content=str(e))
+            # A read aborted by a cancel is expected, not an API failure
+            if not (cancel_token and cancel_token.cancelled):
+                yield SidecarEvent(SidecarEventType.ERROR, content=str(e))
+                return
+        finally:
+            self._local.on_response = None
+
+        if cancel_token and cancel_token.cancelled:
+            # The SDK only records history on exhaustion, so the partial turn is recorded here
+            if cancel_token.keep_partial:
+                self._record_cancelled_turn(content_parts, full_response)
+            yield SidecarEvent(SidecarEventType.STATUS, content="Generation cancelled.")
+            yield SidecarEvent(SidecarEventType.FINISH, metadata={"cancelled": True, "metrics": timer.finish(cancelled=True) if timer else None})
+            return
 
+        yield SidecarEvent(SidecarEventType.FINISH, metadata={"metrics": timer.finish()})
+
+    def _on_response(self, response):
+        """httpx response hook: hands the response to the turn streaming on this thread, if any."""
+        receiver = getattr(self._local, "on_response", None)
+        if receiver:
+            receiver(response)
+
+    def _bind_cancel(self, cancel_token: CancellationToken):
+        """
+        Lets a cancel abort this thread's streaming response, so a stalled stream
+        (or one still waiting for its first token) stops at once instead of at the next chunk.
+        """
+        responses = []
+        def on_response(response):
+            responses.append(response)
+            if cancel_token.cancelled:
+                abort_http_response(response)
+        def abort_all():
+            for response in list(responses):
+                abort_http_response(response)
+        self._local.on_response = on_response
+        cancel_token.on_cancel(abort_all)
+
+    def _record_cancelled_turn(self, content_parts: list, partial_text: str):
+        """Commits the user turn and the visible part of an interrupted response to the chat history."""
+        self.chat_session.record_history(
+            user_input=types.Content(role="user", parts=content_parts),
+            model_output=[types.Content(role="model", parts=[types.Part.from_text(text=mark_cancelled(partial_text))])],
+            is_valid=True
+        )
 
     def get_model_name(self):
         if self.use_pro_model:
-            return f"GEMINI PRO ({settings.THINKING_LEVEL})"
+            level = "adaptive" if settings.THINKING_MODE == "adaptive" else settings.THINKING_LEVEL
+            return f"GEMINI PRO ({level})"
         return "GEMINI FLASH"
 
     def toggle_model(self):
+        # Carry the conversation over so the new model answers in context without a re-priming turn
+        turns = self.export_history()
         self.use_pro_model = not self.use_pro_model
-        self.init_session(self.current_system_prompt)
+        self.import_history(self.current_system_prompt, turns)
         return self.use_pro_model
 
+    def warm_up(self):
+        # Cheap metadata GET that leaves a TLS connection in the client's pool
+        self.client.models.get(model=self.model_id)
+
+    def record_exchange(self, user_text: str, assistant_text: str):
+        self.chat_session.record_history(
+            user_input=types.Content(role="user", parts=[types.Part.from_text(text=user_text)]),
+            model_output=[types.Content(role="model", parts=[types.Part.from_text(text=assistant_text)])],
+            is_valid=True
+        )
+
     def add_user_message(self, content: str):
         # The Gemini chat session manages history automatically when send_message is called.
         # If we need to inject history without a response, we'd manually update session.history.
@@ -1,14 +1,23 @@
 import base64
 import json
-from typing import Generator
-from groq import Groq
+from typing import Generator, List, Optional
+from groq import Groq, DefaultHttpxClient
 from core.config import settings
 from core.intelligence.engines.base import BaseEngine
 from core.intelligence.events import SidecarEvent, SidecarEventType
+from core.intelligence.cancellation import CancellationToken, abort_http_response, mark_cancelled
+from core.intelligence.conversation import ConversationTurn, IMAGE_PLACEHOLDER, merge_turns
+from core.utils.connection_warmer import pool_limits
+from core.intelligence.telemetry import StreamTimer
+from core.utils.logger import logger
 
 class GroqEngine(BaseEngine):
     def __init__(self, api_key):
-        self.client = Groq(api_key=api_key)
+        self.client = Groq(
+            api_key=api_key,
+            base_url=settings.GROQ_BASE_URL,
+            http_client=DefaultHttpxClient(limits=pool_limits())
+        )
         self.model_id = settings.GROQ_MODEL
         self.messages = []
         self.system_prompt = ""
@@ -17,10 +26,36 @@ class GroqEngine(BaseEngine):
         self.system_prompt = system_prompt
         self.messages = [{"role": "system", "content": self.system_prompt}]
         
+    def export_history(self) -> List[ConversationTurn]:
+        turns = []
+        for msg in self.messages:
+            if msg["role"] == "system":
+                continue
+            content = msg["content"]
+            if isinstance(content, list):
+                content = "\n".join(
+                    IMAGE_PLACEHOLDER if p.get("type") == "image_url" else p.get("text", "")
+                    for p in content
+                )
+            turns.append(ConversationTurn(msg["role"], content))
+        return merge_turns(turns)
+
+    def import_history(self, system_prompt: str, turns: List[ConversationTurn]):
+        self.init_session(system_prompt)
+        self.messages.extend({"role": t.role, "content": t.text} for t in merge_turns(turns))
+
     def add_user_message(self, content: str):
         self.messages.append({"role": "user", "content": content})
 
-    def stream_analysis(self, png_bytes: bytes, additional_text: str = "") -> Generator[SidecarEvent, None, None]:
+    def warm_up(self):
+        # Cheap metadata GET that leaves a TLS connection in the client's pool
+        self.client.models.list()
+
+    def record_exchange(self, user_text: str, assistant_text: str):
+        self.messages.append({"role": "user", "content": user_text})
+        self.messages.append({"role": "assistant", "content": assistant_text})
+
+    def stream_analysis(self, png_bytes: bytes, additional_text: str = "", cancel_token: Optional[CancellationToken] = None) -> Generator[SidecarEvent, None, None]:
         user_content = []
         
         if png_bytes:
@@ -42,30 +77,36 @@ class GroqEngine(BaseEngine):
              yield SidecarEvent(SidecarEventType.ERROR, content="No context provided.")
              return
 
+        self._compact_history()
         self.messages.append({"role": "user", "content": user_content})
         
         if settings.SAVE_DEBUG_SNAPSHOTS:
-            from core.utils.logger import logger
             logger.debug(f"Sending {len(self.messages)} messages to Groq. (Last content size: {len(str(user_content))})")
 
-        # Context Bloat Protection: Blind previous images to save tokens
-        scrubbed_messages = []
-        for i, msg in enumerate(self.messages):
-            if i < len(self.messages) - 1 and isinstance(msg.get("content"), list):
-                # Remove image from older turns, leave only text
-                text_only = [p for p in msg["content"] if p.get("type") == "text"]
-                scrubbed_messages.append({"role": msg["role"], "content": text_only})
-            else:
-                scrubbed_messages.append(msg)
+        yield from self._execute_chat_completion(self.messages, cancel_token)
 
-        yield from self._execute_chat_completion(scrubbed_messages)
+    def _compact_history(self):
+        """
+        Context Bloat Protection: blinds images from previous turns, in place.
+        Storing the compacted form (rather than re-scrubbing a copy per request) keeps
+        the system prompt and older turns byte-identical across requests, which is
+        the stable prefix Groq's prompt caching matches on.
+        """
+        for msg in self.messages:
+            if isinstance(msg.get("content"), list):
+                msg["content"] = "\n".join(
+                    IMAGE_PLACEHOLDER if p.get("type") == "image_url" else p.get("text", "")
+                    for p in msg["content"]
+                )
 
-    def _execute_chat_completion(self, messages_to_send=None) -> Generator[SidecarEvent, None, None]:
+    def _execute_chat_completion(self, messages_to_send=None, cancel_token: Optional[CancellationToken] = None) -> Generator[SidecarEvent, None, None]:
         if messages_to_send is None:
             messages_to_send = self.messages
             
         yield SidecarEvent(SidecarEventType.STATUS, content=f"Initializing {self.model_id} handshake...")
         
+        full_response = ""
+        timer = StreamTimer("groq", self.model_id)
         try:
             stream = self.client.chat.completions.create(
                 model=self.model_id,
@@ -74,35 +115,64 @@ class GroqEngine(BaseEngine):
                 max_completion_tokens=4096
             )
             
+            # Aborting the stream from the cancelling thread frees the blocking socket read
+            if cancel_token:
+                cancel_token.on_cancel(lambda: self._abort_stream(stream))
+            
             yield SidecarEvent(SidecarEventType.STATUS, content="Connection established. Streaming...")
             
-            full_response = ""
             for chunk in stream:
+                if cancel_token and cancel_token.cancelled:
+                    break
+                timer.mark_byte()
+                # Groq attaches token usage to the final chunk
+                usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+                if usage:
+                    timer.completion_tokens = usage.completion_tokens
+                    self._log_prompt_cache(usage)
                 if len(chunk.choices) > 0:
                     delta = chunk.choices[0].delta
                     if delta.content:
+                        timer.mark_chunk(delta.content)
                         full_response += delta.content
                         yield SidecarEvent(SidecarEventType.TEXT_CHUNK, content=delta.content)
-            
-            if full_response:
-                self.messages.append({"role": "assistant", "content": full_response})
-            
-            yield SidecarEvent(SidecarEventType.FINISH)
                     
         except Exception as e:
-            error_msg = f"Groq API Error: {str(e)}"
-            # Handle model not found specifically
-            if "not found" in str(e).lower() or "model" in str(e).lower():
-                error_msg = f"Model '{self.model_id}' rejected by Groq. Please verify the ID in the Groq panel and .env."
-            yield SidecarEvent(SidecarEventType.ERROR, content=error_msg)
-
-    def stream_pivot(self, skill_data: dict, assembled_prompt: str) -> Generator[SidecarEvent, None, None]:
-        self.system_prompt = assembled_prompt
-        # Reset history on pivot for Groq to maintain performance/persona focus
-        self.init_session(assembled_prompt)
+            # A closed socket after a cancel is expected, not an API failure
+            if not (cancel_token and cancel_token.cancelled):
+                error_msg = f"Groq API Error: {str(e)}"
+                # Handle model not found specifically
+                if "not found" in str(e).lower() or "model" in str(e).lower():
+                    error_msg = f"Model '{self.model_id}' rejected by Groq. Please verify the ID in the Groq panel and .env."
+                yield SidecarEvent(SidecarEventType.ERROR, content=error_msg)
+                return
+
+        if cancel_token and cancel_token.cancelled:
+            if cancel_token.keep_partial:
+                self.messages.append({"role": "assistant", "content": mark_cancelled(full_response)})
+            elif self.messages and self.messages[-1]["role"] == "user":
+                self.messages.pop() # Discarded turn: roll back the pending user message
+            yield SidecarEvent(SidecarEventType.STATUS, content="Generation cancelled.")
+            yield SidecarEvent(SidecarEventType.FINISH, metadata={"cancelled": True, "metrics": timer.finish(cancelled=True)})
+            return
+
+        if full_response:
+            self.messages.append({"role": "assistant", "content": full_response})
         
-        yield SidecarEvent(SidecarEventType.TEXT_CHUNK, content=f"Pivot acknowledged. System re-tasked to {skill_data['identity'][:20]}...")
-        yield SidecarEvent(SidecarEventType.FINISH)
+        yield SidecarEvent(SidecarEventType.FINISH, metadata={"metrics": timer.finish()})
+
+    @staticmethod
+    def _abort_stream(stream):
+        """Frees a read blocked on a stalled stream, then closes the SDK stream."""
+        response = getattr(stream, "response", None)
+        if response is not None:
+            abort_http_response(response)
+        stream.close()
+
+    def _log_prompt_cache(self, usage):
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", 0) or 0
+        logger.debug(f"Groq prompt tokens: {usage.prompt_tokens} ({cached} cached)")
 
     def get_model_name(self):
         return f"GROQ ({self.model_id.split('/')[-1]})"
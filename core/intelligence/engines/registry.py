@@ -0,0 +1,78 @@
+import importlib
+import threading
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator, List, Optional
+from core.utils.boot_profile import boot_profile
+
+# Provider SDKs (google.genai, groq) take hundreds of ms to import, so engine modules load on first use
+PROVIDER_ENGINES = {
+    "gemini": ("core.intelligence.engines.gemini", "GeminiEngine"),
+    "groq": ("core.intelligence.engines.groq_engine", "GroqEngine"),
+}
+
+def provider_factory(name: str, api_key: Optional[str]) -> Optional[Callable[[], object]]:
+    """Deferred constructor for a provider engine, or None when its key is missing."""
+    if not api_key:
+        return None
+    module_name, class_name = PROVIDER_ENGINES[name]
+    return lambda: getattr(importlib.import_module(module_name), class_name)(api_key)
+
+class EngineRegistry(Mapping):
+    """
+    Engines by name, constructed on first access.
+
+    1. 'register' records a factory; a factory of None marks the engine as
+       unconfigured (no API key) and it reads as None, like a missing client.
+    2. Each engine is built once, under its own lock, so two engines can be
+       constructed concurrently while callers of the same one wait for it.
+    3. 'available', 'loaded' and 'peek' never construct anything.
+    4. 'on_load(name, engine)' runs for every newly built engine.
+    """
+    def __init__(self, on_load: Optional[Callable[[str, object], None]] = None):
+        self.on_load = on_load
+        self._factories: Dict[str, Optional[Callable[[], object]]] = {}
+        self._engines: Dict[str, object] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+
+    def register(self, name: str, factory: Optional[Callable[[], object]]):
+        self._factories[name] = factory
+        self._locks[name] = threading.Lock()
+        self._engines.pop(name, None)
+
+    def __setitem__(self, name: str, engine):
+        """Registers an already constructed engine."""
+        self.register(name, None)
+        self._engines[name] = engine
+
+    def __getitem__(self, name: str):
+        if name not in self._factories:
+            raise KeyError(name)
+        engine = self._engines.get(name)
+        if engine is not None or self._factories[name] is None:
+            return engine
+        with self._locks[name]:
+            engine = self._engines.get(name)
+            if engine is None:
+                with boot_profile.phase(f"engine:{name}"):
+                    engine = self._factories[name]()
+                self._engines[name] = engine
+                if self.on_load:
+                    self.on_load(name, engine)
+        return engine
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def available(self, name: str) -> bool:
+        """True if the engine exists or can be built."""
+        return name in self._engines or self._factories.get(name) is not None
+
+    def peek(self, name: str):
+        """The engine if it has already been built, otherwise None."""
+        return self._engines.get(name)
+
+    def loaded(self) -> List[object]:
+        return [engine for engine in list(self._engines.values()) if engine is not None]
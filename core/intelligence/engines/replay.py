@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Generator, List, Optional
+from core.config import settings
+from core.intelligence.engines.base import BaseEngine
+from core.intelligence.events import SidecarEvent, SidecarEventType
+from core.intelligence.cancellation import CancellationToken, mark_cancelled
+from core.intelligence.conversation import ConversationTurn, IMAGE_PLACEHOLDER, merge_turns
+from core.intelligence.telemetry import StreamTimer
+
+def request_digest(png_bytes: Optional[bytes], text: str) -> str:
+    """Short fingerprint of a turn's inputs (screenshot bytes + normalized text)."""
+    h = hashlib.sha256(png_bytes or b"")
+    h.update(b"\x1d" + " ".join((text or "").split()).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+class SessionRecorder:
+    """
+    Appends live turns to a JSONL recording for offline replay.
+
+    One line per turn: {"digest", "model", "chunks": [[delay_ms, text, is_thought], ...]}
+    plus "error" when the provider failed mid-stream. The first delay is the
+    time to first token; cancelled turns are not recorded.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, stream, png_bytes: Optional[bytes], text: str, model: str = "") -> Generator[SidecarEvent, None, None]:
+        chunks = []
+        error = None
+        cancelled = False
+        last = time.perf_counter()
+        for event in stream:
+            if event.event_type == SidecarEventType.TEXT_CHUNK and event.content:
+                now = time.perf_counter()
+                chunks.append([round((now - last) * 1000, 1), event.content, bool(event.metadata.get("is_thought"))])
+                last = now
+            elif event.event_type == SidecarEventType.ERROR:
+                error = event.content
+            elif event.event_type == SidecarEventType.FINISH and event.metadata.get("cancelled"):
+                cancelled = True
+            yield event
+
+        if cancelled or not (chunks or error):
+            return
+        entry = {"digest": request_digest(png_bytes, text), "model": model, "chunks": chunks}
+        if error:
+            entry["error"] = error
+        try:
+            with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        except Exception as e:
+            print(f"[!] Warning: Failed to record session turn: {e}")
+
+class ReplayEngine(BaseEngine):
+    """
+    Offline engine that streams turns captured by SessionRecorder.
+
+    Turns are matched by request digest (cycling through repeats); unknown
+    requests take the next recording in file order, so any recording can drive
+    a load test. Timing is replayed at 'speed'x (0 = no delays), with optional
+    uniform jitter and a per-turn probability of an injected mid-stream failure.
+    """
+    def __init__(self, path: str, speed: float = None, jitter_ms: float = None,
+                 failure_rate: float = None, seed: Optional[int] = None):
+        self.path = path
+        self.speed = settings.REPLAY_SPEED if speed is None else speed
+        self.jitter_ms = settings.REPLAY_JITTER_MS if jitter_ms is None else jitter_ms
+        self.failure_rate = settings.REPLAY_FAILURE_RATE if failure_rate is None else failure_rate
+        self.system_prompt = ""
+        self.turns = []
+        self.recordings = []
+        self._by_digest = defaultdict(list)
+        self._served = defaultdict(int)
+        self._cursor = 0
+        self._random = random.Random(seed)
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self.recordings.append(entry)
+                self._by_digest[entry.get("digest")].append(entry)
+
+    def _select(self, digest: str) -> dict:
+        matches = self._by_digest.get(digest)
+        if matches:
+            entry = matches[self._served[digest] % len(matches)]
+            self._served[digest] += 1
+            return entry
+        entry = self.recordings[self._cursor % len(self.recordings)]
+        self._cursor += 1
+        return entry
+
+    def _delay(self, delay_ms: float) -> float:
+        if self.speed <= 0:
+            return 0.0
+        delay_ms = delay_ms / self.speed
+        if self.jitter_ms:
+            delay_ms += self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, delay_ms) / 1000.0
+
+    def init_session(self, system_prompt):
+        self.system_prompt = system_prompt
+        self.turns = []
+
+    def stream_analysis(self, png_bytes: bytes, additional_text: str = "", cancel_token: Optional[CancellationToken] = None) -> Generator[SidecarEvent, None, None]:
+        if not self.recordings:
+            yield SidecarEvent(SidecarEventType.ERROR, content=f"No recorded turns found in '{self.path}'.")
+            return
+
+        user_parts = ["Analyze this view.", IMAGE_PLACEHOLDER] if png_bytes else []
+        if additional_text:
+            user_parts.append(f"[CONVERSATION TURN]: {additional_text}")
+        user_text = "\n".join(user_parts)
+
+        entry = self._select(request_digest(png_bytes, additional_text))
+        chunks = entry.get("chunks", [])
+        fail_at = self._random.randrange(len(chunks) + 1) if self._random.random() < self.failure_rate else None
+
+        # Sleeps are interruptible so cancellation is as prompt as with a live stream
+        wake = threading.Event()
+        if cancel_token:
+            cancel_token.on_cancel(wake.set)
+
+        yield SidecarEvent(SidecarEventType.STATUS, content=f"Replaying recorded turn ({len(chunks)} chunks)...")
+        timer = StreamTimer("replay", os.path.basename(self.path or ""))
+        full_response = ""
+        for i, (delay_ms, text, is_thought) in enumerate(chunks):
+            wake.wait(self._delay(delay_ms))
+            if cancel_token and cancel_token.cancelled:
+                if cancel_token.keep_partial:
+                    self.record_exchange(user_text, mark_cancelled(full_response))
+                yield SidecarEvent(SidecarEventType.STATUS, content="Generation cancelled.")
+                yield SidecarEvent(SidecarEventType.FINISH, metadata={"cancelled": True, "metrics": timer.finish(cancelled=True)})
+                return
+            if i == fail_at:
+                yield SidecarEvent(SidecarEventType.ERROR, content="Injected replay failure.")
+                return
+            timer.mark_chunk(text, bool(is_thought))
+            if not is_thought:
+                full_response += text
+            yield SidecarEvent(SidecarEventType.TEXT_CHUNK, content=text, metadata={"is_thought": True} if is_thought else {})
+
+        if entry.get("error") or fail_at == len(chunks):
+            yield SidecarEvent(SidecarEventType.ERROR, content=entry.get("error") or "Injected replay failure.")
+            return
+
+        self.record_exchange(user_text, full_response)
+        yield SidecarEvent(SidecarEventType.FINISH, metadata={"replayed": True, "metrics": timer.finish()})
+
+    def get_model_name(self):
+        return f"REPLAY ({os.path.basename(self.path or '')})"
+
+    def toggle_model(self):
+        print("[i] Replay engine has a single recorded model.")
+        return False
+
+    def add_user_message(self, content: str):
+        # stream_analysis commits the user turn together with the replayed answer
+        pass
+
+    def export_history(self) -> List[ConversationTurn]:
+        return merge_turns(self.turns)
+
+    def import_history(self, system_prompt: str, turns: List[ConversationTurn]):
+        self.init_session(system_prompt)
+        self.turns = merge_turns(turns)
+
+    def record_exchange(self, user_text: str, assistant_text: str):
+        self.turns.append(ConversationTurn("user", user_text))
+        self.turns.append(ConversationTurn("assistant", assistant_text))
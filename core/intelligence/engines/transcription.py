@@ -1,4 +1,5 @@
 import io
+import threading
 import requests
 from abc import ABC, abstractmethod
 from typing import Optional
@@ -9,14 +10,34 @@ class BaseTranscriptionEngine(ABC):
     def transcribe(self, audio_buffer: io.BytesIO) -> Optional[str]:
         pass
 
+    def warm_up(self):
+        """Optional: opens the provider connection ahead of the first request."""
+        pass
+
 class GroqTranscriptionEngine(BaseTranscriptionEngine):
     """
     Modular engine for Groq Speech-to-Text REST protocol (OpenAI-compatible).
     """
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.url = "https://api.groq.com/openai/v1/audio/transcriptions"
+        self.url = f"{settings.GROQ_BASE_URL}/openai/v1/audio/transcriptions"
         self.model = settings.GROQ_STT_MODEL
+        # Persistent session so the warmed-up TLS connection is reused by transcribe().
+        # requests.Session is not thread-safe, and the warmer and prep threads share it.
+        self.session = requests.Session()
+        self._session_lock = threading.Lock()
+
+    def warm_up(self):
+        if not self.api_key:
+            return
+        # A transcription in flight keeps the connection hot by itself
+        if not self._session_lock.acquire(blocking=False):
+            return
+        try:
+            models_url = self.url.rsplit("/audio/", 1)[0] + "/models"
+            self.session.get(models_url, headers={"Authorization": f"Bearer {self.api_key}"}, timeout=5)
+        finally:
+            self._session_lock.release()
 
     def transcribe(self, audio_buffer: io.BytesIO) -> Optional[str]:
         """
@@ -38,7 +59,8 @@ class GroqTranscriptionEngine(BaseTranscriptionEngine):
         }
 
         try:
-            response = requests.post(self.url, headers=headers, files=files, timeout=10)
+            with self._session_lock:
+                response = self.session.post(self.url, headers=headers, files=files, timeout=10)
             
             # Verification Gate
             if response.status_code != 200:
@@ -1,7 +1,11 @@
 from core.config import settings
-from core.intelligence.engines.gemini import GeminiEngine
-from core.intelligence.engines.groq_engine import GroqEngine
+from core.intelligence.engines.registry import EngineRegistry, provider_factory
+from core.intelligence.engines.replay import ReplayEngine, SessionRecorder
 from core.intelligence.events import SidecarEvent, SidecarEventType
+from core.intelligence.conversation import IMAGE_PLACEHOLDER
+from core.intelligence.cancellation import CancellationToken, mark_cancelled
+from core.intelligence.race import EngineRacer
+from core.intelligence.response_cache import ResponseCache
 from typing import Generator, Optional
 
 class SidecarBrain:
@@ -9,25 +13,51 @@ class SidecarBrain:
         self.google_api_key = google_api_key
         self.groq_api_key = groq_api_key
         
-        # Initialize engines
-        self.engines = {
-            "gemini": GeminiEngine(google_api_key),
-            "groq": GroqEngine(groq_api_key) if groq_api_key else None
-        }
+        self.current_skill_data = None
+        self.current_system_prompt = ""
+        
+        # Engines are built on first use; only the active one is constructed here
+        self.engines = EngineRegistry(on_load=self._on_engine_loaded)
+        self.engines.register("gemini", provider_factory("gemini", google_api_key))
+        self.engines.register("groq", provider_factory("groq", groq_api_key))
         
         pref = settings.SIDECAR_ENGINE
-        if pref == "groq" and not groq_api_key:
-            pref = "gemini"
+        if pref == "replay":
+            # Offline mode: recorded turns stand in for the providers (no keys needed)
+            self.engines["replay"] = ReplayEngine(settings.REPLAY_PATH)
+        if not self.engines.available(pref):
+            pref = next((name for name in self.engines if self.engines.available(name)), None)
+        if pref is None:
+            raise ValueError("No engine available: set GOOGLE_API_KEY or GROQ_API_KEY, or use SIDECAR_ENGINE=replay.")
             
         self.active_engine_name = pref
         self.active_engine = self.engines[pref]
         
-        self.current_skill_data = None
-        self.current_system_prompt = ""
+        # Speculative racing needs every engine online
+        self.racer = EngineRacer()
+        self.race_mode = settings.SIDECAR_RACE_MODE and pref != "replay" and all(self.engines.available(name) for name in self.engines)
+        
+        # Exact-match replay of repeated turns (same screen, words, skill and history)
+        self.response_cache = None
+        if settings.RESPONSE_CACHE_ENABLED:
+            self.response_cache = ResponseCache(
+                max_entries=settings.RESPONSE_CACHE_SIZE,
+                ttl=settings.RESPONSE_CACHE_TTL,
+                disk_path=settings.RESPONSE_CACHE_PATH
+            )
+        self._last_cached_turn = None
+        
+        # Captures live turns (chunks + timing) for the replay engine
+        self.session_recorder = SessionRecorder(settings.RECORD_PATH) if settings.RECORD_PATH else None
+
+    def _on_engine_loaded(self, name, engine):
+        """An engine built after 'set_skill' starts under the current skill."""
+        if self.current_system_prompt:
+            engine.init_session(self.current_system_prompt)
 
     def set_active_engine(self, name):
         """Sets the active engine by name."""
-        if name in self.engines and self.engines[name]:
+        if self.engines.available(name):
             self.active_engine_name = name
             self.active_engine = self.engines[name]
         else:
@@ -35,61 +65,182 @@ class SidecarBrain:
 
     def switch_engine(self):
         """Swaps the active engine at runtime."""
-        if not self.engines["groq"]:
+        if not self.engines.available("groq"):
             return "GROQ key missing - cannot switch."
+        if not self.engines.available("gemini"):
+            return "GOOGLE key missing - cannot switch."
             
         new_name = "groq" if self.active_engine_name == "gemini" else "gemini"
+        turns = self.active_engine.export_history()
         self.active_engine_name = new_name
         self.active_engine = self.engines[new_name]
         
-        # Important: Initialize the new engine with the current prompt
-        self.active_engine.init_session(self.current_system_prompt)
-        return f"Switched engine to {new_name.upper()}"
+        # Important: Initialize the new engine with the current prompt and the neutral history
+        self.active_engine.import_history(self.current_system_prompt, turns)
+        return f"Switched engine to {new_name.upper()} ({len(turns)} turns carried over)"
 
     def set_skill(self, skill_data, assembled_prompt):
-        """Sets the current skill and initializes engines."""
+        """Sets the current skill and initializes the engines built so far (later ones via '_on_engine_loaded')."""
         self.current_skill_data = skill_data
         self.current_system_prompt = assembled_prompt
-        for name, engine in self.engines.items():
+        for engine in self.engines.loaded():
+            engine.init_session(assembled_prompt)
+
+    def warm_up(self):
+        """Opens connections for the engines that will serve the next turn."""
+        engines = self.engines.values() if self.race_mode else [self.active_engine]
+        for engine in engines:
             if engine:
-                engine.init_session(assembled_prompt)
+                engine.warm_up()
+
+    def prefetch_image(self, png_bytes: bytes, patient: bool = False):
+        """Starts background uploads of a fresh capture on every engine that may receive it."""
+        engines = self.engines.values() if self.race_mode else [self.active_engine]
+        for engine in engines:
+            if engine:
+                engine.prefetch_image(png_bytes, patient=patient)
 
     def init_chat(self):
         """Initializes the active engine's session."""
         self.active_engine.init_session(self.current_system_prompt)
 
-    def analyze_image_stream(self, png_bytes: bytes, additional_text: str = "") -> Generator[SidecarEvent, None, None]:
+    def analyze_image_stream(self, png_bytes: bytes, additional_text: str = "", cancel_token: Optional[CancellationToken] = None, bypass_cache: bool = False) -> Generator[SidecarEvent, None, None]:
         """Streams analysis with injected visual and verbal context."""
         # Note: Recency bias optimization—additional_text (transcription) is appended last in the engine's prompt assembly
-        return self.active_engine.stream_analysis(png_bytes, additional_text)
+        user_text = "Analyze this view." if png_bytes else ""
+        if png_bytes:
+            user_text += f"\n{IMAGE_PLACEHOLDER}"
+        if additional_text:
+            user_text += f"\n\n[CONVERSATION TURN]: {additional_text}"
+        
+        return self._run_turn(
+            lambda engine, token: engine.stream_analysis(png_bytes, additional_text, token),
+            user_text.strip(), png_bytes, additional_text, cancel_token, bypass_cache
+        )
 
-    def analyze_verbal_stream(self, transcription: str) -> Generator[SidecarEvent, None, None]:
+    def analyze_verbal_stream(self, transcription: str, cancel_token: Optional[CancellationToken] = None, bypass_cache: bool = False) -> Generator[SidecarEvent, None, None]:
         """Streams a follow-up response based strictly on verbal context (T vector)."""
         # For non-visual turns, we can wrap the transcription in a specific instruction
         if not transcription:
             yield SidecarEvent(SidecarEventType.ERROR, content="No transcription data received.")
             return
 
+        yield from self._run_turn(
+            lambda engine, token: self._verbal_turn(engine, transcription, token),
+            f"[CONVERSATION TURN]: {transcription}", None, transcription, cancel_token, bypass_cache
+        )
+
+    def _run_turn(self, start_stream, user_text, png_bytes, text, cancel_token, bypass_cache) -> Generator[SidecarEvent, None, None]:
+        """Routes a turn through the response cache, then to the racer or the active engine."""
+        if self.race_mode:
+            # Losers of the previous race must finish committing before any session is touched again
+            self.racer.settle()
+            live = lambda: self.racer.race(self.engines, start_stream, user_text, cancel_token)
+        else:
+            live = lambda: start_stream(self.active_engine, cancel_token)
+        
+        # Replayed turns are recordings already; re-recording them would only duplicate the file
+        if self.session_recorder and self.active_engine_name != "replay":
+            stream_live = live
+            live = lambda: self.session_recorder.record(stream_live(), png_bytes, text, str(self.get_model_name()))
+        
+        stream = self._cached_turn(live, user_text, png_bytes, text, cancel_token, bypass_cache) if self.response_cache else live()
+        return stream if settings.SHOW_THOUGHTS else self._without_thoughts(stream)
+
+    @staticmethod
+    def _without_thoughts(stream) -> Generator[SidecarEvent, None, None]:
+        """Drops thought chunks (replayed or recorded ones included) before they reach the worker."""
+        for event in stream:
+            if event.event_type == SidecarEventType.TEXT_CHUNK and event.metadata.get("is_thought"):
+                continue
+            yield event
+
+    def _cached_turn(self, live, user_text, png_bytes, text, cancel_token, bypass_cache) -> Generator[SidecarEvent, None, None]:
+        """
+        Serves exact repeats from the response cache and stores completed live answers.
+        A press that repeats the previous turn reuses that turn's key, because its
+        own exchange is already part of the history digest by then.
+        """
+        engine_name = "race" if self.race_mode else self.active_engine_name
+        model = str(self.get_model_name())
+        history_digest = ResponseCache.digest_history(self.active_engine.export_history())
+        request_fp = ResponseCache.make_key(engine_name, model, self.current_system_prompt, "", png_bytes, text)
+        
+        last = self._last_cached_turn
+        is_repeat = last is not None and last[0] == request_fp and last[1] == history_digest
+        key = last[2] if is_repeat else ResponseCache.make_key(engine_name, model, self.current_system_prompt, history_digest, png_bytes, text)
+
+        cached = None if bypass_cache else self.response_cache.get(key)
+        if cached is not None:
+            yield SidecarEvent(SidecarEventType.STATUS, content="Cache hit. Replaying response...")
+            answer = ""
+            for content, is_thought in cached:
+                if cancel_token and cancel_token.cancelled:
+                    break
+                if not is_thought:
+                    answer += content
+                yield SidecarEvent(SidecarEventType.TEXT_CHUNK, content=content, metadata={"is_thought": is_thought, "cached": True})
+            
+            cancelled = bool(cancel_token and cancel_token.cancelled)
+            if not is_repeat:
+                # Replayed turns still have to land in history so later turns stay in context
+                engines = self.engines.values() if self.race_mode else [self.active_engine]
+                for engine in engines:
+                    engine.record_exchange(user_text, mark_cancelled(answer) if cancelled else answer)
+            self._remember_turn(request_fp, key)
+            yield SidecarEvent(SidecarEventType.FINISH, metadata={"cached": True, "cancelled": cancelled})
+            return
+
+        chunks = []
+        completed = True
+        for event in live():
+            if event.event_type == SidecarEventType.TEXT_CHUNK and event.content:
+                chunks.append((event.content, bool(event.metadata.get("is_thought"))))
+            elif event.event_type == SidecarEventType.ERROR:
+                completed = False
+            elif event.event_type == SidecarEventType.FINISH and event.metadata.get("cancelled"):
+                completed = False
+            yield event
+
+        if completed and chunks:
+            self.response_cache.put(key, chunks)
+            self._remember_turn(request_fp, key)
+
+    def _remember_turn(self, request_fp: str, key: str):
+        """Tracks the last cached turn so an immediate repeat can be recognised."""
+        history_digest = ResponseCache.digest_history(self.active_engine.export_history())
+        self._last_cached_turn = (request_fp, history_digest, key)
+
+    def _verbal_turn(self, engine, transcription: str, cancel_token: Optional[CancellationToken] = None) -> Generator[SidecarEvent, None, None]:
+        """Runs a verbal follow-up on a specific engine."""
         # Prepare follow-up message
-        self.active_engine.add_user_message(f"[CONVERSATION TURN]: {transcription}")
+        engine.add_user_message(f"[CONVERSATION TURN]: {transcription}")
         
         # Groq engine can use the existing _execute_chat_completion logic
-        if hasattr(self.active_engine, '_execute_chat_completion'):
-             yield from self.active_engine._execute_chat_completion()
+        if hasattr(engine, '_execute_chat_completion'):
+             yield from engine._execute_chat_completion(cancel_token=cancel_token)
         else:
             # Fallback for Gemini: stream_analysis(None, transcription) already appends context
             # We don't want to double-append, but add_user_message for Gemini is currently a no-op
             # so this is safe.
-            yield from self.active_engine.stream_analysis(None, transcription)
+            yield from engine.stream_analysis(None, transcription, cancel_token)
 
     def pivot_skill(self, skill_data: dict, assembled_prompt: str):
         """Pivots the skill for the active engine."""
         self.current_skill_data = skill_data
         self.current_system_prompt = assembled_prompt
+        if self.race_mode:
+            self.racer.settle()
+            # Every contender must answer under the new skill; pivots are local, so this is free
+            for engine in self.engines.values():
+                if engine is not self.active_engine:
+                    engine.import_history(assembled_prompt, engine.export_history())
         return self.active_engine.stream_pivot(skill_data, assembled_prompt)
 
     def get_model_name(self):
         """Returns active engine and model details."""
+        if self.race_mode:
+            return f"RACE ({' vs '.join(e.get_model_name() for e in self.engines.values())})"
         return self.active_engine.get_model_name()
 
     def toggle_model(self):
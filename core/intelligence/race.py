@@ -0,0 +1,158 @@
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Generator, Optional
+from core.intelligence.cancellation import CancellationToken, mark_cancelled
+from core.intelligence.events import SidecarEvent, SidecarEventType
+from core.utils.logger import logger
+
+# (engine, cancel_token) -> event stream for one contender
+StreamStarter = Callable[[object, CancellationToken], Generator[SidecarEvent, None, None]]
+
+class EngineRacer:
+    """
+    Speculative 'first-token-wins' execution across engines.
+
+    The same turn is started on every contender concurrently. The first engine
+    to produce a visible TEXT_CHUNK (thoughts do not count) becomes the winner
+    and is streamed to the caller, preceded by any thoughts it buffered; the
+    losers are cancelled in discard mode (their pending turn is rolled back)
+    and then receive the winner's turn via 'record_exchange', so every history
+    converges on the same conversation. 'settle()' waits for those commits, so
+    the next turn never overlaps a loser still writing to its session.
+    """
+    def __init__(self, window: int = 50, settle_timeout: float = 10.0):
+        self.stats = {}
+        self.window = window
+        self.settle_timeout = settle_timeout
+        self._lanes = [] # Lane threads of the previous race, until they have committed
+
+    def settle(self):
+        """Blocks until every lane of earlier races has unwound and committed."""
+        lanes, self._lanes = self._lanes, []
+        for lane in lanes:
+            lane.join(self.settle_timeout)
+            if lane.is_alive():
+                logger.warning(f"Race lane {lane.name} still running after {self.settle_timeout:.0f}s")
+
+    def _stats_for(self, name: str) -> dict:
+        if name not in self.stats:
+            self.stats[name] = {"races": 0, "wins": 0, "ttft": deque(maxlen=self.window)}
+        return self.stats[name]
+
+    def race(self, engines: Dict[str, object], start_stream: StreamStarter, user_text: str,
+             cancel_token: Optional[CancellationToken] = None) -> Generator[SidecarEvent, None, None]:
+        self.settle()
+        events = queue.Queue()
+        tokens = {name: CancellationToken() for name in engines}
+        winner_done = threading.Event()
+        result = {"winner": None, "text": None}
+        started_at = time.perf_counter()
+
+        def run_lane(name, engine):
+            """Pumps one contender's events, then commits the winner's turn if this lane lost."""
+            try:
+                for event in start_stream(engine, tokens[name]):
+                    events.put((name, event))
+            except Exception as e:
+                events.put((name, SidecarEvent(SidecarEventType.ERROR, content=str(e))))
+            finally:
+                events.put((name, None))
+
+            # Commit only after this lane's stream has fully unwound its own rollback
+            winner_done.wait()
+            if result["winner"] not in (None, name) and result["text"] is not None:
+                try:
+                    engine.record_exchange(user_text, result["text"])
+                except Exception as e:
+                    logger.error(f"Race commit failed for {name.upper()}: {e}")
+
+        def cancel_all():
+            winner = result["winner"]
+            for name, token in tokens.items():
+                # Before a winner exists nothing was shown, so every lane rolls back
+                token.cancel(keep_partial=(name == winner))
+
+        if cancel_token:
+            cancel_token.on_cancel(cancel_all)
+
+        for name, engine in engines.items():
+            self._stats_for(name)["races"] += 1
+            lane = threading.Thread(target=run_lane, args=(name, engine), daemon=True, name=f"race-{name}")
+            self._lanes.append(lane)
+            lane.start()
+
+        yield SidecarEvent(SidecarEventType.STATUS, content=f"Racing {' vs '.join(n.upper() for n in engines)}...")
+
+        finished = set()
+        first_token_seen = set()
+        thoughts = {name: [] for name in engines} # Held back until a lane wins
+        last_error = None
+        winner_text = ""
+        completed = False
+        try:
+            while True:
+                name, event = events.get()
+                if event is None:
+                    finished.add(name)
+                    if name == result["winner"] or (result["winner"] is None and finished == set(engines)):
+                        break
+                    continue
+
+                visible = event.event_type == SidecarEventType.TEXT_CHUNK and event.content and not event.metadata.get("is_thought")
+                if visible and name not in first_token_seen:
+                    # Losers' TTFT is only known if their first token beat the cancel
+                    first_token_seen.add(name)
+                    self._stats_for(name)["ttft"].append(time.perf_counter() - started_at)
+                    if result["winner"] is None and not (cancel_token and cancel_token.cancelled):
+                        self._declare_winner(name, engines, tokens, result)
+                        yield from thoughts[name]
+
+                if result["winner"] is None:
+                    if event.event_type == SidecarEventType.ERROR:
+                        last_error = event
+                    elif event.event_type == SidecarEventType.TEXT_CHUNK:
+                        thoughts[name].append(event)
+                    continue
+                if name != result["winner"]:
+                    continue
+
+                if visible:
+                    winner_text += event.content
+                yield event
+
+            if result["winner"] is None:
+                if cancel_token and cancel_token.cancelled:
+                    yield SidecarEvent(SidecarEventType.FINISH, metadata={"cancelled": True})
+                else:
+                    yield last_error or SidecarEvent(SidecarEventType.ERROR, content="All engines failed to respond.")
+            else:
+                winner_token = tokens[result["winner"]]
+                result["text"] = mark_cancelled(winner_text) if winner_token.cancelled else winner_text
+            completed = True
+        finally:
+            if not completed:
+                # Consumer walked away mid-race: roll every lane back
+                for token in tokens.values():
+                    token.cancel(keep_partial=False)
+            winner_done.set()
+
+    def _declare_winner(self, name, engines, tokens, result):
+        result["winner"] = name
+        stats = self._stats_for(name)
+        stats["wins"] += 1
+        for other in engines:
+            if other != name:
+                tokens[other].cancel(keep_partial=False)
+        logger.info(f"Race won by {name.upper()} (TTFT {stats['ttft'][-1]:.2f}s) | {self.summary()}")
+
+    def summary(self) -> str:
+        """Human-readable win rates and median TTFT per engine."""
+        parts = []
+        for name, stats in self.stats.items():
+            rate = stats["wins"] / stats["races"] if stats["races"] else 0.0
+            samples = sorted(stats["ttft"])
+            median = f"{samples[len(samples) // 2]:.2f}s" if samples else "n/a"
+            parts.append(f"{name.upper()} win {rate:.0%} / p50 TTFT {median}")
+        return " | ".join(parts)
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from core.intelligence.conversation import ConversationTurn
+
+# (text, is_thought) pairs in stream order
+CachedChunks = List[Tuple[str, bool]]
+
+def _sha256(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data or b"").hexdigest()
+
+class ResponseCache:
+    """
+    Exact-match cache of completed responses (LRU + TTL).
+
+    Keys cover everything that shapes an answer: engine, model, system prompt,
+    the normalized text history, the screenshot bytes and the request text.
+    Entries optionally persist to a JSON file so repeats survive restarts.
+    """
+    def __init__(self, max_entries: int = 64, ttl: float = 600, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict() # key -> {"created": ts, "chunks": [...]}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def digest_history(turns: List[ConversationTurn]) -> str:
+        """Whitespace-insensitive fingerprint of a neutral history."""
+        normalized = "\x1e".join(f"{t.role}\x1f{' '.join(t.text.split())}" for t in turns)
+        return _sha256(normalized)
+
+    @staticmethod
+    def make_key(engine: str, model: str, system_prompt: str, history_digest: str,
+                 png_bytes: Optional[bytes], text: str) -> str:
+        parts = [engine, model, _sha256(system_prompt), history_digest, _sha256(png_bytes), " ".join((text or "").split())]
+        return _sha256("\x1d".join(parts))
+
+    def get(self, key: str) -> Optional[CachedChunks]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry["created"] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if not entry:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return [tuple(chunk) for chunk in entry["chunks"]]
+
+    def put(self, key: str, chunks: CachedChunks):
+        with self._lock:
+            self._entries[key] = {"created": time.time(), "chunks": [list(c) for c in chunks]}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def _load(self):
+        if not self.disk_path or not os.path.exists(self.disk_path):
+            return
+        try:
+            with open(self.disk_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            now = time.time()
+            for key, entry in sorted(stored.items(), key=lambda kv: kv[1]["created"]):
+                if now - entry["created"] <= self.ttl:
+                    self._entries[key] = entry
+        except Exception as e:
+            print(f"[!] Warning: Failed to load response cache: {e}")
+
+    def _save(self):
+        if not self.disk_path:
+            return
+        try:
+            with open(self.disk_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+        except Exception as e:
+            print(f"[!] Warning: Failed to save response cache: {e}")
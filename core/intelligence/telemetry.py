@@ -0,0 +1,128 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+from core.utils.logger import logger
+
+# Rough chars-per-token ratio, used when a provider does not report completion tokens
+CHARS_PER_TOKEN = 4
+
+class StreamTimer:
+    """
+    Instruments a single streamed turn.
+    All timings are seconds since the request was issued; 'finish()' returns the
+    metrics dict that engines attach to their FINISH event under "metrics".
+    """
+    def __init__(self, engine: str, model: str):
+        self.engine = engine
+        self.model = model
+        self.start = time.perf_counter()
+        self.first_byte = None
+        self.first_token = None
+        self.first_thought = None
+        self.end = None
+        self.chunks = 0
+        self.chars = 0
+        self.thought_chars = 0
+        self.completion_tokens = None
+
+    def _elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def mark_byte(self):
+        """Any payload from the provider, including role/usage-only chunks."""
+        if self.first_byte is None:
+            self.first_byte = self._elapsed()
+
+    def mark_chunk(self, text: str, is_thought: bool = False):
+        self.mark_byte()
+        self.chunks += 1
+        if is_thought:
+            self.thought_chars += len(text)
+            if self.first_thought is None:
+                self.first_thought = self._elapsed()
+        else:
+            self.chars += len(text)
+            if self.first_token is None:
+                self.first_token = self._elapsed()
+
+    def finish(self, cancelled: bool = False) -> dict:
+        self.end = self._elapsed()
+        tokens = self.completion_tokens or (self.chars + self.thought_chars) / CHARS_PER_TOKEN
+        # Generation rate after the first output of any kind, so TTFT does not skew it
+        first_output = min(t for t in (self.first_token, self.first_thought, self.end) if t is not None)
+        streaming_time = self.end - first_output
+        metrics = {
+            "engine": self.engine,
+            "model": self.model,
+            "ttfb": self.first_byte,
+            "ttft": self.first_token,
+            "ttf_thought": self.first_thought,
+            "total": self.end,
+            "chunks": self.chunks,
+            "chars": self.chars,
+            "thought_chars": self.thought_chars,
+            "tokens": round(tokens),
+            "tokens_per_sec": tokens / streaming_time if streaming_time > 0 else None,
+            "cancelled": cancelled,
+        }
+        if not cancelled:
+            telemetry.record(metrics)
+        return metrics
+
+class StreamTelemetry:
+    """Rolling per-(engine, model) samples of completed streams, reported as percentiles."""
+    FIELDS = ("ttfb", "ttft", "ttf_thought", "total", "tokens_per_sec")
+
+    def __init__(self, window: int = 100):
+        self.window = window
+        self.samples: Dict[tuple, Dict[str, deque]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, metrics: dict):
+        key = (metrics["engine"], metrics["model"])
+        with self._lock:
+            series = self.samples.setdefault(key, {f: deque(maxlen=self.window) for f in self.FIELDS})
+            for f in self.FIELDS:
+                if metrics.get(f) is not None:
+                    series[f].append(metrics[f])
+        logger.debug(f"{metrics['model']}: {self.describe(metrics)} | {self.summary(*key)}")
+
+    def percentiles(self, engine: str, model: str) -> Dict[str, Dict[str, Optional[float]]]:
+        with self._lock:
+            series = self.samples.get((engine, model), {})
+            return {f: {
+                "p50": _percentile(series.get(f, ()), 50),
+                "p90": _percentile(series.get(f, ()), 90),
+                "p99": _percentile(series.get(f, ()), 99),
+            } for f in self.FIELDS}
+
+    def summary(self, engine: str, model: str) -> str:
+        p = self.percentiles(engine, model)
+        n = len(self.samples.get((engine, model), {}).get("total", ()))
+        return f"n={n} TTFT p50 {_fmt_ms(p['ttft']['p50'])} p90 {_fmt_ms(p['ttft']['p90'])} | {_fmt_rate(p['tokens_per_sec']['p50'])} p50"
+
+    def report(self) -> str:
+        """One line per engine/model seen this session."""
+        return "\n".join(f"{model} ({engine}): {self.summary(engine, model)}" for engine, model in list(self.samples))
+
+    @staticmethod
+    def describe(metrics: dict) -> str:
+        return f"TTFT {_fmt_ms(metrics['ttft'])} | TTFB {_fmt_ms(metrics['ttfb'])} | {_fmt_rate(metrics['tokens_per_sec'])} | {metrics['chunks']} chunks"
+
+def _percentile(values, pct: int) -> Optional[float]:
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    # Nearest-rank percentile
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def _fmt_ms(seconds: Optional[float]) -> str:
+    return f"{seconds * 1000:.0f}ms" if seconds is not None else "n/a"
+
+def _fmt_rate(rate: Optional[float]) -> str:
+    return f"{rate:.1f} tok/s" if rate is not None else "n/a tok/s"
+
+# Global telemetry instance
+telemetry = StreamTelemetry()
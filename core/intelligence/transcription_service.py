@@ -18,3 +18,8 @@ class TranscriptionService:
             print("[!] Transcription Error: No engine initialized (check API keys).")
             return None
         return self.engine.transcribe(audio_buffer)
+
+    def warm_up(self):
+        """Pre-opens the STT connection (no-op without an engine)."""
+        if self.engine:
+            self.engine.warm_up()
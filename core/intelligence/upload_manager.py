@@ -0,0 +1,107 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Any, Callable, Optional
+from core.utils.logger import logger
+
+class UploadManager:
+    """
+    Background uploads of captures to a provider file store, keyed by content hash.
+
+    1. 'prefetch()' starts at most one upload per image and returns immediately, so
+       the transfer overlaps the user's speech and thinking time.
+    2. 'reference()' returns the provider reference; None means the caller sends the
+       bytes inline. Only images prefetched as 'patient' (their turn waits behind a
+       stream or the user's speech anyway) wait up to 'wait_ms' for an upload in flight.
+    3. References are reused across turns until 'ttl' (set below the provider's own
+       expiry); failed uploads are forgotten so a later capture can retry.
+    """
+    def __init__(self, upload: Callable[[bytes], Any], ttl: float, wait_ms: int = 1500, max_entries: int = 64):
+        self._upload = upload
+        self.ttl = ttl
+        self.wait = wait_ms / 1000.0
+        self.max_entries = max_entries
+        self.uploads = 0
+        self.hits = 0
+        self._entries = OrderedDict() # digest -> (future, started, patient)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sidecar-upload")
+
+    @staticmethod
+    def digest(png_bytes: bytes) -> str:
+        return hashlib.sha256(png_bytes).hexdigest()
+
+    def _live_entry(self, key: str):
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[1] > self.ttl:
+            del self._entries[key]
+            return None
+        return entry
+
+    def prefetch(self, png_bytes: bytes, patient: bool = False) -> Optional[Future]:
+        """Starts uploading the image unless it is already stored or in flight."""
+        if not png_bytes:
+            return None
+        key = self.digest(png_bytes)
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry:
+                self._entries[key] = (entry[0], entry[1], entry[2] or patient)
+                self._entries.move_to_end(key)
+                return entry[0]
+            future = self._executor.submit(self._run, png_bytes)
+            self._entries[key] = (future, time.monotonic(), patient)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        future.add_done_callback(lambda f: self._forget_failed(key, f))
+        return future
+
+    def _run(self, png_bytes: bytes):
+        started = time.perf_counter()
+        try:
+            ref = self._upload(png_bytes)
+        except Exception as e:
+            logger.debug(f"Image upload failed, will send inline: {e}")
+            return None
+        with self._lock:
+            self.uploads += 1
+        logger.debug(f"Image uploaded in {(time.perf_counter() - started) * 1000:.0f}ms ({len(png_bytes) // 1024} KB)")
+        return ref
+
+    def _forget_failed(self, key: str, future: Future):
+        if future.cancelled() or future.result() is None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and entry[0] is future:
+                    del self._entries[key]
+
+    def reference(self, png_bytes: bytes, wait_ms: Optional[int] = None):
+        """
+        Returns the stored reference for these bytes, or None to fall back to inline.
+        Without an explicit 'wait_ms', only a patient entry waits for its upload.
+        """
+        if not png_bytes:
+            return None
+        with self._lock:
+            entry = self._live_entry(self.digest(png_bytes))
+        if not entry:
+            return None
+        if wait_ms is None:
+            wait = self.wait if entry[2] else 0
+        else:
+            wait = wait_ms / 1000.0
+        try:
+            ref = entry[0].result(timeout=wait)
+        except TimeoutError:
+            logger.debug("Image upload still in flight, sending inline.")
+            return None
+        if ref is not None:
+            with self._lock:
+                self.hits += 1
+        return ref
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
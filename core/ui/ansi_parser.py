@@ -1,11 +1,12 @@
 import re
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 from PyQt6.QtGui import QColor, QTextCharFormat
 
 class ANSIParser:
     """
     Parses ANSI escape codes (colorama output) and converts to Qt text formatting.
     Supports standard 16-color palette and basic text attributes.
+    Use an instance ('feed') for streamed output and 'parse' for one-off strings.
     """
     
     # ANSI color code mappings (colorama standard)
@@ -28,58 +29,112 @@ class ANSIParser:
         '97': QColor(255, 255, 255),     # Bright White
     }
     
-    # ANSI escape sequence regex
-    ANSI_ESCAPE = re.compile(r'\x1b\[([0-9;]+)m')
+    DEFAULT_COLOR = QColor(255, 255, 255)
     
-    @staticmethod
-    def parse(text: str) -> List[Tuple[str, QTextCharFormat]]:
+    # ANSI CSI sequence regex (only SGR, final byte 'm', changes formatting; others are dropped)
+    ANSI_ESCAPE = re.compile(r'\x1b\[([0-9;]*)([A-Za-z])')
+    # An escape cut off at the end of a write; completed by the next one
+    PARTIAL_ESCAPE = re.compile(r'\x1b(\[[0-9;]*)?$')
+    
+    # Interned formats, one per (foreground code, bold) combination
+    _formats: Dict[Tuple[Optional[str], bool], QTextCharFormat] = {}
+    
+    def __init__(self):
         """
-        Parse ANSI escape codes and return (text, format) tuples.
-        
-        Args:
-            text: Raw text with ANSI escape codes
-            
-        Returns:
-            List of (text_chunk, QTextCharFormat) tuples
+        Incremental parser for a stream of writes.
+        SGR state (colour, weight) carries over between 'feed()' calls and an
+        escape sequence split across writes is buffered until it completes.
         """
-        chunks = []
-        current_format = QTextCharFormat()
-        current_format.setForeground(QColor(255, 255, 255))  # Default white
+        self.foreground: Optional[str] = None
+        self.bold = False
+        self.pending = ""
+        self.format = self._intern(None, False)
+    
+    @classmethod
+    def _intern(cls, foreground: Optional[str], bold: bool) -> QTextCharFormat:
+        key = (foreground, bold)
+        text_format = cls._formats.get(key)
+        if text_format is None:
+            text_format = QTextCharFormat()
+            text_format.setForeground(cls.ANSI_COLORS.get(foreground, cls.DEFAULT_COLOR))
+            if bold:
+                text_format.setFontWeight(700)
+            cls._formats[key] = text_format
+        return text_format
+    
+    def _apply_sgr(self, params: str):
+        for code in (params.split(';') if params else ['0']):
+            if code in ('0', ''):
+                # Reset
+                self.foreground, self.bold = None, False
+            elif code in self.ANSI_COLORS:
+                # Foreground color
+                self.foreground = code
+            elif code == '39':
+                # Default foreground
+                self.foreground = None
+            elif code == '1':
+                # Bold
+                self.bold = True
+            elif code == '22':
+                # Normal weight
+                self.bold = False
+        self.format = self._intern(self.foreground, self.bold)
+    
+    def feed(self, text: str) -> List[Tuple[str, QTextCharFormat]]:
+        """
+        Parse the next write of the stream and return (text, format) tuples.
+        The formats are shared instances; callers must not modify them.
+        """
+        if self.pending:
+            text = self.pending + text
+            self.pending = ""
         
-        last_end = 0
+        escape_at = text.rfind('\x1b')
+        if escape_at == -1:
+            # Fast path: plain text in the current format
+            return [(text, self.format)] if text else []
         
-        for match in ANSIParser.ANSI_ESCAPE.finditer(text):
+        partial = self.PARTIAL_ESCAPE.match(text, escape_at)
+        if partial:
+            self.pending = text[escape_at:]
+            text = text[:escape_at]
+        
+        chunks = []
+        last_end = 0
+        for match in self.ANSI_ESCAPE.finditer(text):
             # Add text before this escape code
             if match.start() > last_end:
-                chunk_text = text[last_end:match.start()]
-                chunks.append((chunk_text, QTextCharFormat(current_format)))
-            
-            # Parse the escape code
-            codes = match.group(1).split(';')
-            for code in codes:
-                if code == '0':
-                    # Reset
-                    current_format = QTextCharFormat()
-                    current_format.setForeground(QColor(255, 255, 255))
-                elif code in ANSIParser.ANSI_COLORS:
-                    # Foreground color
-                    current_format.setForeground(ANSIParser.ANSI_COLORS[code])
-                elif code == '1':
-                    # Bold
-                    current_format.setFontWeight(700)
-                elif code == '22':
-                    # Normal weight
-                    current_format.setFontWeight(400)
-            
+                chunks.append((text[last_end:match.start()], self.format))
+            if match.group(2) == 'm':
+                self._apply_sgr(match.group(1))
             last_end = match.end()
         
         # Add remaining text
         if last_end < len(text):
-            chunk_text = text[last_end:]
-            chunks.append((chunk_text, QTextCharFormat(current_format)))
+            chunks.append((text[last_end:], self.format))
         
         return chunks
     
+    def flush(self) -> List[Tuple[str, QTextCharFormat]]:
+        """Returns a still-incomplete escape as literal text (end of stream)."""
+        pending, self.pending = self.pending, ""
+        return [(pending, self.format)] if pending else []
+    
+    @staticmethod
+    def parse(text: str) -> List[Tuple[str, QTextCharFormat]]:
+        """
+        Parse a complete text on its own (starting from the default format).
+        
+        Args:
+            text: Raw text with ANSI escape codes
+            
+        Returns:
+            List of (text_chunk, QTextCharFormat) tuples
+        """
+        parser = ANSIParser()
+        return parser.feed(text) + parser.flush()
+    
     @staticmethod
     def strip_ansi(text: str) -> str:
         """
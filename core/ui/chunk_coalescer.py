@@ -0,0 +1,94 @@
+import threading
+import time
+from typing import Callable
+from core.config import settings
+
+class ChunkCoalescer:
+    """
+    Batches streamed text into frames before it crosses into the UI thread.
+
+    Every emission is a queued cross-thread signal, a console print and (in ghost
+    mode) a relayout of the terminal widget, so token-sized chunks are merged:
+    1. The first chunk of a turn is emitted immediately (time to first token is untouched).
+    2. Later chunks are held until 'interval_ms' has passed or 'max_chars' accumulate.
+    3. One long-lived flusher thread emits the tail if the stream stalls mid-frame
+       (no thread per frame); 'flush()' ends a turn and 'close()' stops the flusher.
+    """
+    def __init__(self, emit: Callable[[str, str], None], interval_ms: int = None, max_chars: int = None):
+        self.emit = emit
+        self.interval = (settings.CHUNK_FRAME_MS if interval_ms is None else interval_ms) / 1000.0
+        self.max_chars = settings.CHUNK_MAX_CHARS if max_chars is None else max_chars
+        self.chunks = 0
+        self.frames = 0
+        self._buffer = []
+        self._size = 0
+        self._vector = None
+        self._first = True
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+        self._pending = threading.Condition(self._lock)
+        self._flusher = None
+        self._closed = False
+
+    def begin_turn(self):
+        """Flushes leftovers and re-arms the immediate first-token flush."""
+        with self._lock:
+            self._flush_locked()
+            self._first = True
+            self.chunks = 0
+            self.frames = 0
+
+    def push(self, text: str, vector: str):
+        if not text:
+            return
+        with self._lock:
+            self.chunks += 1
+            # Frames never mix vectors; the UI colors them differently
+            if self._vector != vector:
+                self._flush_locked()
+            self._buffer.append(text)
+            self._size += len(text)
+            self._vector = vector
+
+            elapsed = time.monotonic() - self._last_flush
+            if self._first or self._size >= self.max_chars or elapsed >= self.interval:
+                self._flush_locked()
+            else:
+                if not self._flusher and not self._closed:
+                    self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name="sidecar-chunk-flush")
+                    self._flusher.start()
+                self._pending.notify()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """Emits the tail and stops the flusher thread."""
+        with self._lock:
+            self._flush_locked()
+            self._closed = True
+            self._pending.notify()
+
+    def _flush_loop(self):
+        with self._lock:
+            while not self._closed:
+                if not self._buffer:
+                    self._pending.wait()
+                    continue
+                remaining = self._last_flush + self.interval - time.monotonic()
+                if remaining > 0:
+                    self._pending.wait(remaining)
+                    continue
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        text = "".join(self._buffer)
+        self._buffer = []
+        self._size = 0
+        self._first = False
+        self._last_flush = time.monotonic()
+        self.frames += 1
+        self.emit(text, self._vector)
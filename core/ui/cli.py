@@ -14,15 +14,19 @@ class CLI:
     Style = Style
 
     @staticmethod
-    def wait_for_interrupt(timeout: int = 2) -> bool:
+    def wait_for_interrupt(timeout: int = 2, abort=None) -> bool:
         """
         Displays a countdown and waits for a keypress.
-        Returns True if a key was pressed (indicating a request for setup).
+        Returns True if a key was pressed (indicating a request for setup),
+        or as soon as the optional 'abort()' check returns True.
         """
         print(f"\n{Fore.YELLOW}Launching last session... {Fore.WHITE}(Press any key for Setup in {timeout}s) ", end="", flush=True)
         
         start_time = time.time()
         while time.time() - start_time < timeout:
+            if abort and abort():
+                print()
+                return True
             remaining = int(timeout - (time.time() - start_time))
             print(f"\r{Fore.YELLOW}Launching last session... {Fore.WHITE}(Press any key for Setup in {remaining}s) ", end="", flush=True)
             
@@ -186,6 +190,7 @@ class CLI:
         print("  [E]ngine:  Ctrl + Alt + Shift + E")
         print("  [M]odel:   Ctrl + Alt + Shift + M")
         print("  [S]wap:    Ctrl + Alt + Shift + S")
+        print("  [X]Cancel: Ctrl + Alt + Shift + X  (Abort the current response)")
         print("-" * 30)
     @staticmethod
     def prompt_for_variables(skill_name, placeholders):
@@ -15,6 +15,10 @@ HK_ID_MOVE_LEFT = 110
 HK_ID_MOVE_RIGHT = 111
 HK_ID_SCROLL_UP = 112
 HK_ID_SCROLL_DOWN = 113
+HK_ID_CANCEL = 114
+HK_ID_PIXEL_FRESH = 115
+HK_ID_TALK_FRESH = 116
+HK_ID_FUSED = 117
 
 class HotkeyOrchestrator:
     """
@@ -32,27 +36,51 @@ class HotkeyOrchestrator:
     def get_mappings(self) -> dict:
         """
         Constructs the configuration mapping for the HotkeyThread.
-        Maps VK codes from settings to internal Hotkey IDs and display labels.
+        Maps internal Hotkey IDs to VK codes from settings and display labels.
+        Keyed by ID so two hotkeys may share a key with different modifiers.
+        The cache-bypass hotkeys are only registered while the response cache is on.
         """
-        return {
-            settings.HK_PIXEL[0]: (HK_ID_PIXEL, "Pixel [P]", settings.HK_PIXEL[1]),
-            settings.HK_TALK[0]: (HK_ID_TALK, "Talk [T]", settings.HK_TALK[1]),
-            settings.HK_MODEL[0]: (HK_ID_MODEL, "Model [M]", settings.HK_MODEL[1]),
-            settings.HK_ENGINE[0]: (HK_ID_ENGINE, "Engine [E]", settings.HK_ENGINE[1]),
-            settings.HK_SKILL[0]: (HK_ID_SKILL, "Skill [S]", settings.HK_SKILL[1]),
+        mappings = {
+            HK_ID_PIXEL: (settings.HK_PIXEL[0], "Pixel [P]", settings.HK_PIXEL[1]),
+            HK_ID_TALK: (settings.HK_TALK[0], "Talk [T]", settings.HK_TALK[1]),
+            HK_ID_MODEL: (settings.HK_MODEL[0], "Model [M]", settings.HK_MODEL[1]),
+            HK_ID_ENGINE: (settings.HK_ENGINE[0], "Engine [E]", settings.HK_ENGINE[1]),
+            HK_ID_SKILL: (settings.HK_SKILL[0], "Skill [S]", settings.HK_SKILL[1]),
+            HK_ID_CANCEL: (settings.HK_CANCEL[0], "Cancel [X]", settings.HK_CANCEL[1]),
+            HK_ID_FUSED: (settings.HK_FUSED[0], "View+Voice [V]", settings.HK_FUSED[1]),
             
             # Spatial Controls
-            settings.HK_MOVE_UP[0]: (HK_ID_MOVE_UP, "Move Up", settings.HK_MOVE_UP[1]),
-            settings.HK_MOVE_DOWN[0]: (HK_ID_MOVE_DOWN, "Move Down", settings.HK_MOVE_DOWN[1]),
-            settings.HK_MOVE_LEFT[0]: (HK_ID_MOVE_LEFT, "Move Left", settings.HK_MOVE_LEFT[1]),
-            settings.HK_MOVE_RIGHT[0]: (HK_ID_MOVE_RIGHT, "Move Right", settings.HK_MOVE_RIGHT[1]),
+            HK_ID_MOVE_UP: (settings.HK_MOVE_UP[0], "Move Up", settings.HK_MOVE_UP[1]),
+            HK_ID_MOVE_DOWN: (settings.HK_MOVE_DOWN[0], "Move Down", settings.HK_MOVE_DOWN[1]),
+            HK_ID_MOVE_LEFT: (settings.HK_MOVE_LEFT[0], "Move Left", settings.HK_MOVE_LEFT[1]),
+            HK_ID_MOVE_RIGHT: (settings.HK_MOVE_RIGHT[0], "Move Right", settings.HK_MOVE_RIGHT[1]),
             
             # Appearance & Navigation
-            settings.HK_FONT_UP[0]: (HK_ID_FONT_INCREASE, "Font+", settings.HK_FONT_UP[1]),
-            settings.HK_FONT_DOWN[0]: (HK_ID_FONT_DECREASE, "Font-", settings.HK_FONT_DOWN[1]),
-            settings.HK_SCROLL_UP[0]: (HK_ID_SCROLL_UP, "Scroll Up", settings.HK_SCROLL_UP[1]),
-            settings.HK_SCROLL_DOWN[0]: (HK_ID_SCROLL_DOWN, "Scroll Down", settings.HK_SCROLL_DOWN[1]),
+            HK_ID_FONT_INCREASE: (settings.HK_FONT_UP[0], "Font+", settings.HK_FONT_UP[1]),
+            HK_ID_FONT_DECREASE: (settings.HK_FONT_DOWN[0], "Font-", settings.HK_FONT_DOWN[1]),
+            HK_ID_SCROLL_UP: (settings.HK_SCROLL_UP[0], "Scroll Up", settings.HK_SCROLL_UP[1]),
+            HK_ID_SCROLL_DOWN: (settings.HK_SCROLL_DOWN[0], "Scroll Down", settings.HK_SCROLL_DOWN[1]),
         }
+        if settings.RESPONSE_CACHE_ENABLED:
+            mappings[HK_ID_PIXEL_FRESH] = (settings.HK_PIXEL_FRESH[0], "Pixel Fresh", settings.HK_PIXEL_FRESH[1])
+            mappings[HK_ID_TALK_FRESH] = (settings.HK_TALK_FRESH[0], "Talk Fresh", settings.HK_TALK_FRESH[1])
+        return mappings
+
+    def _toggle_model(self):
+        self.worker.brain.toggle_model()
+        logger.info(f"Active model: {self.worker.brain.get_model_name()}")
+
+    def _switch_engine(self):
+        logger.info(self.worker.brain.switch_engine())
+
+    def dispatch_immediate(self, hk_id: int):
+        """
+        Dispatched directly on the hotkey thread (DirectConnection).
+        Reserved for thread-safe actions that must not queue behind a busy UI thread.
+        """
+        if hk_id == HK_ID_CANCEL:
+            logger.debug(f"Hotkey event: Cancel ({hk_id})")
+            self.worker.cancel_generation()
 
     def dispatch(self, hk_id: int):
         """Dispatched from the UI thread to trigger safe cross-thread actions."""
@@ -60,23 +88,33 @@ class HotkeyOrchestrator:
         # 1. Primary AI Analysis Vectors
         if hk_id == HK_ID_PIXEL:
             logger.debug(f"Hotkey event: Pixel ({hk_id})")
-            self.worker.handle_pixel_request()
+            self.worker.request_pixel()
             return
         elif hk_id == HK_ID_TALK:
             logger.debug(f"Hotkey event: Talk ({hk_id})")
-            self.worker.handle_verbal_request()
+            self.worker.request_talk()
+            return
+        elif hk_id == HK_ID_PIXEL_FRESH:
+            logger.debug(f"Hotkey event: Pixel, cache bypass ({hk_id})")
+            self.worker.request_pixel(bypass_cache=True)
+            return
+        elif hk_id == HK_ID_TALK_FRESH:
+            logger.debug(f"Hotkey event: Talk, cache bypass ({hk_id})")
+            self.worker.request_talk(bypass_cache=True)
+            return
+        elif hk_id == HK_ID_FUSED:
+            logger.debug(f"Hotkey event: View+Voice ({hk_id})")
+            self.worker.request_fused()
             return
             
         # 2. Intelligence State Management
         elif hk_id == HK_ID_MODEL:
             logger.debug(f"Hotkey event: Model Toggle ({hk_id})")
-            self.worker.brain.toggle_model()
-            logger.info(f"Active model: {self.worker.brain.get_model_name()}")
+            self.worker.request_housekeeping("model", self._toggle_model)
             return
         elif hk_id == HK_ID_ENGINE:
             logger.debug(f"Hotkey event: Engine Switch ({hk_id})")
-            msg = self.worker.brain.switch_engine()
-            logger.info(msg)
+            self.worker.request_housekeeping("engine", self._switch_engine)
             return
             
         # UI-dependent hotkeys (only dispatch if terminal exists)
@@ -12,16 +12,16 @@ class HotkeyThread(QThread):
     def __init__(self, mappings: dict):
         super().__init__()
         self.manager = HotkeyManager()
-        # Mappings format: {VK_CODE: (id, label)} or {VK_CODE: (id, label, modifiers)}
+        # Mappings format: {id: (VK_CODE, label)} or {id: (VK_CODE, label, modifiers)}
         self.mappings = mappings
 
     def run(self):
         logger.info("Hotkey Thread started.")
-        for vk, mapping in self.mappings.items():
+        for hk_id, mapping in self.mappings.items():
             if len(mapping) == 3:
-                hk_id, label, modifiers = mapping
+                vk, label, modifiers = mapping
             else:
-                hk_id, label = mapping
+                vk, label = mapping
                 modifiers = None  # Use default from HotkeyManager
                 
             if self.manager.register_hotkey(hk_id, vk, lambda id=hk_id: self.signal_hotkey.emit(id), modifiers):
@@ -32,6 +32,8 @@ class HotkeyThread(QThread):
         self.manager.listen(exit_callback=lambda: logger.warning("Hotkey thread shutting down."))
 
     def stop(self):
-        self.manager.unregister_all()
-        self.terminate()
-        self.wait()
+        # Registrations belong to the listening thread, which unregisters them on WM_QUIT
+        if not (self.manager.stop() and self.wait(1000)):
+            self.manager.unregister_all()
+            self.terminate()
+            self.wait()
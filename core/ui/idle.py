@@ -0,0 +1,91 @@
+import signal
+import socket
+from typing import Callable, Optional
+from PyQt6.QtCore import QObject, QSocketNotifier, QTimer
+from core.utils.wakeups import wakeups
+
+# Upper bound on how fast a user moves the pointer across the screen
+CURSOR_SPEED_PX_PER_SEC = 4000
+
+def backoff_interval(distance_px: float, min_ms: int, max_ms: int, speed_px_per_sec: float = CURSOR_SPEED_PX_PER_SEC) -> int:
+    """
+    Poll delay for a pointer 'distance_px' away from the interactive zone.
+    The pointer cannot cross that distance faster than 'speed_px_per_sec', so
+    polling any sooner would only find it still outside.
+    """
+    if distance_px <= 0:
+        return min_ms
+    return int(max(min_ms, min(max_ms, distance_px / speed_px_per_sec * 1000)))
+
+class AdaptivePoller(QObject):
+    """
+    Single-shot timer whose callback picks the delay until its next run.
+
+    1. The callback returns the next delay in ms (None = 'min_ms').
+    2. Delays are clamped to [min_ms, max_ms].
+    3. 'suspend()' stops polling entirely (e.g. while the window is hidden).
+    """
+    def __init__(self, name: str, callback: Callable[[], Optional[int]], min_ms: int = 50, max_ms: int = 1000, parent: QObject = None):
+        super().__init__(parent)
+        self.name = name
+        self.callback = callback
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.wakeups = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._run)
+
+    @property
+    def active(self) -> bool:
+        return self._timer.isActive()
+
+    @property
+    def interval(self) -> int:
+        return self._timer.interval()
+
+    def resume(self):
+        if not self._timer.isActive():
+            self._timer.start(self.min_ms)
+
+    def suspend(self):
+        self._timer.stop()
+
+    def _run(self):
+        self.wakeups += 1
+        wakeups.tick(self.name)
+        delay = self.callback()
+        delay = self.min_ms if delay is None else max(self.min_ms, min(self.max_ms, delay))
+        self._timer.start(delay)
+
+class SignalWakeup(QObject):
+    """
+    Runs Python signal handlers (Ctrl+C) promptly inside the Qt event loop.
+
+    Python only runs handlers when the interpreter regains control, which is why
+    a no-op timer used to tick twice a second. Instead, the C-level handler writes
+    to a socket (signal.set_wakeup_fd) that Qt watches, so the loop wakes only
+    when a signal actually arrives. Must be created on the main thread.
+    """
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+        self._reader, self._writer = socket.socketpair()
+        self._reader.setblocking(False)
+        self._writer.setblocking(False)
+        self._previous_fd = signal.set_wakeup_fd(self._writer.fileno())
+        self.notifier = QSocketNotifier(self._reader.fileno(), QSocketNotifier.Type.Read, self)
+        self.notifier.activated.connect(self._drain)
+
+    def _drain(self):
+        wakeups.tick("signal")
+        try:
+            while self._reader.recv(64):
+                pass
+        except OSError:
+            pass
+
+    def close(self):
+        self.notifier.setEnabled(False)
+        signal.set_wakeup_fd(self._previous_fd)
+        self._reader.close()
+        self._writer.close()
@@ -0,0 +1,74 @@
+import itertools
+import queue
+import threading
+from typing import Callable
+from core.utils.logger import logger
+
+# Lower runs first
+PRIORITY_TALK = 0
+PRIORITY_PIXEL = 1
+PRIORITY_HOUSEKEEPING = 2
+
+class JobQueue:
+    """
+    Priority queue of named jobs serviced by a single consumer thread.
+
+    1. Lower priority values run first; jobs of equal priority run in submit order.
+    2. Submitting a job whose name is already pending is coalesced (dropped).
+    3. 'busy' is set for exactly as long as a job is running.
+    """
+    _STOP = -1
+
+    def __init__(self):
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._busy = threading.Event()
+        self.coalesced = 0
+
+    @property
+    def busy(self) -> bool:
+        return self._busy.is_set()
+
+    def is_pending(self, name: str) -> bool:
+        with self._lock:
+            return name in self._pending
+
+    def submit(self, name: str, fn: Callable, priority: int = PRIORITY_HOUSEKEEPING, **kwargs) -> bool:
+        """Queues 'fn(**kwargs)'. Safe to call from any thread; returns False if coalesced."""
+        with self._lock:
+            if name in self._pending:
+                self.coalesced += 1
+                return False
+            self._pending.add(name)
+        self._queue.put((priority, next(self._seq), name, fn, kwargs))
+        return True
+
+    def stop(self):
+        """Makes 'run_forever' return once the running job (if any) finishes."""
+        self._queue.put((self._STOP, next(self._seq), None, None, None))
+
+    def run_next(self, timeout: float = None) -> bool:
+        """Runs one job; returns False on stop or timeout."""
+        try:
+            _, _, name, fn, kwargs = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return False
+        if fn is None:
+            return False
+
+        with self._lock:
+            self._pending.discard(name)
+        self._busy.set()
+        try:
+            fn(**kwargs)
+        except Exception as e:
+            logger.error(f"Job '{name}' failed: {e}")
+        finally:
+            self._busy.clear()
+        return True
+
+    def run_forever(self):
+        while self.run_next():
+            pass
@@ -0,0 +1,70 @@
+import time
+from typing import Callable, List, Optional
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QTextCursor
+from PyQt6.QtWidgets import QPlainTextEdit
+from core.config import settings
+from core.ui.ansi_parser import ANSIParser
+
+class TerminalRenderQueue:
+    """
+    Frame-paced writer for the ghost terminal's QPlainTextEdit.
+
+    1. The first write after a quiet frame renders at once (first tokens are not delayed);
+       later writes only queue text, the document is not touched per write.
+    2. A single-shot timer flushes the rest at most once per frame: one edit block,
+       one insert per colour run, one scroll to the end.
+    3. Colours are parsed incrementally, so state and split escapes carry across
+       frames; text without an escape byte takes the parser's fast path.
+    'on_flush' receives each frame's text, escapes removed, after the insert.
+    """
+    def __init__(self, view: QPlainTextEdit, frame_ms: int = None, on_flush: Optional[Callable[[str], None]] = None):
+        self.view = view
+        self.on_flush = on_flush
+        self.pushes = 0
+        self.flushes = 0
+        self._pending: List[str] = []
+        self.parser = ANSIParser()
+        self.frame_ms = settings.CHUNK_FRAME_MS if frame_ms is None else frame_ms
+        self._last_flush = float("-inf")
+
+        self._timer = QTimer(view)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def push(self, text: str):
+        if not text:
+            return
+        self.pushes += 1
+        self._pending.append(text)
+        if self._timer.isActive():
+            return
+        remaining_ms = self.frame_ms - (time.monotonic() - self._last_flush) * 1000
+        if remaining_ms <= 0:
+            self.flush()
+        else:
+            self._timer.start(int(remaining_ms) + 1)
+
+    def flush(self):
+        """Writes everything queued since the last frame in a single document update."""
+        self._timer.stop()
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending.clear()
+        self.flushes += 1
+        self._last_flush = time.monotonic()
+
+        cursor = QTextCursor(self.view.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        runs = self.parser.feed(text)
+        for chunk_text, text_format in runs:
+            cursor.insertText(chunk_text, text_format)
+        cursor.endEditBlock()
+        text = runs[0][0] if len(runs) == 1 else "".join(chunk_text for chunk_text, _ in runs)
+        if self.on_flush:
+            self.on_flush(text)
+
+        self.view.setTextCursor(cursor)
+        self.view.ensureCursorVisible()
@@ -0,0 +1,121 @@
+import mmap
+import os
+import threading
+from array import array
+from collections import deque
+from typing import List, Optional
+
+class ScrollbackArchive:
+    """
+    Append-only transcript of lines evicted from the terminal.
+
+    Lines are written as UTF-8 text with a byte-offset index kept in memory, so
+    any range can be read back (via mmap) without scanning the file.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._offsets = array('Q', [0])   # Start of each line; the last entry is the end of file
+        self._lock = threading.Lock()
+        self._map: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # One transcript per session
+        self._file = open(path, 'wb')
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def append(self, lines: List[str]):
+        if not lines:
+            return
+        data = "".join(line + "\n" for line in lines).encode("utf-8", errors="replace")
+        with self._lock:
+            self._file.write(data)
+            end = self._offsets[-1]
+            for line in lines:
+                end += len(line.encode("utf-8", errors="replace")) + 1
+                self._offsets.append(end)
+            self._file.flush()
+
+    def _view(self) -> Optional[mmap.mmap]:
+        size = self._offsets[-1]
+        if size == 0:
+            return None
+        if self._map is None or self._mapped_size != size:
+            if self._map is not None:
+                self._map.close()
+            with open(self.path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_size = size
+        return self._map
+
+    def read(self, start: int, count: int) -> List[str]:
+        """Returns up to 'count' archived lines beginning at line index 'start'."""
+        with self._lock:
+            start = max(0, start)
+            stop = min(len(self), start + count)
+            if start >= stop:
+                return []
+            view = self._view()
+            data = view[self._offsets[start]:self._offsets[stop]]
+        return data.decode("utf-8", errors="replace").split("\n")[:stop - start]
+
+    def search(self, term: str, limit: int = 50) -> List[int]:
+        """Indices of archived lines containing 'term' (case-sensitive), oldest first."""
+        needle = term.encode("utf-8")
+        hits = []
+        with self._lock:
+            view = self._view()
+            if not view or not needle:
+                return hits
+            pos = view.find(needle)
+            while pos != -1 and len(hits) < limit:
+                # Offsets are sorted; locate the containing line by bisection
+                lo, hi = 0, len(self) - 1
+                while lo < hi:
+                    mid = (lo + hi + 1) // 2
+                    if self._offsets[mid] <= pos:
+                        lo = mid
+                    else:
+                        hi = mid - 1
+                hits.append(lo)
+                pos = view.find(needle, self._offsets[lo + 1])
+        return hits
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+
+class Scrollback:
+    """
+    Plain-text mirror of the terminal's visible lines with a fixed capacity.
+
+    Mirrors QTextDocument.maximumBlockCount semantics: the last entry is the line
+    still being written, and each line pushed past capacity is evicted in O(1)
+    and appended to the archive.
+    """
+    def __init__(self, max_lines: int, archive: Optional[ScrollbackArchive] = None):
+        self.max_lines = max_lines
+        self.archive = archive
+        self.lines = deque([""], maxlen=max_lines)
+
+    def append(self, text: str):
+        parts = text.split("\n")
+        self.lines[-1] += parts[0]
+        evicted = []
+        for part in parts[1:]:
+            if len(self.lines) == self.max_lines:
+                evicted.append(self.lines[0])
+            self.lines.append(part)
+        if evicted and self.archive is not None:
+            self.archive.append(evicted)
+
+    def search(self, term: str) -> List[str]:
+        """Matching lines from the archive and the live buffer, oldest first."""
+        found = []
+        if self.archive is not None:
+            found = [self.archive.read(i, 1)[0] for i in self.archive.search(term)]
+        return found + [line for line in self.lines if term in line]
@@ -1,7 +1,10 @@
 from PyQt6.QtWidgets import QMainWindow, QPlainTextEdit, QVBoxLayout, QWidget
 from PyQt6.QtCore import Qt, QTimer, QRect
-from PyQt6.QtGui import QFont, QTextCursor, QCursor
-from core.ui.ansi_parser import ANSIParser
+from PyQt6.QtGui import QColor, QFont, QTextCharFormat, QTextCursor, QCursor
+from core.config import settings
+from core.ui.render_queue import TerminalRenderQueue
+from core.ui.scrollback import Scrollback, ScrollbackArchive
+from core.ui.idle import AdaptivePoller, backoff_interval
 from core.drivers.window_manager import apply_ghost_mode, set_always_on_top, set_click_through
 from core.utils.logger import logger
 
@@ -14,17 +17,28 @@ class TerminalGhostWindow(QMainWindow):
     Overriding 'nativeEvent' for WM_NCHITTEST is highly unstable during window initialization
     and caused persistent silent crashes. 
     
-    Instead, we poll the mouse position (20Hz) and toggle the Win32 'WS_EX_TRANSPARENT' 
+    Instead, we poll the mouse position and toggle the Win32 'WS_EX_TRANSPARENT' 
     style dynamically. This allows the scrollbar to be interactive while the rest of 
     the window remains click-through 'Ghost' content.
+    
+    Polling is idle-aware: 20Hz only while the cursor is near the scrollbar, backing
+    off with distance (up to 1Hz), and suspended entirely while the window is hidden.
+    
+    SCROLLBACK NOTE:
+    The document is capped with 'setMaximumBlockCount', so Qt evicts the oldest
+    line in constant time. With GHOST_SCROLLBACK_PATH set, evicted lines go to an
+    on-disk transcript and are paged back in when the user scrolls past the top.
     """
+    HISTORY_PAGE = 200 # Archived lines loaded per scroll past the top
     
     def __init__(self, opacity: float = 0.78, font_size: int = 10, font_family: str = "Consolas"):
         super().__init__()
         
         self.opacity = opacity
-        self.max_lines = 1000
+        self.max_lines = settings.GHOST_SCROLLBACK_LINES
+        self._history_loaded = 0 # Archived lines currently shown above the live output
         self._is_currently_click_through = False
+        self._ghost_applied = False
         
         # 1. Window Configuration
         # Frameless, Always-on-Top, and hidden from Taskbar (Tool window)
@@ -74,6 +88,15 @@ class TerminalGhostWindow(QMainWindow):
             }}
         """)
         self.layout.addWidget(self.terminal)
+        # Writes are batched and applied at most once per display frame
+        self.render_queue = TerminalRenderQueue(self.terminal, on_flush=self._on_render)
+        
+        # Bounded scrollback (this also disables the unbounded undo history)
+        self.terminal.document().setMaximumBlockCount(self.max_lines)
+        archive = ScrollbackArchive(settings.GHOST_SCROLLBACK_PATH) if settings.GHOST_SCROLLBACK_PATH else None
+        self.scrollback = Scrollback(self.max_lines, archive)
+        self._history_format = QTextCharFormat()
+        self._history_format.setForeground(QColor(128, 128, 128))
         
         # 6. Minimalist Ghost Scrollbar
         self.terminal.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
@@ -108,9 +131,8 @@ class TerminalGhostWindow(QMainWindow):
         self.resize(800, 600)
         
         # 8. Mouse Polling for Interactivity
-        # This timer drives the hybrid hit-testing logic safely.
-        self.mouse_poll_timer = QTimer(self)
-        self.mouse_poll_timer.timeout.connect(self._update_mouse_interactivity)
+        # This poller drives the hybrid hit-testing logic safely; each run picks its next delay.
+        self.mouse_poller = AdaptivePoller("hit-test", self._update_mouse_interactivity, min_ms=50, max_ms=1000, parent=self)
         
         # 9. Apply Win32 Ghost Mode (Delayed for stability)
         # We wait 500ms to ensure the window is fully mapped before applying OS-level affinity.
@@ -124,19 +146,37 @@ class TerminalGhostWindow(QMainWindow):
                 logger.success("Ghost Protocol applied to terminal window.")
             set_always_on_top(hwnd, True)
             
-            # Start mouse polling (50ms interval = snappy 20fps hit-testing)
-            self.mouse_poll_timer.start(50)
+            # Start mouse polling (50ms near the scrollbar = snappy 20fps hit-testing)
+            self._ghost_applied = True
+            self.mouse_poller.resume()
             logger.success("Dynamic Hit-Testing ACTIVE (Scrollbar interaction ready)")
         except Exception as e:
             logger.error(f"Critical error applying ghost mode: {e}")
             
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._ghost_applied:
+            self.mouse_poller.resume()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.mouse_poller.suspend()
+
+    @staticmethod
+    def _distance(rect: QRect, point) -> float:
+        dx = max(rect.left() - point.x(), 0, point.x() - rect.right())
+        dy = max(rect.top() - point.y(), 0, point.y() - rect.bottom())
+        return (dx * dx + dy * dy) ** 0.5
+
     def _update_mouse_interactivity(self):
         """
         Toggles window click-through state based on mouse proximity to the scrollbar.
         This provides a 'Solid' feel for interactions without breaking the 'Ghost' experience.
+        Returns the delay (ms) until the next poll.
         """
         if not self.isVisible():
-            return
+            return self.mouse_poller.max_ms
+        next_poll = self.mouse_poller.max_ms
 
         try:
             hwnd = int(self.winId())
@@ -165,6 +205,10 @@ class TerminalGhostWindow(QMainWindow):
                 
                 if sb_global_rect.contains(cursor_pos) or interaction_zone.contains(cursor_pos):
                     should_be_interactive = True
+                
+                # Back off while the cursor is far from anything it could interact with
+                distance = min(self._distance(sb_global_rect, cursor_pos), self._distance(interaction_zone, cursor_pos))
+                next_poll = backoff_interval(distance, self.mouse_poller.min_ms, self.mouse_poller.max_ms)
             
             # Update the Win32 Layered style ONLY when the state changes.
             is_click_through = not should_be_interactive
@@ -175,31 +219,50 @@ class TerminalGhostWindow(QMainWindow):
         except Exception:
             # Silent fail for hit-testing to prevent UI stutters
             pass
+        return next_poll
 
     def append_text(self, text: str):
-        """Append text to the terminal with full ANSI color support."""
-        chunks = ANSIParser.parse(text)
-        
-        cursor = self.terminal.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
+        """Queue text (with ANSI colors) for the next frame's render."""
+        self.render_queue.push(text)
         
-        for chunk_text, text_format in chunks:
-            cursor.insertText(chunk_text, text_format)
-        
-        self.terminal.setTextCursor(cursor)
-        self.terminal.ensureCursorVisible()
-        self._trim_history()
-        
-    def _trim_history(self):
-        """Maintain performance by limiting the terminal buffer length."""
+    def _on_render(self, text: str):
+        """Mirrors each rendered frame; new output returns the view to live mode."""
+        self.scrollback.append(text)
+        self._release_history()
+
+    def _load_history(self, count: int):
+        """Pages older lines from the transcript in above the live output."""
+        archive = self.scrollback.archive
+        if archive is None:
+            return
+        end = len(archive) - self._history_loaded
+        start = max(0, end - count)
+        lines = archive.read(start, end - start)
+        if not lines:
+            return
         doc = self.terminal.document()
-        if doc.blockCount() > self.max_lines:
-            cursor = QTextCursor(doc)
-            cursor.movePosition(QTextCursor.MoveOperation.Start)
-            for _ in range(doc.blockCount() - self.max_lines):
-                cursor.select(QTextCursor.SelectionType.BlockUnderCursor)
-                cursor.removeSelectedText()
-                cursor.deleteChar() # Remove trailing block separator
+        # Lift the cap so the prepended lines are not evicted straight away
+        doc.setMaximumBlockCount(self.max_lines + self._history_loaded + len(lines))
+        cursor = QTextCursor(doc)
+        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        cursor.insertText("\n".join(lines) + "\n", self._history_format)
+        self._history_loaded += len(lines)
+        self.terminal.verticalScrollBar().setValue(len(lines))
+
+    def _release_history(self):
+        if self._history_loaded:
+            # Lowering the cap drops the paged-in lines from the top at once
+            self.terminal.document().setMaximumBlockCount(self.max_lines)
+            self._history_loaded = 0
+
+    def close_history(self):
+        """Closes the on-disk transcript (at shutdown)."""
+        if self.scrollback.archive is not None:
+            self.scrollback.archive.close()
+
+    def search_history(self, term: str) -> list:
+        """Lines containing 'term' across the transcript and the live buffer, oldest first."""
+        return self.scrollback.search(term)
                 
     def increase_font_size(self):
         """Dynamic font scaling via hotkeys."""
@@ -231,6 +294,8 @@ class TerminalGhostWindow(QMainWindow):
         
     def scroll_up(self, lines: int = 5):
         scrollbar = self.terminal.verticalScrollBar()
+        if scrollbar.value() == scrollbar.minimum():
+            self._load_history(self.HISTORY_PAGE)
         scrollbar.setValue(scrollbar.value() - (lines * 20)) 
         
     def scroll_down(self, lines: int = 5):
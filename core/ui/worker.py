@@ -1,13 +1,24 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
 from PyQt6.QtCore import QThread, pyqtSignal
 from core.intelligence.model import SidecarBrain
 from core.intelligence.events import SidecarEventType
-from core.ingestion.orchestrator import RecordingState
+from core.intelligence.cancellation import CancellationToken
+from core.ui.chunk_coalescer import ChunkCoalescer
+from core.ui.job_queue import JobQueue, PRIORITY_TALK, PRIORITY_PIXEL, PRIORITY_HOUSEKEEPING
 from core.utils.logger import logger
 
 class SidecarWorker(QThread):
     """
     Background worker that runs the SidecarAI processing logic.
     Decouples intensive AI analysis from the GUI main thread to prevent UI freezing.
+    
+    Hotkeys only enqueue jobs ('request_*'); the 'handle_*' bodies run on this
+    thread's job loop, one at a time, Talk before Pixel before housekeeping.
+    Turn inputs (screen capture + PNG encode, recording stop + transcription) are
+    prepared on a side pool at press time, overlapping any response still streaming.
+    The fused View+Voice vector captures when recording starts, so the screenshot is
+    encoded while the user speaks and rides along with the transcript in one turn.
     """
     signal_chunk_update = pyqtSignal(str, str)  # Stream text chunks to UI
     signal_status_update = pyqtSignal(str)      # Update UI status text
@@ -19,88 +30,213 @@ class SidecarWorker(QThread):
         self.capture_tool = components["capture_tool"]
         self.recorder = components["recorder"]
         self.skill_manager = components["skill_manager"]
-        self.processing_turn = False
+        self.warmer = components.get("warmer")
+        # Merges token-sized chunks into frames before they cross into the UI thread
+        self.chunk_bridge = ChunkCoalescer(self.signal_chunk_update.emit)
+        self.jobs = JobQueue()
+        self.prep = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sidecar-prep")
+        self.cancel_token = None
+        # Capture taken when a View+Voice recording started; None for plain Talk
+        self._fused_capture: Optional[Future] = None
 
-    def handle_pixel_request(self):
-        """Vector P: Triggers screen capture and vision-based analysis."""
-        if self.processing_turn:
+    @property
+    def is_busy(self) -> bool:
+        return self.jobs.busy
+
+    def request_pixel(self, bypass_cache: bool = False):
+        """Vector P: Captures now and queues the vision turn. Safe to call from any thread."""
+        if self.jobs.is_pending("pixel"):
+            logger.debug("Pixel request already queued.")
+            return
+        # A turn queued behind a stream can afford to wait for the upload
+        prepared = self._prepare_capture(patient=self.is_busy)
+        self._queue_turn("pixel", self.handle_pixel_request, PRIORITY_PIXEL, bypass_cache=bypass_cache, prepared=prepared)
+
+    def request_talk(self, bypass_cache: bool = False):
+        """
+        Vector T: Recording starts immediately, even while another turn streams.
+        Stopping transcribes right away on the prep pool; the answer is queued
+        ahead of any pending Pixel turn.
+        """
+        if self.recorder.is_idle and not self.jobs.is_pending("talk"):
+            self._start_recording()
+        elif self.recorder.is_recording and not self.jobs.is_pending("talk"):
+            self._stop_recording(bypass_cache)
+
+    def request_fused(self, bypass_cache: bool = False):
+        """
+        Vector P+T: Like Talk, but the screen is captured the moment recording
+        starts and the answer is one turn carrying both screenshot and transcript.
+        """
+        if self.recorder.is_idle and not self.jobs.is_pending("talk"):
+            self._fused_capture = self._prepare_capture(patient=True)
+            self._start_recording()
+        elif self.recorder.is_recording and not self.jobs.is_pending("talk"):
+            self._stop_recording(bypass_cache)
+
+    def _prepare_capture(self, patient: bool = False) -> Future:
+        """
+        Captures on the prep pool; the engine starts uploading the PNG as soon as it is encoded.
+        Only a 'patient' capture's turn waits for that upload; others send the image inline if it is unfinished.
+        """
+        capture = self.prep.submit(self.capture_tool.capture)
+        capture.add_done_callback(lambda done: self._prefetch_upload(done, patient))
+        return capture
+
+    def _prefetch_upload(self, capture: Future, patient: bool = False):
+        if capture.cancelled() or capture.exception():
             return
-        self.processing_turn = True
+        if capture.result():
+            self.brain.prefetch_image(capture.result(), patient=patient)
+
+    def _stop_recording(self, bypass_cache: bool):
+        """Transcribes on the prep pool and queues the answer (fused if the recording started as View+Voice)."""
+        transcript = self.prep.submit(self._finish_recording)
+        capture, self._fused_capture = self._fused_capture, None
+        if capture:
+            self._queue_turn("talk", self.handle_pixel_request, PRIORITY_TALK, bypass_cache=bypass_cache, prepared=capture, transcript=transcript)
+        else:
+            self._queue_turn("talk", self.handle_verbal_request, PRIORITY_TALK, bypass_cache=bypass_cache, prepared=transcript)
+
+    def _queue_turn(self, name: str, fn, priority: int, **kwargs):
+        busy = self.is_busy
+        if self.jobs.submit(name, fn, priority, **kwargs) and busy:
+            self.signal_status_update.emit(f"{name.capitalize()} turn queued; preparing input...")
+
+    def request_housekeeping(self, name: str, fn):
+        """Queues state changes (model/engine switches) so they never land mid-stream."""
+        self.jobs.submit(name, fn, PRIORITY_HOUSEKEEPING)
+
+    def stop(self):
+        """Aborts the running turn and ends the job loop."""
+        self.cancel_generation()
+        self.chunk_bridge.close()
+        self.jobs.stop()
+        self.prep.shutdown(wait=False, cancel_futures=True)
+
+    def _end_stream(self):
+        """Pushes the last partial frame out before the turn's closing output."""
+        self.chunk_bridge.flush()
+        logger.debug(f"Streamed {self.chunk_bridge.chunks} chunks in {self.chunk_bridge.frames} UI frames.")
+
+    def cancel_generation(self):
+        """Vector X: Aborts the in-flight stream. Safe to call from any thread."""
+        token = self.cancel_token
+        if token and not token.cancelled:
+            logger.warning("Cancelling in-flight generation...")
+            token.cancel()
+
+    def handle_pixel_request(self, bypass_cache: bool = False, prepared: Optional[Future] = None, transcript: Optional[Future] = None):
+        """
+        Vector P: Triggers screen capture (unless prepared at press time) and vision-based analysis.
+        With a 'transcript' future (View+Voice), the spoken words join the screenshot in the same turn.
+        """
+        self.cancel_token = CancellationToken()
+        self.chunk_bridge.begin_turn()
         
         try:
-            self.signal_status_update.emit("Capturing screen...")
-            
-            png_bytes = self.capture_tool.capture()
+            if prepared:
+                png_bytes = prepared.result()
+            else:
+                self.signal_status_update.emit("Capturing screen...")
+                png_bytes = self.capture_tool.capture()
             if not png_bytes: 
-                self.signal_chunk_update.emit("[!] Capture Failed.\n", "a")
+                self.chunk_bridge.push("[!] Capture Failed.\n", "a")
+                if transcript:
+                    # Still answer what was said, as its own turn
+                    self._queue_turn("talk", self.handle_verbal_request, PRIORITY_TALK, bypass_cache=bypass_cache, prepared=transcript)
                 return
+            audio_text = (transcript.result() or "") if transcript else ""
 
             self.signal_status_update.emit(f"Analyzing view ({self.brain.get_model_name()})...")
-            stream = self.brain.analyze_image_stream(png_bytes)
+            stream = self.brain.analyze_image_stream(png_bytes, audio_text, cancel_token=self.cancel_token, bypass_cache=bypass_cache)
             
             for event in stream:
                 if event.event_type == SidecarEventType.TEXT_CHUNK and event.content:
-                    self.signal_chunk_update.emit(event.content, "a")
+                    self.chunk_bridge.push(event.content, "a")
                 elif event.event_type == SidecarEventType.STATUS:
                     self.signal_status_update.emit(event.content)
                 elif event.event_type == SidecarEventType.ERROR:
                     logger.error(f"Vector A Error: {event.content}")
-                    self.signal_chunk_update.emit(f"\n[!] Error: {event.content}\n", "a")
+                    self.chunk_bridge.push(f"\n[!] Error: {event.content}\n", "a")
             
+            self._end_stream()
             print("\n")
-            logger.success("Vision Analysis Complete.")
+            if self.cancel_token.cancelled:
+                logger.warning("Vision Analysis Cancelled.")
+            else:
+                logger.success("Vision Analysis Complete.")
             
         except Exception as e:
             logger.error(f"Vector A Exception: {e}")
-            self.signal_chunk_update.emit(f"\n[!] Error: {str(e)}\n", "a")
+            self.chunk_bridge.push(f"\n[!] Error: {str(e)}\n", "a")
         finally:
-            self.processing_turn = False
-            self.signal_status_update.emit("READY")
+            self.chunk_bridge.flush()
+            if self.warmer:
+                self.warmer.touch()
+            self.cancel_token = None
+            # A Talk recording started mid-stream keeps its status
+            self.signal_status_update.emit("RECORDING..." if self.recorder.is_recording else "READY")
 
-    def handle_verbal_request(self):
-        """Vector T: Manages audio state (Start/Stop) and triggers transcription analysis."""
-        if self.processing_turn and not self.recorder.is_recording:
+    def _start_recording(self):
+        self.recorder.toggle()
+        # Connections get hot while the user is still speaking
+        if self.warmer:
+            self.warmer.warm_now()
+        self.signal_recording_toggle.emit(True)
+        self.signal_status_update.emit("RECORDING...")
+
+    def _finish_recording(self) -> Optional[str]:
+        """Stops the recording and transcribes it (runs on the prep pool)."""
+        _, audio_text = self.recorder.toggle()
+        self.signal_recording_toggle.emit(False)
+        return audio_text
+
+    def handle_verbal_request(self, bypass_cache: bool = False, prepared: Optional[Future] = None):
+        """Vector T: Triggers analysis of the transcription (stopping the recording unless prepared)."""
+        if not prepared and not self.recorder.is_recording:
             return
 
         try:
-            new_state, audio_text = self.recorder.toggle()
-            
-            if new_state == RecordingState.RECORDING:
-                self.signal_recording_toggle.emit(True)
-                self.signal_status_update.emit("RECORDING...")
-                return
-
-            self.signal_recording_toggle.emit(False)
+            audio_text = prepared.result() if prepared else self._finish_recording()
             
             if audio_text:
-                self.processing_turn = True
+                self.cancel_token = CancellationToken()
+                self.chunk_bridge.begin_turn()
                 self.signal_status_update.emit(f"Processing Intent: {audio_text[:30]}...")
                 
-                stream = self.brain.analyze_verbal_stream(audio_text)
+                stream = self.brain.analyze_verbal_stream(audio_text, cancel_token=self.cancel_token, bypass_cache=bypass_cache)
                 
                 for event in stream:
                     if event.event_type == SidecarEventType.TEXT_CHUNK and event.content:
-                        self.signal_chunk_update.emit(event.content, "b")
+                        self.chunk_bridge.push(event.content, "b")
                     elif event.event_type == SidecarEventType.STATUS:
                         self.signal_status_update.emit(event.content)
                     elif event.event_type == SidecarEventType.ERROR:
                         logger.error(f"Vector B Error: {event.content}")
-                        self.signal_chunk_update.emit(f"\n[!] Error: {event.content}\n", "b")
+                        self.chunk_bridge.push(f"\n[!] Error: {event.content}\n", "b")
                 
+                self._end_stream()
                 print("\n")
-                logger.success("Verbal Analysis Complete.")
+                if self.cancel_token.cancelled:
+                    logger.warning("Verbal Analysis Cancelled.")
+                else:
+                    logger.success("Verbal Analysis Complete.")
             else:
                 self.signal_status_update.emit("No input detected.")
                 
         except Exception as e:
             logger.error(f"Vector B Exception: {e}")
-            self.signal_chunk_update.emit(f"\n[!] Error: {str(e)}\n", "b")
+            self.chunk_bridge.push(f"\n[!] Error: {str(e)}\n", "b")
         finally:
-            if self.recorder.is_idle:
-                self.processing_turn = False
-                self.signal_status_update.emit("READY")
+            self.chunk_bridge.flush()
+            if self.warmer:
+                self.warmer.touch()
+            self.cancel_token = None
+            # A Talk recording started mid-stream keeps its status
+            self.signal_status_update.emit("RECORDING..." if self.recorder.is_recording else "READY")
 
     def run(self):
-        """Main event loop for the worker thread."""
+        """Job loop for the worker thread."""
         logger.info("Sidecar Worker thread active.")
-        self.exec()
+        self.jobs.run_forever()
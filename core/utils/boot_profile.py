@@ -0,0 +1,85 @@
+import builtins
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+class BootProfile:
+    """
+    Startup profiler for debug mode: import times and named boot phases.
+
+    1. 'start()' wraps '__import__' and times every first import, keeping self
+       and cumulative time per module like 'python -X importtime'.
+    2. 'phase(name)' times a block of the boot sequence (no-op when not started).
+    3. 'finish()' stops recording; 'report()' renders the slowest imports,
+       the phases and the time to READY.
+    Only the standard library is imported here, so it can start before anything else.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.started = None
+        self.ready_at = None
+        self.imports = [] # (module, self_s, cumulative_s, depth)
+        self.phases = [] # (name, start offset_s, duration_s)
+        self._original_import = None
+        self._local = threading.local() # Per-thread stack of child import time
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.started = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def finish(self):
+        """Marks READY and stops timing imports."""
+        if not self.enabled:
+            return
+        self.ready_at = time.perf_counter()
+        self.enabled = False
+        if builtins.__import__ == self._timed_import:
+            builtins.__import__ = self._original_import
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases.append((name, start - self.started, time.perf_counter() - start))
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Relative and repeated imports cost a dict lookup; only first loads are timed
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                self.imports.append((name, elapsed - children, elapsed, len(stack)))
+
+    def report(self, top: int = 15) -> str:
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for name, own, cumulative, depth in sorted(self.imports, key=lambda i: i[2], reverse=True)[:top]:
+            lines.append(f"import time: {own * 1e6:9.0f} | {cumulative * 1e6:10.0f} | {'  ' * depth}{name}")
+        for name, offset, duration in sorted(self.phases, key=lambda p: p[1]):
+            lines.append(f"phase: +{offset * 1000:7.1f}ms {duration * 1000:8.1f}ms  {name}")
+        if self.ready_at is not None:
+            lines.append(f"READY in {self.ready_at - self.started:.2f}s")
+        return "\n".join(lines)
+
+# Global boot profile
+boot_profile = BootProfile()
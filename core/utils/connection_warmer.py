@@ -0,0 +1,83 @@
+import threading
+import time
+from core.config import settings
+from core.utils.logger import logger
+
+def pool_limits() -> "httpx.Limits":
+    """
+    Connection pool limits shared by the engine HTTP clients.
+    httpx drops idle sockets after 5s by default, which would make every
+    keep-alive ping pointless, so idle expiry is stretched past the ping interval.
+    """
+    import httpx # Only the engines need it; the warmer itself loads with the boot path
+    return httpx.Limits(
+        max_connections=100,
+        max_keepalive_connections=20,
+        keepalive_expiry=settings.POOL_KEEPALIVE_EXPIRY
+    )
+
+class ConnectionWarmer:
+    """
+    Keeps provider connections hot so TLS and connection setup never land
+    inside a user-visible request.
+
+    Policy:
+    1. Warm every target once in the background right after bootstrap.
+    2. Re-warm once KEEPALIVE_INTERVAL seconds pass without traffic (idle keep-alive),
+       measured from the last traffic, so pings never drift toward the pool's idle expiry.
+    3. Warm on demand (e.g. when Talk recording starts) via 'warm_now'.
+    """
+    def __init__(self, targets: dict, idle_interval: int = None):
+        # Targets expose 'warm_up()'; missing engines (no API key) are skipped
+        self.targets = {name: t for name, t in targets.items() if t is not None}
+        self.idle_interval = settings.KEEPALIVE_INTERVAL if idle_interval is None else idle_interval
+        self.warmups = 0
+        self._last_activity = time.monotonic()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="connection-warmer")
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def warm_now(self):
+        """Requests an immediate background warm-up (non-blocking)."""
+        self._wake.set()
+
+    def touch(self):
+        """Marks real traffic; a live request keeps the pool warm by itself."""
+        self._last_activity = time.monotonic()
+
+    def _loop(self):
+        self._warm_all()
+        while not self._stop.is_set():
+            # With keep-alive disabled, only explicit warm_now() calls wake the thread.
+            # Otherwise sleep only until the idle interval since the last traffic runs out.
+            timeout = None
+            if self.idle_interval > 0:
+                timeout = max(0.0, self.idle_interval - (time.monotonic() - self._last_activity))
+            woken = self._wake.wait(timeout=timeout)
+            if self._stop.is_set():
+                break
+            self._wake.clear()
+            idle_for = time.monotonic() - self._last_activity
+            if woken or idle_for >= self.idle_interval:
+                self._warm_all()
+
+    def _warm_all(self):
+        start = time.perf_counter()
+        for name, target in self.targets.items():
+            try:
+                target.warm_up()
+            except Exception as e:
+                logger.debug(f"Warm-up failed for {name}: {e}")
+        self.warmups += 1
+        self.touch()
+        logger.debug(f"Connections warmed ({', '.join(self.targets)}) in {time.perf_counter() - start:.2f}s")
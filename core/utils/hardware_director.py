@@ -1,6 +1,3 @@
-import sounddevice as sd
-from core.ingestion.screen import get_available_monitors
-from core.utils.audio import get_wasapi_input_devices
 from core.ui.cli import CLI
 
 class HardwareDirector:
@@ -9,6 +6,9 @@ class HardwareDirector:
     """
     def select_hardware(self):
         """Interactive setup for hardware."""
+        import sounddevice as sd
+        from core.ingestion.screen import get_available_monitors
+        from core.utils.audio import get_wasapi_input_devices
         monitors = get_available_monitors()
         monitor_idx = CLI.select_monitor_menu(monitors)
         
@@ -22,6 +22,9 @@ class HardwareDirector:
 
     def validate_cache(self, cache: dict) -> bool:
         """Checks if cached hardware is still available."""
+        # Device stacks (mss, PortAudio) load here rather than at module import
+        from core.ingestion.screen import get_available_monitors
+        from core.utils.audio import get_wasapi_input_devices
         monitors = get_available_monitors()
         cached_mon = cache.get("monitor_index")
         if not any(m['index'] == cached_mon for m in monitors):
@@ -37,4 +40,5 @@ class HardwareDirector:
     def apply_settings(self, monitor_idx: int, audio_id: int):
         """Applies hardware settings without interaction."""
         if audio_id is not None:
+            import sounddevice as sd
             sd.default.device = (audio_id, None)
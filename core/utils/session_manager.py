@@ -1,18 +1,14 @@
 import sys
 import importlib
-import sounddevice as sd
 from core.config import settings
-from core.ingestion.screen import ScreenCapture, get_available_monitors
-from core.ingestion.audio_sensor import AudioSensor
-from core.ingestion.orchestrator import RecordingOrchestrator
-from core.intelligence.model import SidecarBrain
-from core.intelligence.transcription_service import TranscriptionService
 from core.intelligence.skills import SkillManager
 from core.utils.setup import ensure_config
-from core.utils.audio import get_wasapi_input_devices
 from core.utils.session_cache import SessionCache
 from core.utils.hardware_director import HardwareDirector
 from core.utils.knowledge_director import KnowledgeDirector
+from core.utils.connection_warmer import ConnectionWarmer
+from core.utils.boot_profile import boot_profile
+from core.utils.task_graph import TaskGraph
 from core.ui.cli import CLI
 
 class SessionManager:
@@ -30,6 +26,7 @@ class SessionManager:
         self.capture_tool = None
         self.recorder = None
         self.sensor = None
+        self.warmer = None
         
         self._state = {
             "monitor_index": 1,
@@ -54,7 +51,8 @@ class SessionManager:
 
         # 2. Finalize Session
         print("[i] Starting Chat Session...", end="", flush=True)
-        self.brain.init_chat()
+        with boot_profile.phase("init_chat"):
+            self.brain.init_chat()
         print(" Ready.")
         
         self._commit_session()
@@ -66,44 +64,59 @@ class SessionManager:
             "brain": self.brain,
             "capture_tool": self.capture_tool,
             "recorder": self.recorder,
-            "skill_manager": self.skill_manager
+            "skill_manager": self.skill_manager,
+            "warmer": self.warmer
         }
 
     def _attempt_fast_boot(self, cache: dict) -> bool:
-        """Validates and restores session from cache."""
-        try:
-            # Domain Validation
-            if not self.hardware.validate_cache(cache): return False
-            if not self.knowledge.validate_cache(cache.get("skill_name")): return False
+        """
+        Validates and restores session from cache.
+        Validation, engine construction, skill restore and connection warm-up run
+        as a task graph during the countdown, so READY follows the slower of the two
+        instead of their sum. An interrupt or a failed validation discards the graph.
+        """
+        state = {**self._state, **cache}
+        graph = self._core_graph(state["monitor_index"])
+        graph.add("validate", lambda: self.hardware.validate_cache(cache) and self.knowledge.validate_cache(cache.get("skill_name")))
+        graph.add("skill", lambda: self.knowledge.restore_skill(
+            state["skill_name"],
+            state["skill_placeholders"],
+            state["session_context"]
+        ))
+        graph.add("set_skill", lambda brain, skill: brain.set_skill(*skill), after=["brain", "skill"])
+        graph.start()
+
+        def invalid():
+            # Ends the countdown early: the wizard is needed anyway
+            validation = graph.future("validate")
+            return validation.done() and (validation.exception() is not None or not validation.result())
 
+        try:
             # Display Context
             print(f"{CLI.Fore.CYAN}[i] Restoring: {cache.get('skill_name')} | Mon:{cache.get('monitor_index')} | Engine:{cache.get('engine_name')}")
             
-            if CLI.wait_for_interrupt():
+            with boot_profile.phase("countdown"):
+                interrupted = CLI.wait_for_interrupt(abort=invalid)
+            if interrupted or not graph.result("validate"):
+                graph.discard()
                 return False
 
+            with boot_profile.phase("await_bootstrap"):
+                results = graph.wait()
+
             # Restore State
-            self._state.update(cache)
+            self._state = state
             self.hardware.apply_settings(self._state["monitor_index"], self._state["audio_device_id"])
-            
-            self._init_core_engines()
-            
-            # Restore Skill
-            data, prompt = self.knowledge.restore_skill(
-                self._state["skill_name"], 
-                self._state["skill_placeholders"],
-                self._state["session_context"]
-            )
-            self.brain.set_skill(data, prompt)
-            
+            self._adopt(results)
             return True
         except Exception as e:
+            graph.discard()
             print(f"[!] Recovery Failed: {e}")
             return False
 
     def _full_wizard(self):
         """Standard interactive setup."""
-        if not settings.GOOGLE_API_KEY and not settings.GROQ_API_KEY:
+        if not settings.GOOGLE_API_KEY and not settings.GROQ_API_KEY and settings.SIDECAR_ENGINE != "replay":
             if not ensure_config(): sys.exit(1)
             importlib.reload(sys.modules['core.config.settings'])
 
@@ -112,7 +125,8 @@ class SessionManager:
         self._state["monitor_index"] = mon_idx
         self._state["audio_device_id"] = audio_id
         
-        self._init_core_engines()
+        with boot_profile.phase("core_engines"):
+            self._adopt(self._core_graph(mon_idx).start().wait())
 
         # Engine
         self._state["engine_name"] = self._setup_engine_choice()
@@ -127,17 +141,59 @@ class SessionManager:
         })
         self.brain.set_skill(skill_res["data"], skill_res["prompt"])
 
-    def _init_core_engines(self):
-        """Initializes hardware and brain components."""
-        self.brain = SidecarBrain(settings.GOOGLE_API_KEY, settings.GROQ_API_KEY)
-        self.transcription_service = TranscriptionService(settings.GROQ_API_KEY)
-        self.capture_tool = ScreenCapture(self._state["monitor_index"])
-        self.sensor = AudioSensor()
-        self.recorder = RecordingOrchestrator(self.sensor, self.transcription_service)
+    def _core_graph(self, monitor_index: int) -> TaskGraph:
+        """Session components as independent tasks; only the recorder and warm-up wait on others."""
+        graph = TaskGraph("bootstrap")
+        graph.add("brain", self._build_brain)
+        graph.add("stt", self._build_transcription)
+        graph.add("capture", lambda: self._build_capture(monitor_index))
+        graph.add("recorder", self._build_recorder, after=["stt"])
+        graph.add("warmer", self._start_warmer, after=["brain", "stt"], cleanup=lambda warmer: warmer.stop())
+        return graph
+
+    def _adopt(self, results: dict):
+        """Takes over the components built by a finished graph."""
+        self.brain = results["brain"]
+        self.transcription_service = results["stt"]
+        self.capture_tool = results["capture"]
+        self.recorder = results["recorder"]
+        self.sensor = self.recorder.sensor
+        self.warmer = results["warmer"]
+
+    # Builders import lazily: the SDK, capture and audio stacks load on the worker thread
+    @staticmethod
+    def _build_brain():
+        from core.intelligence.model import SidecarBrain
+        return SidecarBrain(settings.GOOGLE_API_KEY, settings.GROQ_API_KEY)
+
+    @staticmethod
+    def _build_transcription():
+        from core.intelligence.transcription_service import TranscriptionService
+        return TranscriptionService(settings.GROQ_API_KEY)
+
+    @staticmethod
+    def _build_capture(monitor_index: int):
+        from core.ingestion.screen import ScreenCapture
+        return ScreenCapture(monitor_index)
+
+    @staticmethod
+    def _build_recorder(transcription_service):
+        from core.ingestion.audio_sensor import AudioSensor
+        from core.ingestion.orchestrator import RecordingOrchestrator
+        return RecordingOrchestrator(AudioSensor(), transcription_service)
+
+    @staticmethod
+    def _start_warmer(brain, transcription_service):
+        # The brain warms whichever engines will serve turns, so idle ones are never built
+        warmer = ConnectionWarmer({
+            "llm": brain,
+            "stt": transcription_service
+        })
+        warmer.start()
+        return warmer
 
     def _setup_engine_choice(self):
-        available = ["gemini"]
-        if settings.GROQ_API_KEY: available.append("groq")
+        available = [name for name in self.brain.engines if self.brain.engines.available(name)]
         return CLI.select_engine_menu(available) if len(available) > 1 else available[0]
 
     def _commit_session(self, overlay_geometry=None):
@@ -1,86 +1,189 @@
+import atexit
+import queue
 import sys
 import threading
+import time
 from typing import Callable
 
 class StdoutCapture:
     """
     Thread-safe stdout/stderr capture bridge for UI redirection.
-    
+
     HARDENING NOTE:
     Redirecting stdout to a GUI signal is dangerous because a logging call
-    during signal emission can trigger another stdout write, leading to 
+    during signal emission can trigger another stdout write, leading to
     infinite recursion and a stack overflow crash.
-    
+
     The implementation uses:
     1. A thread-local recursion guard ('in_write' flag).
-    2. A Recursive Lock (RLock) for multi-threaded safety.
-    3. Fast-path writing to the original stream to ensure console logs 
-       are never lost even if the GUI bridge fails.
+    2. A background sink thread fed by a lock-free queue: 'write' only enqueues,
+       so streaming tokens and log lines never contend on a shared lock.
+    3. Batched delivery: the sink flushes the console and the UI callback on a
+       newline, after 'interval_ms' or once 'max_chars' are pending.
+    4. A synchronous escape hatch ('set_synchronous' / 'write_sync') for crash
+       output; uncaught exceptions switch to it before the traceback is printed.
     """
-    
-    def __init__(self, callback: Callable[[str], None]):
+    _FRAME_END = object()
+
+    def __init__(self, callback: Callable[[str], None], interval_ms: int = 16, max_chars: int = 4096):
         self.callback = callback
+        self.interval = interval_ms / 1000.0
+        self.max_chars = max_chars
         self._original_stdout = sys.stdout
         self._original_stderr = sys.stderr
-        self._lock = threading.RLock()
         self._local = threading.local() # Per-thread recursion state
+        self._queue = queue.SimpleQueue() # (stream, text) | drain marker (Event) | None to stop
+        self._sink = None
+        self._previous_excepthook = None
         self._active = False
-        
+        self.synchronous = False
+        self.batches = 0
+
     def start(self):
         """Hijack sys.stdout and sys.stderr with our hardened proxy."""
-        if self._active: 
+        if self._active:
             return
-        sys.stdout = self._CaptureStream(self.callback, self._original_stdout, self._lock, self._local)
-        sys.stderr = self._CaptureStream(self.callback, self._original_stderr, self._lock, self._local)
+        self.synchronous = False
+        self._sink = threading.Thread(target=self._run_sink, name="stdout-sink", daemon=True)
+        self._sink.start()
+        sys.stdout = self._CaptureStream(self, self._original_stdout)
+        sys.stderr = self._CaptureStream(self, self._original_stderr)
+        self._previous_excepthook = sys.excepthook
+        sys.excepthook = self._excepthook
+        atexit.register(self.stop)
         self._active = True
-        
+
     def stop(self):
-        """Restore original system streams."""
-        if not self._active: 
+        """Deliver pending output, then restore original system streams."""
+        if not self._active:
             return
+        self._active = False
+        self.drain()
+        self._queue.put(None)
+        self._sink.join(timeout=1)
         sys.stdout = self._original_stdout
         sys.stderr = self._original_stderr
-        self._active = False
-        
+        if sys.excepthook == self._excepthook:
+            sys.excepthook = self._previous_excepthook
+        atexit.unregister(self.stop)
+
+    def drain(self, timeout: float = 1.0) -> bool:
+        """Blocks until everything written so far has been delivered."""
+        if not self._sink or not self._sink.is_alive() or self._sink is threading.current_thread():
+            return True
+        marker = threading.Event()
+        self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def set_synchronous(self, enabled: bool = True):
+        """Escape hatch: deliver pending output, then write through on the caller's thread."""
+        if enabled:
+            self.drain()
+        self.synchronous = enabled
+
+    def write_sync(self, text: str, stream=None):
+        """Writes straight to the original stream (stderr by default) after pending output."""
+        self.drain()
+        stream = stream or self._original_stderr
+        try:
+            stream.write(text)
+            stream.flush()
+        except Exception:
+            pass
+
+    def _excepthook(self, *exc_info):
+        # A crash report must not sit in a queue that may never be flushed
+        self.set_synchronous(True)
+        (self._previous_excepthook or sys.__excepthook__)(*exc_info)
+
+    def _enqueue(self, original, text: str):
+        self._queue.put((original, text))
+
+    def _deliver(self, original, text: str):
+        """Console first (essential for stability), then the UI (with recursion guard)."""
+        try:
+            original.write(text)
+            original.flush()
+        except Exception:
+            pass
+        self._emit(text)
+
+    def _emit(self, text: str):
+        # A write made while emitting (e.g. a log call in a slot) only reaches the console
+        if getattr(self._local, 'in_write', False):
+            return
+        self._local.in_write = True
+        try:
+            self.callback(text)
+        except Exception:
+            pass # Error in UI callback should not break the logger
+        finally:
+            self._local.in_write = False
+
+    def _run_sink(self):
+        pending = [] # (original stream, text) in write order
+        size = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = self._FRAME_END
+
+            if isinstance(item, tuple):
+                pending.append(item)
+                size += len(item[1])
+                if deadline is None:
+                    deadline = time.monotonic() + self.interval
+                # Partial lines wait for more output until the frame ends
+                if "\n" not in item[1] and size < self.max_chars and time.monotonic() < deadline:
+                    continue
+
+            if pending:
+                self._flush(pending)
+                pending, size, deadline = [], 0, None
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def _flush(self, pending: list):
+        self.batches += 1
+        # Console writes are merged per stream run; the UI gets one emission in write order
+        runs = []
+        for original, text in pending:
+            if runs and runs[-1][0] is original:
+                runs[-1][1].append(text)
+            else:
+                runs.append((original, [text]))
+        for original, texts in runs:
+            try:
+                original.write("".join(texts))
+                original.flush()
+            except Exception:
+                pass
+        self._emit("".join(text for _, text in pending))
+
     class _CaptureStream:
-        """Lightweight proxy that forwards output to the UI and original stream."""
-        def __init__(self, callback, original, lock, local_storage):
-            self.callback = callback
+        """Lightweight proxy that hands output to the sink (or writes through when synchronous)."""
+        def __init__(self, capture, original):
+            self.capture = capture
             self.original = original
-            self.lock = lock
-            self.local = local_storage
-            
+
         def write(self, text: str) -> int:
-            if not text: 
+            if not text:
                 return 0
-            
-            # Phase 1: Direct path to original console (Essential for stability)
-            try:
-                self.original.write(text)
-                self.original.flush()
-            except Exception:
-                pass
-                
-            # Phase 2: Redirect to UI (with Recursion Guard)
-            # We only emit the signal if we aren't already processing a write from this thread.
-            if not getattr(self.local, 'in_write', False):
-                self.local.in_write = True
-                try:
-                    with self.lock:
-                        self.callback(text)
-                except Exception:
-                    pass # Error in UI callback should not break the logger
-                finally:
-                    self.local.in_write = False
-            
+            if self.capture.synchronous or getattr(self.capture._local, 'in_write', False):
+                self.capture._deliver(self.original, text)
+            else:
+                self.capture._enqueue(self.original, text)
             return len(text)
-            
+
         def flush(self):
-            try:
-                self.original.flush()
-            except Exception:
-                pass
-                
+            # Delivery is owned by the sink; flushing here would reintroduce per-write syscalls
+            pass
+
         def __getattr__(self, name):
             """Proxy all other stream attributes (encoding, buffer, etc.) to original."""
             return getattr(self.original, name)
@@ -0,0 +1,113 @@
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+from core.utils.boot_profile import boot_profile
+from core.utils.logger import logger
+
+class TaskGraph:
+    """
+    Runs named tasks on a thread pool as soon as their dependencies finish.
+
+    1. 'add(name, fn, after)' calls 'fn' with the results of 'after', in order.
+       Dependencies must be added first, so the graph is acyclic by construction.
+    2. A failed or cancelled task fails every task that depends on it.
+    3. 'result(name)' waits for one task; 'wait()' for all of them.
+    4. 'discard()' cancels tasks that have not started and hands every result
+       that is (or later becomes) available to its task's 'cleanup'.
+    """
+    def __init__(self, name: str = "task-graph", max_workers: int = 8):
+        self.name = name
+        self.max_workers = max_workers
+        self.discarded = False
+        self._tasks: Dict[str, tuple] = {} # name -> (fn, after, cleanup)
+        self._futures: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def add(self, name: str, fn: Callable, after: Iterable[str] = (), cleanup: Callable = None) -> "TaskGraph":
+        after = tuple(after)
+        for dep in after:
+            if dep not in self._tasks:
+                raise ValueError(f"Task '{name}' depends on unknown task '{dep}'")
+        self._tasks[name] = (fn, after, cleanup)
+        self._futures[name] = Future()
+        return self
+
+    def start(self) -> "TaskGraph":
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+        for name in self._tasks:
+            self._when_ready(name)
+        return self
+
+    def future(self, name: str) -> Future:
+        return self._futures[name]
+
+    def result(self, name: str, timeout: float = None):
+        return self._futures[name].result(timeout)
+
+    def wait(self, timeout: float = None) -> dict:
+        """Results of every task; raises the first failure in insertion order."""
+        results = {name: future.result(timeout) for name, future in self._futures.items()}
+        self._executor.shutdown(wait=False)
+        return results
+
+    def discard(self):
+        """Abandons the graph; running tasks finish in the background and are cleaned up."""
+        if self.discarded:
+            return
+        self.discarded = True
+        for name, future in self._futures.items():
+            if not future.cancel():
+                future.add_done_callback(lambda f, name=name: self._cleanup(name, f))
+        if self._executor:
+            self._executor.shutdown(wait=False)
+
+    def _when_ready(self, name: str):
+        after = self._tasks[name][1]
+        if not after:
+            self._submit(name)
+            return
+        remaining = [len(after)]
+        lock = threading.Lock()
+        def on_done(_):
+            with lock:
+                remaining[0] -= 1
+                ready = remaining[0] == 0
+            if ready:
+                self._submit(name)
+        for dep in after:
+            self._futures[dep].add_done_callback(on_done)
+
+    def _submit(self, name: str):
+        if self.discarded:
+            self._futures[name].cancel()
+            return
+        try:
+            self._executor.submit(self._run, name)
+        except RuntimeError:
+            # Discarded between the check and the submit; the executor is already shut down
+            self._futures[name].cancel()
+
+    def _run(self, name: str):
+        fn, after, _ = self._tasks[name]
+        future = self._futures[name]
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            args = [self._futures[dep].result() for dep in after]
+            with boot_profile.phase(f"task:{name}"):
+                value = fn(*args)
+        except CancelledError:
+            future.set_exception(CancelledError(f"Dependency of '{name}' was cancelled"))
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(value)
+
+    def _cleanup(self, name: str, future: Future):
+        cleanup = self._tasks[name][2]
+        if not cleanup or future.cancelled() or future.exception() is not None:
+            return
+        try:
+            cleanup(future.result())
+        except Exception as e:
+            logger.debug(f"Cleanup of discarded task '{name}' failed: {e}")
@@ -0,0 +1,30 @@
+import threading
+import time
+from collections import Counter
+
+class WakeupCounter:
+    """
+    Counts periodic wakeups per source (timers, polls, message loops).
+    Every wakeup keeps the CPU out of its idle states, so the rate is what
+    decides battery cost while the app sits unused.
+    """
+    def __init__(self):
+        self.started = time.monotonic()
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def tick(self, source: str):
+        with self._lock:
+            self.counts[source] += 1
+
+    def rates(self) -> dict:
+        """Wakeups per second by source since start."""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        with self._lock:
+            return {source: count / elapsed for source, count in self.counts.items()}
+
+    def report(self) -> str:
+        return ", ".join(f"{source}: {self.counts[source]} ({rate:.2f}/s)" for source, rate in sorted(self.rates().items())) or "none"
+
+# Global wakeup counter
+wakeups = WakeupCounter()
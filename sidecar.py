@@ -1,15 +1,23 @@
+import os
 import sys
+from core.utils.boot_profile import boot_profile
+# Profile imports and boot phases in debug mode; must run before any heavy import
+if "--debug" in sys.argv or os.getenv("SIDECAR_DEBUG", "false").lower() == "true":
+    boot_profile.start()
+
 import signal
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QTimer, QObject, pyqtSignal
+from PyQt6.QtCore import Qt, QObject, pyqtSignal
 from core.config import settings
 from core.utils.session_manager import SessionManager
 from core.ui.worker import SidecarWorker
 from core.ui.hotkey_thread import HotkeyThread
 from core.ui.hotkey_orchestrator import HotkeyOrchestrator
-from core.ui.terminal_ghost import TerminalGhostWindow
 from core.utils.stdout_capture import StdoutCapture
 from core.utils.logger import logger
+from core.intelligence.telemetry import telemetry
+from core.ui.idle import SignalWakeup
+from core.utils.wakeups import wakeups
 from core.ui.cli import CLI
 
 class SidecarApp(QObject):
@@ -32,11 +40,13 @@ class SidecarApp(QObject):
         self.session = SessionManager()
         
         # 1. Bootstrap components (Engines, Directors, etc.)
-        self.components = self.session.bootstrap()
+        with boot_profile.phase("bootstrap"):
+            self.components = self.session.bootstrap()
         
         # 2. UI Layer (Optional Ghost Terminal)
         self.terminal = None
         if self.ghost_enabled:
+            from core.ui.terminal_ghost import TerminalGhostWindow
             self.terminal = TerminalGhostWindow(
                 opacity=settings.GHOST_OPACITY,
                 font_size=settings.GHOST_FONT_SIZE,
@@ -53,7 +63,7 @@ class SidecarApp(QObject):
         # Even if the ghost terminal is off, we still start capture 
         # to ensure the signal is managed correctly, though it will
         # just print to the standard console via the capture's fast-path.
-        self.stdout_capture = StdoutCapture(self.signal_append_text.emit)
+        self.stdout_capture = StdoutCapture(self.signal_append_text.emit, interval_ms=settings.CHUNK_FRAME_MS)
         self.stdout_capture.start()
         
         # 4. Processing Layer (Worker)
@@ -66,6 +76,8 @@ class SidecarApp(QObject):
         self.orchestrator = HotkeyOrchestrator(self.worker, self.terminal)
         self.hk_thread = HotkeyThread(self.orchestrator.get_mappings())
         self.hk_thread.signal_hotkey.connect(self.orchestrator.dispatch)
+        # Cancellation must not wait for the UI thread, so it is handled on the hotkey thread itself
+        self.hk_thread.signal_hotkey.connect(self.orchestrator.dispatch_immediate, Qt.ConnectionType.DirectConnection)
         self.hk_thread.start()
 
         # 6. Lifecycle Monitoring
@@ -76,10 +88,13 @@ class SidecarApp(QObject):
         self._inline_active = False
 
         # 7. OS Interrupts (Ensures Ctrl+C works in the console)
+        # The signal wakes the Qt loop through a socket; no idle timer is needed
         signal.signal(signal.SIGINT, lambda s, f: self.qt_app.quit())
-        self.interrupt_timer = QTimer()
-        self.interrupt_timer.timeout.connect(lambda: None)
-        self.interrupt_timer.start(500)
+        self.signal_wakeup = SignalWakeup(self)
+
+        if boot_profile.enabled:
+            boot_profile.finish()
+            logger.debug(f"Boot profile:\n{boot_profile.report()}")
 
     def _on_terminal_chunk(self, chunk, vector):
         """Visualizer for AI streaming chunks in the CLI console."""
@@ -96,7 +111,7 @@ class SidecarApp(QObject):
             self._response_active = False
             self._inline_active = False
             CLI.print_ready()
-        elif any(k in status for k in ["Capturing", "Analyzing", "RECORDING", "Intent"]):
+        elif any(k in status for k in ["Capturing", "Analyzing", "RECORDING", "Intent", "cancelled"]):
             if self._inline_active:
                 print()
                 self._inline_active = False
@@ -112,14 +127,22 @@ class SidecarApp(QObject):
         """Starts the main event loop."""
         exit_code = self.qt_app.exec()
         logger.info("Shutting down...")
+        if telemetry.samples:
+            logger.info(f"Stream telemetry:\n{telemetry.report()}")
+        logger.debug(f"Idle wakeups: {wakeups.report()}")
+        self.signal_wakeup.close()
         self.stdout_capture.stop()
+        if self.components.get("warmer"):
+            self.components["warmer"].stop()
         self.hk_thread.stop()
-        self.worker.terminate()
+        self.worker.stop()
+        self.worker.wait(2000)
+        if self.terminal:
+            self.terminal.close_history()
         sys.exit(exit_code)
 
 if __name__ == "__main__":
     if "--debug" in sys.argv:
-        import os
         os.environ["SIDECAR_DEBUG"] = "true"
         logger.update_level()
         
@@ -0,0 +1,174 @@
+"""
+Wire-compatible local stand-ins for the provider APIs used by the engines.
+
+A single ThreadingHTTPServer speaks enough of each protocol for the real SDKs:
+- Groq chat completions (OpenAI-style SSE) and model listing
+- Groq audio transcriptions (multipart upload)
+- Gemini streamGenerateContent (SSE) and model metadata
+
+Behaviour is configurable per server: time to first token, tokens/sec,
+HTTP error injection for the first N requests, and mid-stream stalls.
+Point the engines at 'server.base_url' via GROQ_BASE_URL / GEMINI_BASE_URL.
+"""
+import json
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+@dataclass
+class StubBehaviour:
+    tokens: List[str] = field(default_factory=lambda: ["Hello", " from", " the", " stub", "."])
+    ttft: float = 0.0               # Seconds before the first token
+    tokens_per_sec: float = 0.0     # 0 = send tokens back to back
+    fail_status: Optional[int] = None
+    fail_times: int = 0             # Number of leading requests answered with fail_status
+    stall_after: Optional[int] = None   # Stop sending after this many tokens...
+    stall_seconds: float = 0.0          # ...for this long (interrupted by stop())
+    transcript: str = "Hello world transcription."
+
+class StubServer:
+    def __init__(self, behaviour: StubBehaviour = None):
+        self.behaviour = behaviour or StubBehaviour()
+        self.requests = []          # (method, path) in arrival order
+        self.connections = set()    # Client sockets seen; one per pooled connection
+        self.uploads = []           # Raw multipart bodies received by the STT endpoint
+        self._failures_left = self.behaviour.fail_times
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            if self._failures_left > 0 and self.behaviour.fail_status:
+                self._failures_left -= 1
+                return True
+            return False
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _track(self):
+                with stub._lock:
+                    stub.requests.append((self.command, self.path))
+                    stub.connections.add(self.client_address)
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length) if length else b""
+
+            def _send_json(self, status: int, payload: dict, headers: dict = None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_failure(self):
+                status = stub.behaviour.fail_status
+                self._send_json(status, {"error": {"code": status, "message": f"Injected HTTP {status}", "status": "UNAVAILABLE"}},
+                                headers={"retry-after-ms": "1"})
+
+            def _write_chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def _stream_sse(self, events):
+                """Streams SSE events with the configured pacing (chunked transfer keeps the connection poolable)."""
+                behaviour = stub.behaviour
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    if behaviour.ttft:
+                        stub._stopping.wait(behaviour.ttft)
+                    for i, event in enumerate(events):
+                        if behaviour.stall_after is not None and i == behaviour.stall_after:
+                            stub._stopping.wait(behaviour.stall_seconds)
+                        elif i and behaviour.tokens_per_sec:
+                            stub._stopping.wait(1.0 / behaviour.tokens_per_sec)
+                        self._write_chunk(f"data: {event}\n\n".encode("utf-8"))
+                    self._write_chunk(b"")
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client hung up mid-stream (e.g. a cancelled turn)
+                    self.close_connection = True
+
+            def do_GET(self):
+                self._track()
+                if self.path.startswith("/openai/v1/models"):
+                    self._send_json(200, {"object": "list", "data": []})
+                elif self.path.startswith("/v1beta/models/"):
+                    name = self.path.split("?")[0][len("/v1beta/"):]
+                    self._send_json(200, {"name": name, "displayName": "Stub"})
+                else:
+                    self._send_json(404, {"error": {"message": "not found"}})
+
+            def do_POST(self):
+                body = self._track()
+                if stub._should_fail():
+                    return self._send_failure()
+
+                tokens = stub.behaviour.tokens
+                if self.path.startswith("/openai/v1/chat/completions"):
+                    model = json.loads(body or b"{}").get("model", "stub")
+                    events = [json.dumps({
+                        "id": "stub", "object": "chat.completion.chunk", "created": 0, "model": model,
+                        "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]
+                    }) for token in tokens]
+                    events.append(json.dumps({
+                        "id": "stub", "object": "chat.completion.chunk", "created": 0, "model": model,
+                        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                        "x_groq": {"id": "stub", "usage": {
+                            "prompt_tokens": 10, "completion_tokens": len(tokens), "total_tokens": 10 + len(tokens),
+                            "prompt_tokens_details": {"cached_tokens": 0}
+                        }}
+                    }))
+                    events.append("[DONE]")
+                    self._stream_sse(events)
+                elif self.path.startswith("/openai/v1/audio/transcriptions"):
+                    stub.uploads.append(body)
+                    self._send_json(200, {"text": stub.behaviour.transcript})
+                elif ":streamGenerateContent" in self.path:
+                    events = [json.dumps({
+                        "candidates": [{"content": {"role": "model", "parts": [{"text": token}]}}]
+                    }) for token in tokens]
+                    events.append(json.dumps({
+                        "candidates": [{"content": {"role": "model", "parts": [{"text": ""}]}, "finishReason": "STOP"}],
+                        "usageMetadata": {"promptTokenCount": 10, "candidatesTokenCount": len(tokens)}
+                    }))
+                    self._stream_sse(events)
+                else:
+                    self._send_json(404, {"error": {"message": "not found"}})
+
+        return Handler
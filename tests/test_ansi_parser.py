@@ -0,0 +1,48 @@
+from core.ui.ansi_parser import ANSIParser
+
+def colors(chunks):
+    return [(text, fmt.foreground().color().name(), fmt.fontWeight()) for text, fmt in chunks]
+
+def test_parse_splits_spans_by_sgr():
+    chunks = ANSIParser.parse("plain \x1b[31mred\x1b[1m bold\x1b[0m done")
+    assert colors(chunks) == [
+        ("plain ", "#ffffff", 400),
+        ("red", "#ff5555", 400),
+        (" bold", "#ff5555", 700),
+        (" done", "#ffffff", 400),
+    ]
+
+def test_colour_state_carries_across_feeds():
+    """Verify that a colour set in one write still applies to the next (streamed tokens)."""
+    parser = ANSIParser()
+    parser.feed("\x1b[36m")
+    assert colors(parser.feed("token")) == [("token", "#55ffff", 400)]
+    parser.feed("\x1b[0m")
+    assert colors(parser.feed("after")) == [("after", "#ffffff", 400)]
+
+def test_escape_split_across_writes_is_buffered():
+    parser = ANSIParser()
+    assert colors(parser.feed("abc\x1b[3")) == [("abc", "#ffffff", 400)]
+    assert parser.pending == "\x1b[3"
+    assert colors(parser.feed("2mgreen")) == [("green", "#55ff55", 400)]
+    assert parser.feed("\x1b") == []
+    assert colors(parser.feed("[0mx")) == [("x", "#ffffff", 400)]
+
+def test_formats_are_interned():
+    """Verify that spans with the same colour and weight share one format object."""
+    parser = ANSIParser()
+    first = parser.feed("\x1b[32ma\x1b[0mb")
+    second = parser.feed("\x1b[32mc\x1b[0md")
+    assert first[0][1] is second[0][1]
+    assert first[1][1] is second[1][1]
+    assert ANSIParser().format is parser.format
+
+def test_non_sgr_sequences_are_dropped():
+    assert [text for text, _ in ANSIParser.parse("a\x1b[2Kb\x1b[mc")] == ["a", "b", "c"]
+    assert ANSIParser.strip_ansi("\x1b[1;33mwarn\x1b[0m\x1b[K") == "warn"
+
+def test_flush_returns_dangling_escape_as_text():
+    parser = ANSIParser()
+    parser.feed("end\x1b")
+    assert [text for text, _ in parser.flush()] == ["\x1b"]
+    assert parser.pending == ""
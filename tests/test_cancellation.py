@@ -0,0 +1,83 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from core.intelligence.cancellation import CancellationToken, CANCELLED_MARKER, mark_cancelled
+from core.intelligence.engines.groq_engine import GroqEngine
+from core.intelligence.engines.gemini import GeminiEngine
+from core.intelligence.events import SidecarEventType
+
+def groq_chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+def gemini_chunk(text):
+    part = SimpleNamespace(thought=False, text=text)
+    return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))], usage_metadata=None)
+
+class FakeStream:
+    """Iterable stream that cancels its token after the first chunk."""
+    def __init__(self, chunks, token):
+        self.chunks = chunks
+        self.token = token
+        self.close = MagicMock()
+
+    def __iter__(self):
+        for i, chunk in enumerate(self.chunks):
+            if i == 1:
+                self.token.cancel()
+            yield chunk
+
+def test_token_runs_closers_once():
+    token = CancellationToken()
+    closer = MagicMock()
+    token.on_cancel(closer)
+    
+    token.cancel()
+    token.cancel()
+    
+    assert token.cancelled
+    closer.assert_called_once()
+
+def test_token_runs_late_closer_immediately():
+    token = CancellationToken()
+    token.cancel()
+    closer = MagicMock()
+    token.on_cancel(closer)
+    closer.assert_called_once()
+
+def test_mark_cancelled():
+    assert mark_cancelled("") == CANCELLED_MARKER
+    assert mark_cancelled("Partial answer ") == f"Partial answer\n\n{CANCELLED_MARKER}"
+
+def test_groq_cancel_closes_stream_and_records_partial():
+    """Verify that a cancelled Groq stream closes the HTTP stream and keeps history alternating."""
+    engine = GroqEngine(api_key="fake-key")
+    engine.init_session("System Prompt")
+    engine.add_user_message("[CONVERSATION TURN]: Explain this.")
+    token = CancellationToken()
+    stream = FakeStream([groq_chunk("Step one."), groq_chunk(" Step two.")], token)
+    
+    with patch.object(engine.client.chat.completions, 'create', return_value=stream):
+        events = list(engine._execute_chat_completion(cancel_token=token))
+    
+    stream.close.assert_called_once()
+    chunks = [e.content for e in events if e.event_type == SidecarEventType.TEXT_CHUNK]
+    assert chunks == ["Step one."]
+    assert events[-1].event_type == SidecarEventType.FINISH
+    assert events[-1].metadata["cancelled"]
+    assert engine.messages[-1] == {"role": "assistant", "content": mark_cancelled("Step one.")}
+
+def test_gemini_cancel_records_partial_turn():
+    """Verify that a cancelled Gemini stream records the user turn and the partial response."""
+    engine = GeminiEngine(api_key="fake-key")
+    engine.init_session("System Prompt")
+    token = CancellationToken()
+    stream = FakeStream([gemini_chunk("Looks like"), gemini_chunk(" a race.")], token)
+    
+    with patch.object(engine.chat_session, 'send_message_stream', return_value=stream):
+        events = list(engine.stream_analysis(None, "What is wrong?", cancel_token=token))
+    
+    stream.close.assert_called_once()
+    assert events[-1].metadata["cancelled"]
+    history = engine.chat_session.get_history(curated=True)
+    assert [c.role for c in history] == ["user", "model"]
+    assert history[1].parts[0].text == mark_cancelled("Looks like")
@@ -0,0 +1,70 @@
+import time
+from unittest.mock import MagicMock, patch
+from core.ui.chunk_coalescer import ChunkCoalescer
+
+def make_bridge(**kwargs):
+    frames = []
+    bridge = ChunkCoalescer(lambda text, vector: frames.append((text, vector)), **kwargs)
+    return bridge, frames
+
+def test_first_token_is_flushed_immediately():
+    bridge, frames = make_bridge(interval_ms=1000, max_chars=100)
+    bridge.push("Hel", "a")
+    assert frames == [("Hel", "a")]
+
+def test_chunks_are_merged_into_frames():
+    """Verify that token-sized chunks cross to the UI as a handful of frames, in order."""
+    bridge, frames = make_bridge(interval_ms=1000, max_chars=10)
+    for token in ["A", "bc", "de", "fg", "hi", "jk", "l"]:
+        bridge.push(token, "a")
+    bridge.flush()
+    
+    assert frames == [("A", "a"), ("bcdefghijk", "a"), ("l", "a")]
+    assert bridge.chunks == 7
+    assert bridge.frames == 3
+
+def test_frame_interval_triggers_flush():
+    bridge, frames = make_bridge(interval_ms=16, max_chars=1000)
+    # The clock is fake here; keep the background flusher from reading the real one
+    bridge._flusher = MagicMock()
+    with patch("core.ui.chunk_coalescer.time.monotonic", return_value=100.0):
+        bridge.push("A", "a")
+        bridge.push("b", "a")
+    with patch("core.ui.chunk_coalescer.time.monotonic", return_value=100.02):
+        bridge.push("c", "a")
+    
+    assert frames == [("A", "a"), ("bc", "a")]
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.002)
+    return False
+
+def test_stalled_tails_are_flushed_by_one_flusher_thread():
+    bridge, frames = make_bridge(interval_ms=10, max_chars=1000)
+    bridge.push("A", "a")
+    bridge.push("b", "a")
+    assert wait_for(lambda: len(frames) == 2)
+    flusher = bridge._flusher
+    # Pushed right after a flush, so this tail also waits for the flusher
+    bridge.push("c", "a")
+    assert wait_for(lambda: len(frames) == 3)
+    
+    assert frames == [("A", "a"), ("b", "a"), ("c", "a")]
+    assert bridge._flusher is flusher
+    bridge.close()
+    flusher.join(timeout=1)
+    assert not flusher.is_alive()
+
+def test_vector_change_and_new_turn_flush():
+    bridge, frames = make_bridge(interval_ms=1000, max_chars=1000)
+    bridge.push("A", "a")
+    bridge.push("b", "a")
+    bridge.push("C", "b")
+    bridge.begin_turn()
+    bridge.push("D", "b")
+    
+    assert frames == [("A", "a"), ("b", "a"), ("C", "b"), ("D", "b")]
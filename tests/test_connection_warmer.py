@@ -0,0 +1,58 @@
+import time
+import pytest
+from unittest.mock import MagicMock
+from core.utils.connection_warmer import ConnectionWarmer
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_warmer_warms_on_start_and_on_demand():
+    engine = MagicMock()
+    warmer = ConnectionWarmer({"groq": engine, "gemini": None}, idle_interval=0)
+    warmer.start()
+    assert wait_for(lambda: engine.warm_up.call_count == 1)
+    
+    warmer.warm_now()
+    assert wait_for(lambda: engine.warm_up.call_count == 2)
+    warmer.stop()
+    assert list(warmer.targets) == ["groq"]
+
+def test_warmer_rewarms_after_idle_interval():
+    engine = MagicMock()
+    warmer = ConnectionWarmer({"stt": engine}, idle_interval=0.05)
+    warmer.start()
+    assert wait_for(lambda: engine.warm_up.call_count >= 3)
+    warmer.stop()
+
+def test_failing_target_does_not_stop_others():
+    broken, healthy = MagicMock(), MagicMock()
+    broken.warm_up.side_effect = ConnectionError("offline")
+    warmer = ConnectionWarmer({"broken": broken, "healthy": healthy}, idle_interval=0)
+    warmer.start()
+    assert wait_for(lambda: healthy.warm_up.call_count == 1)
+    warmer.stop()
+
+def test_warmer_sleeps_only_for_the_rest_of_the_idle_interval():
+    """Verify that traffic during a wait moves the next ping to interval-after-traffic, not a full interval later."""
+    engine = MagicMock()
+    warmer = ConnectionWarmer({"stt": engine}, idle_interval=60)
+    timeouts = []
+    def wait(timeout=None):
+        timeouts.append(timeout)
+        if len(timeouts) == 1:
+            # Traffic 45s ago; the wait runs out without a warm-up being due
+            warmer._last_activity = time.monotonic() - 45
+        else:
+            warmer._stop.set()
+        return False
+    warmer._wake = MagicMock(wait=wait)
+    warmer._loop()
+    
+    assert timeouts[0] == pytest.approx(60, abs=1)
+    assert timeouts[1] == pytest.approx(15, abs=1)
+    assert engine.warm_up.call_count == 1
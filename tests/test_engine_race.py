@@ -0,0 +1,112 @@
+import time
+import pytest
+from core.intelligence.race import EngineRacer
+from core.intelligence.events import SidecarEvent, SidecarEventType
+from core.intelligence.cancellation import CancellationToken
+
+class FakeEngine:
+    """Minimal contender that streams canned chunks after a fixed delay."""
+    def __init__(self, delay, chunks):
+        self.delay = delay
+        self.chunks = chunks
+        self.exchanges = []
+        self.seen_token = None
+
+    def stream_analysis(self, png_bytes, additional_text="", cancel_token=None):
+        self.seen_token = cancel_token
+        deadline = time.time() + self.delay
+        while time.time() < deadline:
+            if cancel_token.cancelled:
+                yield SidecarEvent(SidecarEventType.FINISH, metadata={"cancelled": True})
+                return
+            time.sleep(0.005)
+        for chunk in self.chunks:
+            yield SidecarEvent(SidecarEventType.TEXT_CHUNK, content=chunk)
+        yield SidecarEvent(SidecarEventType.FINISH)
+
+    def record_exchange(self, user_text, assistant_text):
+        self.exchanges.append((user_text, assistant_text))
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_fastest_engine_wins_and_loser_gets_winner_turn():
+    fast = FakeEngine(0.0, ["Fast ", "answer."])
+    slow = FakeEngine(1.0, ["Slow answer."])
+    racer = EngineRacer()
+    
+    events = list(racer.race({"groq": fast, "gemini": slow}, lambda e, t: e.stream_analysis(None, "q", t), "[CONVERSATION TURN]: q"))
+    
+    text = "".join(e.content for e in events if e.event_type == SidecarEventType.TEXT_CHUNK)
+    assert text == "Fast answer."
+    assert slow.seen_token.cancelled and not slow.seen_token.keep_partial
+    assert wait_for(lambda: slow.exchanges == [("[CONVERSATION TURN]: q", "Fast answer.")])
+    assert fast.exchanges == []
+    assert racer.stats["groq"]["wins"] == 1
+    assert racer.stats["gemini"]["wins"] == 0
+
+def test_user_cancel_before_first_token_rolls_back_all_lanes():
+    a = FakeEngine(1.0, ["a"])
+    b = FakeEngine(1.0, ["b"])
+    token = CancellationToken()
+    racer = EngineRacer()
+    
+    stream = racer.race({"a": a, "b": b}, lambda e, t: e.stream_analysis(None, "q", t), "q", token)
+    next(stream) # Racing status
+    token.cancel()
+    events = list(stream)
+    
+    assert events[-1].metadata.get("cancelled")
+    assert not a.seen_token.keep_partial and not b.seen_token.keep_partial
+    time.sleep(0.05)
+    assert a.exchanges == [] and b.exchanges == []
+
+class ThinkingEngine(FakeEngine):
+    """Streams a thought chunk at once, then its visible answer after 'delay'."""
+    def stream_analysis(self, png_bytes, additional_text="", cancel_token=None):
+        yield SidecarEvent(SidecarEventType.TEXT_CHUNK, content="Let me think...", metadata={"is_thought": True})
+        yield from super().stream_analysis(png_bytes, additional_text, cancel_token)
+
+def test_thought_chunks_do_not_win_the_race():
+    thinker = ThinkingEngine(0.3, ["Late answer."])
+    direct = FakeEngine(0.1, ["Direct answer."])
+    racer = EngineRacer()
+    
+    events = list(racer.race({"gemini": thinker, "groq": direct}, lambda e, t: e.stream_analysis(None, "q", t), "q"))
+    
+    text = "".join(e.content for e in events if e.event_type == SidecarEventType.TEXT_CHUNK)
+    assert text == "Direct answer."
+    assert racer.stats["groq"]["wins"] == 1
+
+def test_winner_thoughts_are_replayed_before_its_answer():
+    thinker = ThinkingEngine(0.0, ["Answer."])
+    slow = FakeEngine(1.0, ["Slow."])
+    
+    events = list(EngineRacer().race({"gemini": thinker, "groq": slow}, lambda e, t: e.stream_analysis(None, "q", t), "q"))
+    
+    chunks = [(e.content, bool(e.metadata.get("is_thought"))) for e in events if e.event_type == SidecarEventType.TEXT_CHUNK]
+    assert chunks == [("Let me think...", True), ("Answer.", False)]
+
+class SlowUnwindEngine(FakeEngine):
+    """A loser whose stream only notices the cancel after a while (e.g. waiting on the network)."""
+    def stream_analysis(self, png_bytes, additional_text="", cancel_token=None):
+        while not cancel_token.cancelled:
+            time.sleep(0.005)
+        time.sleep(0.2)
+        yield SidecarEvent(SidecarEventType.FINISH, metadata={"cancelled": True})
+
+def test_settle_waits_for_loser_commits_before_the_next_turn():
+    fast = FakeEngine(0.0, ["Fast."])
+    loser = SlowUnwindEngine(0.0, [])
+    racer = EngineRacer()
+    
+    list(racer.race({"groq": fast, "gemini": loser}, lambda e, t: e.stream_analysis(None, "q", t), "q"))
+    assert loser.exchanges == []
+    
+    racer.settle()
+    assert loser.exchanges == [("q", "Fast.")]
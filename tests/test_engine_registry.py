@@ -0,0 +1,78 @@
+import builtins
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+from core.intelligence.engines.registry import EngineRegistry
+from core.intelligence.model import SidecarBrain
+from core.utils.boot_profile import BootProfile
+
+def test_engines_are_built_once_on_first_access():
+    built = []
+    def factory():
+        time.sleep(0.05)
+        built.append(1)
+        return MagicMock()
+    registry = EngineRegistry()
+    registry.register("groq", factory)
+    registry.register("gemini", None)
+
+    assert registry.available("groq") and not registry.available("gemini")
+    assert registry.peek("groq") is None and built == []
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry["groq"])) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(built) == 1
+    assert all(engine is results[0] for engine in results)
+    assert registry["gemini"] is None
+    assert registry.loaded() == [results[0]]
+
+def test_brain_defers_inactive_engine_until_switch():
+    """Verify that only the active engine is constructed, and a late one starts under the current skill."""
+    groq, gemini = MagicMock(), MagicMock()
+    gemini.export_history.return_value = []
+    factories = {"groq": lambda: groq, "gemini": lambda: gemini}
+    with patch("core.intelligence.model.provider_factory", side_effect=lambda name, key: factories[name]), \
+         patch("core.config.settings.SIDECAR_ENGINE", "gemini"), \
+         patch("core.config.settings.SIDECAR_RACE_MODE", False):
+        brain = SidecarBrain("fake-key", "fake-key")
+    brain.set_skill({"identity": "", "instructions": "", "context": ""}, "System Prompt")
+
+    assert brain.engines.peek("groq") is None
+    gemini.init_session.assert_called_once_with("System Prompt")
+
+    brain.warm_up()
+    gemini.warm_up.assert_called_once()
+    groq.warm_up.assert_not_called()
+
+    brain.switch_engine()
+    assert brain.active_engine is groq
+    groq.init_session.assert_called_once_with("System Prompt")
+    groq.import_history.assert_called_once_with("System Prompt", [])
+
+def test_boot_profile_times_imports_and_phases(tmp_path):
+    (tmp_path / "slow_boot_module.py").write_text("import time\ntime.sleep(0.02)\n")
+    sys.path.insert(0, str(tmp_path))
+    profile = BootProfile()
+    original = builtins.__import__
+    try:
+        profile.start()
+        with profile.phase("engines"):
+            import slow_boot_module
+        profile.finish()
+    finally:
+        builtins.__import__ = original
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("slow_boot_module", None)
+
+    assert builtins.__import__ is original
+    name, own, cumulative, depth = next(i for i in profile.imports if i[0] == "slow_boot_module")
+    assert cumulative >= 0.02 and depth == 0
+    assert [p[0] for p in profile.phases] == ["engines"]
+    report = profile.report()
+    assert report.startswith("import time: self [us] | cumulative | imported package")
+    assert "slow_boot_module" in report and "READY in" in report
@@ -0,0 +1,278 @@
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from google.genai import types
+from core.config import settings
+from core.intelligence.engines.gemini import GeminiEngine, adaptive_thinking_level
+from core.intelligence.conversation import IMAGE_PLACEHOLDER
+from core.intelligence.events import SidecarEventType
+
+@pytest.fixture
+def engine():
+    engine = GeminiEngine(api_key="fake-key")
+    engine.init_session("System Prompt")
+    return engine
+
+def record_pixel_turn(engine, answer="It is a stack trace."):
+    """Simulates a completed Pixel turn in the chat history."""
+    user_input = types.Content(role="user", parts=[
+        types.Part.from_text(text="Analyze this view."),
+        types.Part.from_bytes(data=b"fake_png", mime_type="image/png"),
+    ])
+    model_output = [types.Content(role="model", parts=[types.Part.from_text(text=answer)])]
+    engine.chat_session.record_history(user_input=user_input, model_output=model_output, is_valid=True)
+
+def test_prune_history_images_replaces_old_images(engine):
+    """Verify that images from previous turns are swapped for text placeholders before the next send."""
+    record_pixel_turn(engine)
+    record_pixel_turn(engine, answer="Now it compiles.")
+    
+    engine._prune_history_images()
+    
+    history = engine.chat_session.get_history(curated=True)
+    assert len(history) == 4
+    parts = [p for content in history for p in content.parts]
+    assert not any(p.inline_data for p in parts)
+    assert sum(1 for p in parts if p.text == IMAGE_PLACEHOLDER) == 2
+    assert history[1].parts[0].text == "It is a stack trace."
+
+def test_prune_history_images_keeps_session_without_images(engine):
+    """Verify that text-only histories do not trigger a session rebuild."""
+    session = engine.chat_session
+    engine._prune_history_images()
+    assert engine.chat_session is session
+
+def test_toggle_model_carries_compacted_history(engine):
+    """Verify that a Flash/Pro toggle keeps the conversation without thoughts, images or chunk fragments."""
+    user_input = types.Content(role="user", parts=[
+        types.Part.from_text(text="Analyze this view."),
+        types.Part.from_bytes(data=b"fake_png", mime_type="image/png"),
+    ])
+    model_output = [
+        types.Content(role="model", parts=[types.Part(text="Thinking about it", thought=True)]),
+        types.Content(role="model", parts=[types.Part.from_text(text="The bug is ")]),
+        types.Content(role="model", parts=[types.Part.from_text(text="on line 4.")]),
+    ]
+    engine.chat_session.record_history(user_input=user_input, model_output=model_output, is_valid=True)
+    
+    assert engine.toggle_model() is True
+    
+    assert engine.model_id == settings.MODEL_PRO
+    history = engine.chat_session.get_history(curated=True)
+    assert [c.role for c in history] == ["user", "model"]
+    assert history[0].parts[0].text == f"Analyze this view.\n{IMAGE_PLACEHOLDER}"
+    assert len(history[1].parts) == 1
+    assert history[1].parts[0].text == "The bug is on line 4."
+    assert engine.current_system_prompt == "System Prompt"
+
+def test_stream_pivot_is_local_and_keeps_history(engine):
+    """Verify that a skill pivot swaps the system instruction without a network round trip."""
+    engine.record_exchange("[CONVERSATION TURN]: Review this PR.", "Two nits.")
+    
+    with patch.object(engine.chat_session, 'send_message_stream') as mock_send:
+        events = list(engine.stream_pivot({"identity": "You are a DBA."}, "New Prompt"))
+        mock_send.assert_not_called()
+    
+    assert events[-1].event_type == SidecarEventType.FINISH
+    assert engine.session_config.system_instruction == "New Prompt"
+    history = engine.chat_session.get_history(curated=True)
+    assert [c.parts[0].text for c in history] == ["[CONVERSATION TURN]: Review this PR.", "Two nits."]
+
+class StubCaches:
+    """Local stand-in for the cached-content API."""
+    def __init__(self, fail_update=False):
+        self.live = {}
+        self.created = 0
+        self.updates = 0
+        self.fail_update = fail_update
+
+    def create(self, model, config):
+        self.created += 1
+        name = f"cachedContents/{self.created}"
+        self.live[name] = (model, config.system_instruction)
+        return types.CachedContent(name=name, model=model)
+
+    def update(self, name, config):
+        self.updates += 1
+        if self.fail_update or name not in self.live:
+            raise RuntimeError("404 cached content not found")
+
+    def delete(self, name):
+        self.live.pop(name, None)
+
+@pytest.fixture
+def cached_engine():
+    engine = GeminiEngine(api_key="fake-key")
+    chats = engine.client.chats
+    engine.client = MagicMock(chats=chats, caches=StubCaches())
+    with patch("core.config.settings.PROMPT_CACHE_MIN_CHARS", 10):
+        yield engine
+
+def adopt_cache(engine):
+    """Waits for the background cache work, then lets the engine pick up the handle as a send would."""
+    engine._prompt_cache_pool.submit(lambda: None).result(timeout=2)
+    engine._adopt_prompt_cache()
+
+def test_large_prompt_uses_cached_content(cached_engine):
+    """Verify that a large system prompt is referenced by cache handle instead of resent."""
+    cached_engine.init_session("A long skill context")
+    adopt_cache(cached_engine)
+    
+    assert cached_engine.session_config.cached_content == "cachedContents/1"
+    assert cached_engine.session_config.system_instruction is None
+    
+    # Same prompt and model: the handle is reused
+    cached_engine.init_session("A long skill context")
+    adopt_cache(cached_engine)
+    assert cached_engine.client.caches.created == 1
+    assert cached_engine.session_config.cached_content == "cachedContents/1"
+
+def test_session_changes_never_wait_on_the_cache_api(cached_engine):
+    """Verify that init/pivot return at once with the prompt inline while the handle is created."""
+    release = threading.Event()
+    create = cached_engine.client.caches.create
+    cached_engine.client.caches.create = lambda **kwargs: release.wait(2) and create(**kwargs)
+    
+    cached_engine.init_session("A long skill context")
+    assert cached_engine.session_config.system_instruction == "A long skill context"
+    cached_engine.import_history("A different long skill", [])
+    assert cached_engine.session_config.system_instruction == "A different long skill"
+    # A send before the handle is ready goes out inline
+    cached_engine._adopt_prompt_cache()
+    assert cached_engine.session_config.cached_content is None
+    
+    release.set()
+    adopt_cache(cached_engine)
+    assert cached_engine.session_config.cached_content == "cachedContents/2"
+    # The handle created for the replaced prompt is deleted in the background
+    assert list(cached_engine.client.caches.live) == ["cachedContents/2"]
+
+def test_small_prompt_stays_inline(cached_engine):
+    cached_engine.init_session("Short")
+    
+    assert cached_engine.client.caches.created == 0
+    assert cached_engine.session_config.system_instruction == "Short"
+
+def test_prompt_change_invalidates_cache(cached_engine):
+    """Verify that a skill pivot or model toggle drops the old handle."""
+    caches = cached_engine.client.caches
+    cached_engine.init_session("A long skill context")
+    adopt_cache(cached_engine)
+    cached_engine.import_history("A different long skill", [])
+    adopt_cache(cached_engine)
+    
+    assert list(caches.live) == ["cachedContents/2"]
+    assert caches.live["cachedContents/2"][1] == "A different long skill"
+    
+    cached_engine.toggle_model()
+    adopt_cache(cached_engine)
+    assert list(caches.live) == ["cachedContents/3"]
+    assert caches.live["cachedContents/3"][0] == settings.MODEL_PRO
+
+def test_cache_refreshes_before_expiry(cached_engine):
+    caches = cached_engine.client.caches
+    cached_engine.init_session("A long skill context")
+    adopt_cache(cached_engine)
+    
+    cached_engine._refresh_prompt_cache()
+    assert caches.updates == 0
+    
+    cached_engine._prompt_cache_expires = 0
+    cached_engine._refresh_prompt_cache()
+    assert caches.updates == 1
+    assert cached_engine.session_config.cached_content == "cachedContents/1"
+
+def test_expired_cache_is_recreated_with_history(cached_engine):
+    caches = cached_engine.client.caches
+    cached_engine.init_session("A long skill context")
+    adopt_cache(cached_engine)
+    record_pixel_turn(cached_engine)
+    
+    caches.fail_update = True
+    cached_engine._prompt_cache_expires = 0
+    cached_engine._refresh_prompt_cache()
+    adopt_cache(cached_engine)
+    
+    assert cached_engine.session_config.cached_content == "cachedContents/2"
+    assert len(cached_engine.chat_session.get_history(curated=True)) == 2
+
+@pytest.mark.parametrize("has_image, text, prompt_chars, expected", [
+    (False, "Why?", 0, "low"),
+    (False, "x" * 300, 0, "medium"),
+    (True, "", 0, "medium"),
+    (True, "Is this right?", 0, "high"),
+    (False, "Why?", 50000, "medium"),
+])
+def test_adaptive_thinking_level(has_image, text, prompt_chars, expected):
+    with patch("core.config.settings.THINKING_LEVEL", "high"):
+        assert adaptive_thinking_level(has_image, text, prompt_chars) == expected
+
+def test_large_context_threshold_has_its_own_setting():
+    with patch("core.config.settings.THINKING_LEVEL", "high"), \
+         patch("core.config.settings.THINKING_LARGE_CONTEXT_CHARS", 100), \
+         patch("core.config.settings.PROMPT_CACHE_MIN_CHARS", 10):
+        assert adaptive_thinking_level(False, "Why?", 50) == "low"
+        assert adaptive_thinking_level(False, "Why?", 100) == "medium"
+
+def test_adaptive_thinking_level_respects_ceiling():
+    with patch("core.config.settings.THINKING_LEVEL", "low"):
+        assert adaptive_thinking_level(True, "Is this right?", 50000) == "low"
+
+def test_adaptive_mode_overrides_thinking_per_turn(engine):
+    """Verify that each send carries its own thinking level while the session default stays intact."""
+    stream = MagicMock()
+    stream.__iter__.return_value = iter([])
+    with patch("core.config.settings.THINKING_MODE", "adaptive"), \
+         patch.object(engine.chat_session, "send_message_stream", return_value=stream) as send:
+        list(engine.stream_analysis(None, "Why?"))
+    
+    config = send.call_args.kwargs["config"]
+    assert config.thinking_config.thinking_level == types.ThinkingLevel.LOW
+    assert config.system_instruction == "System Prompt"
+    assert engine.session_config.thinking_config.thinking_level == types.ThinkingLevel.HIGH
+
+def test_pro_model_rounds_to_supported_levels(engine):
+    engine.use_pro_model = True
+    assert engine._thinking_config("medium").thinking_level == types.ThinkingLevel.HIGH
+    assert engine._thinking_config("minimal").thinking_level == types.ThinkingLevel.LOW
+
+def test_hidden_thoughts_are_not_requested_or_forwarded():
+    with patch("core.config.settings.SHOW_THOUGHTS", False):
+        engine = GeminiEngine(api_key="fake-key")
+        engine.init_session("System Prompt")
+        assert engine.session_config.thinking_config.include_thoughts is False
+        
+        thought = types.Part(text="Let me think...", thought=True)
+        answer = types.Part(text="Answer.")
+        chunk = types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(role="model", parts=[thought, answer]))])
+        with patch.object(engine.chat_session, "send_message_stream", return_value=iter([chunk])):
+            events = list(engine.stream_analysis(None, "Why?"))
+    
+    assert [e.content for e in events if e.event_type == SidecarEventType.TEXT_CHUNK] == ["Answer."]
+    assert events[-1].metadata["metrics"]["ttf_thought"] is None
+
+def test_prefetched_capture_is_sent_as_file_reference():
+    """Verify that an uploaded capture travels as a URI and is pruned like inline images."""
+    with patch("core.config.settings.IMAGE_UPLOAD_ENABLED", True):
+        engine = GeminiEngine(api_key="fake-key")
+    engine.init_session("System Prompt")
+    engine.client = MagicMock(chats=engine.client.chats)
+    engine.client.files.upload.return_value = MagicMock(uri="https://files.example/abc")
+    engine.prefetch_image(b"fake_png")
+    engine.uploads.prefetch(b"fake_png").result(timeout=2)
+    
+    with patch.object(engine.chat_session, "send_message_stream", return_value=iter([])) as send:
+        list(engine.stream_analysis(b"fake_png", ""))
+    
+    image = send.call_args.kwargs["message"][1]
+    assert image.file_data.file_uri == "https://files.example/abc"
+    assert image.inline_data is None
+    engine.client.files.upload.assert_called_once()
+    
+    engine._record_cancelled_turn(send.call_args.kwargs["message"], "Partial")
+    engine._prune_history_images()
+    parts = engine.chat_session.get_history(curated=True)[0].parts
+    assert parts[1].text == IMAGE_PLACEHOLDER
+
+def test_image_upload_is_opt_in(engine):
+    assert engine.uploads is None
@@ -0,0 +1,90 @@
+import os
+import signal
+import time
+import pytest
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+from core.ui.idle import AdaptivePoller, SignalWakeup, backoff_interval
+from core.utils.wakeups import WakeupCounter, wakeups
+
+# Wall-clock comparisons only run on request: SIDECAR_BENCHMARK=1 pytest tests/
+benchmark = pytest.mark.skipif(not os.getenv("SIDECAR_BENCHMARK"), reason="timing benchmark; set SIDECAR_BENCHMARK=1")
+
+@pytest.fixture(scope="module")
+def qt_app():
+    return QApplication.instance() or QApplication([])
+
+def spin(qt_app, seconds: float):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        qt_app.processEvents()
+        time.sleep(0.002)
+
+def idle(seconds: float):
+    """Blocks in a real event loop, so the process sleeps between timer wakeups."""
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+def test_backoff_grows_with_distance():
+    assert backoff_interval(0, 50, 1000) == 50
+    assert backoff_interval(100, 50, 1000) == 50
+    assert backoff_interval(1000, 50, 1000) == 250
+    assert backoff_interval(20000, 50, 1000) == 1000
+
+def test_poller_follows_callback_delay_and_clamps(qt_app):
+    delays = iter([5000, 1, None])
+    poller = AdaptivePoller("test-poll", lambda: next(delays, 20), min_ms=20, max_ms=200)
+    poller.resume()
+    spin(qt_app, 0.05)
+    assert poller.wakeups == 1
+    assert poller.interval == 200
+
+    poller.suspend()
+    assert not poller.active
+    spin(qt_app, 0.25)
+    assert poller.wakeups == 1
+
+def test_signal_wakeup_runs_handler_without_a_timer(qt_app):
+    received = []
+    previous = signal.signal(signal.SIGINT, lambda s, f: received.append(s))
+    wakeup = SignalWakeup()
+    try:
+        before = wakeups.counts["signal"]
+        signal.raise_signal(signal.SIGINT)
+        spin(qt_app, 0.05)
+        assert received == [signal.SIGINT]
+        assert wakeups.counts["signal"] == before + 1
+    finally:
+        wakeup.close()
+        signal.signal(signal.SIGINT, previous)
+
+def test_wakeup_counter_report():
+    counter = WakeupCounter()
+    counter.tick("hit-test")
+    counter.tick("hit-test")
+    assert counter.counts["hit-test"] == 2
+    assert counter.report().startswith("hit-test: 2 (")
+
+@benchmark
+def test_benchmark_idle_wakeups(qt_app):
+    """
+    Benchmark: one second with the cursor far from the window, fixed 20 Hz
+    polling versus the adaptive poller.
+    """
+    fixed_ticks = []
+    fixed = QTimer()
+    fixed.timeout.connect(lambda: fixed_ticks.append(1))
+    fixed.start(50)
+    idle(1.0)
+    fixed.stop()
+
+    far_away = backoff_interval(3000, 50, 1000)
+    poller = AdaptivePoller("bench-poll", lambda: far_away, min_ms=50, max_ms=1000)
+    poller.resume()
+    idle(1.0)
+    poller.suspend()
+
+    assert len(fixed_ticks) >= 15
+    assert poller.wakeups <= 3
@@ -0,0 +1,224 @@
+import threading
+from concurrent.futures import Future
+from unittest.mock import ANY, MagicMock
+from core.ui.job_queue import JobQueue, PRIORITY_TALK, PRIORITY_PIXEL, PRIORITY_HOUSEKEEPING
+from core.ui.worker import SidecarWorker
+
+def drain(jobs):
+    while jobs.run_next(timeout=0):
+        pass
+
+def test_jobs_run_by_priority_then_fifo():
+    jobs = JobQueue()
+    order = []
+    jobs.submit("model", lambda: order.append("model"), PRIORITY_HOUSEKEEPING)
+    jobs.submit("pixel", lambda: order.append("pixel"), PRIORITY_PIXEL)
+    jobs.submit("engine", lambda: order.append("engine"), PRIORITY_HOUSEKEEPING)
+    jobs.submit("talk", lambda: order.append("talk"), PRIORITY_TALK)
+    drain(jobs)
+    
+    assert order == ["talk", "pixel", "model", "engine"]
+
+def test_duplicate_presses_are_coalesced():
+    jobs = JobQueue()
+    calls = []
+    assert jobs.submit("pixel", lambda: calls.append(1), PRIORITY_PIXEL)
+    assert not jobs.submit("pixel", lambda: calls.append(2), PRIORITY_PIXEL)
+    drain(jobs)
+    # Once started, the same job may be queued again
+    assert jobs.submit("pixel", lambda: calls.append(3), PRIORITY_PIXEL)
+    drain(jobs)
+    
+    assert calls == [1, 3]
+    assert jobs.coalesced == 1
+
+def test_busy_spans_the_running_job_and_survives_failures():
+    jobs = JobQueue()
+    seen = []
+    def failing():
+        seen.append(jobs.busy)
+        raise RuntimeError("boom")
+    jobs.submit("pixel", failing, PRIORITY_PIXEL)
+    drain(jobs)
+    
+    assert seen == [True]
+    assert not jobs.busy
+
+def test_stop_ends_the_loop():
+    jobs = JobQueue()
+    thread = threading.Thread(target=jobs.run_forever)
+    thread.start()
+    jobs.stop()
+    thread.join(timeout=2)
+    assert not thread.is_alive()
+
+def make_worker():
+    recorder = MagicMock(is_idle=True, is_recording=False)
+    worker = SidecarWorker({"brain": MagicMock(), "capture_tool": MagicMock(), "recorder": recorder, "skill_manager": None})
+    return worker, recorder
+
+def test_hotkeys_only_enqueue_turns():
+    """Verify that Pixel presses never run the turn on the calling (UI) thread."""
+    worker, _ = make_worker()
+    worker.handle_pixel_request = MagicMock()
+    
+    worker.request_pixel()
+    worker.request_pixel()
+    worker.handle_pixel_request.assert_not_called()
+    
+    drain(worker.jobs)
+    worker.handle_pixel_request.assert_called_once_with(bypass_cache=False, prepared=ANY)
+
+def test_talk_starts_recording_at_once_and_queues_ahead_of_pixel():
+    worker, recorder = make_worker()
+    worker.handle_pixel_request = MagicMock()
+    worker.handle_verbal_request = MagicMock()
+    
+    worker.request_talk()
+    recorder.toggle.assert_called_once()
+    
+    recorder.is_idle, recorder.is_recording = False, True
+    worker.request_pixel()
+    worker.request_talk()
+    order = []
+    worker.handle_verbal_request.side_effect = lambda **_: order.append("talk")
+    worker.handle_pixel_request.side_effect = lambda **_: order.append("pixel")
+    drain(worker.jobs)
+    
+    assert order == ["talk", "pixel"]
+
+def test_inputs_are_prepared_while_a_turn_streams():
+    """Verify capture and transcription run at press time, not when the queued turn starts."""
+    worker, recorder = make_worker()
+    worker.capture_tool.capture.return_value = b"png"
+    recorder.toggle.return_value = ("IDLE", "what is this?")
+    streaming, release = threading.Event(), threading.Event()
+    def long_turn():
+        streaming.set()
+        release.wait(2)
+    worker.jobs.submit("busy", long_turn, PRIORITY_PIXEL)
+    loop = threading.Thread(target=worker.jobs.run_next)
+    loop.start()
+    assert streaming.wait(2)
+    
+    worker.handle_pixel_request = MagicMock()
+    worker.handle_verbal_request = MagicMock()
+    worker.request_pixel()
+    recorder.is_idle, recorder.is_recording = False, True
+    worker.request_talk()
+    
+    # Both inputs are ready before the in-flight turn ends
+    worker.prep.shutdown(wait=True)
+    assert worker.capture_tool.capture.call_count == 1
+    recorder.toggle.assert_called_once()
+    worker.handle_pixel_request.assert_not_called()
+    
+    release.set()
+    loop.join(timeout=2)
+    drain(worker.jobs)
+    assert worker.handle_verbal_request.call_args.kwargs["prepared"].result() == "what is this?"
+    assert worker.handle_pixel_request.call_args.kwargs["prepared"].result() == b"png"
+
+def test_handlers_use_prepared_inputs():
+    worker, recorder = make_worker()
+    done = Future()
+    done.set_result("hello")
+    worker.brain.analyze_verbal_stream.return_value = iter(())
+    
+    worker.handle_verbal_request(prepared=done)
+    
+    recorder.toggle.assert_not_called()
+    worker.brain.analyze_verbal_stream.assert_called_once_with("hello", cancel_token=ANY, bypass_cache=False)
+
+def test_fused_vector_captures_at_record_start_and_sends_one_turn():
+    worker, recorder = make_worker()
+    worker.capture_tool.capture.return_value = b"png"
+    recorder.toggle.return_value = ("IDLE", "why is this failing?")
+    worker.brain.analyze_image_stream.return_value = iter(())
+    
+    worker.request_fused()
+    recorder.toggle.assert_called_once()
+    worker.capture_tool.capture.assert_called_once()
+    
+    recorder.is_idle, recorder.is_recording = False, True
+    # Stopping with plain Talk still finishes the fused turn
+    worker.request_talk()
+    drain(worker.jobs)
+    
+    worker.brain.analyze_image_stream.assert_called_once_with(b"png", "why is this failing?", cancel_token=ANY, bypass_cache=False)
+    worker.brain.analyze_verbal_stream.assert_not_called()
+    assert worker.capture_tool.capture.call_count == 1
+
+def test_captures_start_upload_as_soon_as_encoded():
+    worker, _ = make_worker()
+    worker.capture_tool.capture.return_value = b"png"
+    worker.handle_pixel_request = MagicMock()
+    
+    worker.request_pixel()
+    worker.prep.shutdown(wait=True)
+    
+    worker.brain.prefetch_image.assert_called_once_with(b"png", patient=False)
+
+def test_only_queued_and_fused_captures_wait_for_their_upload():
+    worker, recorder = make_worker()
+    worker.capture_tool.capture.return_value = b"png"
+    worker.handle_pixel_request = MagicMock()
+    worker.jobs._busy.set()
+    
+    worker.request_pixel()
+    worker.request_fused()
+    worker.prep.shutdown(wait=True)
+    
+    assert [c.kwargs["patient"] for c in worker.brain.prefetch_image.call_args_list] == [True, True]
+
+def test_verbal_turn_ends_while_the_next_recording_runs():
+    """Verify the turn's token is released even when a new Talk recording started mid-stream."""
+    worker, recorder = make_worker()
+    done = Future()
+    done.set_result("hello")
+    statuses = []
+    worker.signal_status_update.connect(statuses.append)
+    def stream(*args, **kwargs):
+        recorder.is_idle, recorder.is_recording = False, True
+        return iter(())
+    worker.brain.analyze_verbal_stream.side_effect = stream
+    
+    worker.handle_verbal_request(prepared=done)
+    
+    assert worker.cancel_token is None
+    assert statuses[-1] == "RECORDING..."
+
+def test_failed_fused_capture_queues_a_plain_talk_turn():
+    worker, recorder = make_worker()
+    worker.capture_tool.capture.return_value = None
+    recorder.toggle.return_value = ("IDLE", "still there?")
+    worker.brain.analyze_verbal_stream.return_value = iter(())
+    statuses = []
+    worker.signal_status_update.connect(statuses.append)
+    
+    worker.request_fused()
+    recorder.is_idle, recorder.is_recording = False, True
+    worker.request_fused()
+    recorder.is_idle, recorder.is_recording = True, False
+    drain(worker.jobs)
+    
+    worker.brain.analyze_image_stream.assert_not_called()
+    worker.brain.analyze_verbal_stream.assert_called_once_with("still there?", cancel_token=ANY, bypass_cache=False)
+    # One READY per turn: the failed fused turn, then the talk turn
+    assert statuses.count("READY") == 2 and statuses[-1] == "READY"
+
+def test_pixel_turn_ends_while_a_recording_runs():
+    worker, recorder = make_worker()
+    done = Future()
+    done.set_result(b"png")
+    statuses = []
+    worker.signal_status_update.connect(statuses.append)
+    def stream(*args, **kwargs):
+        recorder.is_idle, recorder.is_recording = False, True
+        return iter(())
+    worker.brain.analyze_image_stream.side_effect = stream
+    
+    worker.handle_pixel_request(prepared=done)
+    
+    assert worker.cancel_token is None
+    assert statuses[-1] == "RECORDING..."
@@ -0,0 +1,109 @@
+import os
+import time
+import pytest
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtGui import QTextCursor
+from PyQt6.QtWidgets import QApplication, QPlainTextEdit
+from core.ui.ansi_parser import ANSIParser
+from core.ui.render_queue import TerminalRenderQueue
+
+# Wall-clock comparisons only run on request: SIDECAR_BENCHMARK=1 pytest tests/
+benchmark = pytest.mark.skipif(not os.getenv("SIDECAR_BENCHMARK"), reason="timing benchmark; set SIDECAR_BENCHMARK=1")
+
+@pytest.fixture(scope="module")
+def qt_app():
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def view(qt_app):
+    view = QPlainTextEdit()
+    view.resize(800, 600)
+    return view
+
+def spin_until(qt_app, predicate, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        qt_app.processEvents()
+    return predicate()
+
+def test_first_write_renders_at_once_and_the_rest_share_a_frame(view):
+    """Verify that a burst's first token is not held for a frame and later pushes produce one document update."""
+    queue = TerminalRenderQueue(view, frame_ms=1000)
+    queue.push("The")
+    assert view.toPlainText() == "The"
+
+    for token in [" bug", " is", " on", " line", " 4."]:
+        queue.push(token)
+    assert view.toPlainText() == "The"
+
+    queue.flush()
+    assert view.toPlainText() == "The bug is on line 4."
+    assert (queue.pushes, queue.flushes) == (6, 2)
+
+def test_timer_flushes_after_one_frame(view, qt_app):
+    queue = TerminalRenderQueue(view, frame_ms=5)
+    queue.push("head")
+    queue.push("tail")
+    assert spin_until(qt_app, lambda: view.toPlainText() == "headtail")
+
+def test_ansi_text_keeps_colours_across_chunks(view):
+    """Verify that an escape in one push still colours text pushed in the same frame."""
+    queue = TerminalRenderQueue(view, frame_ms=1000)
+    queue.push("\x1b[31m")
+    queue.push("red")
+    queue.push("\x1b[0m plain")
+    queue.flush()
+
+    assert view.toPlainText() == "red plain"
+    cursor = QTextCursor(view.document())
+    cursor.setPosition(2)
+    assert cursor.charFormat().foreground().color() == ANSIParser.ANSI_COLORS['31']
+
+def test_flush_hook_runs_once_per_frame(view):
+    calls = []
+    queue = TerminalRenderQueue(view, frame_ms=1000, on_flush=calls.append)
+    queue.push("\x1b[32ma")
+    queue.push("b")
+    queue.push("c")
+    queue.flush()
+    queue.flush()
+    assert calls == ["a", "bc"]
+
+def test_stream_is_rendered_by_the_frame_timer(view, qt_app):
+    """Verify that the queue's own timer batches a fast stream into far fewer renders than pushes, losing nothing."""
+    tokens = [f" tok{i}" + ("\n" if i % 12 == 0 else "") for i in range(5000)]
+    queue = TerminalRenderQueue(view, frame_ms=16)
+    for token in tokens:
+        queue.push(token)
+        qt_app.processEvents()
+
+    assert spin_until(qt_app, lambda: view.toPlainText() == "".join(tokens))
+    assert queue.flushes <= queue.pushes // 10
+
+@benchmark
+def test_benchmark_streaming_throughput(view):
+    """
+    Benchmark: the same burst with one document update per write (the previous
+    behaviour) versus the render queue.
+    """
+    tokens = [f" tok{i}" + ("\n" if i % 12 == 0 else "") for i in range(5000)]
+
+    started = time.perf_counter()
+    for token in tokens:
+        cursor = view.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(token)
+        view.setTextCursor(cursor)
+        view.ensureCursorVisible()
+    per_write = time.perf_counter() - started
+
+    view.clear()
+    queue = TerminalRenderQueue(view, frame_ms=16)
+    started = time.perf_counter()
+    for token in tokens:
+        queue.push(token)
+    queue.flush()
+    batched = time.perf_counter() - started
+
+    assert len(tokens) / batched > 1000
+    assert batched < per_write
@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from core.intelligence.engines.replay import ReplayEngine, SessionRecorder, request_digest
+from core.intelligence.model import SidecarBrain
+from core.intelligence.cancellation import CancellationToken
+from core.intelligence.events import SidecarEvent, SidecarEventType
+
+# Wall-clock comparisons only run on request: SIDECAR_BENCHMARK=1 pytest tests/
+benchmark = pytest.mark.skipif(not os.getenv("SIDECAR_BENCHMARK"), reason="timing benchmark; set SIDECAR_BENCHMARK=1")
+
+def live_stream(*texts, thought=None, error=None):
+    if thought:
+        yield SidecarEvent(SidecarEventType.TEXT_CHUNK, content=thought, metadata={"is_thought": True})
+    for text in texts:
+        yield SidecarEvent(SidecarEventType.TEXT_CHUNK, content=text)
+    if error:
+        yield SidecarEvent(SidecarEventType.ERROR, content=error)
+        return
+    yield SidecarEvent(SidecarEventType.FINISH)
+
+@pytest.fixture
+def recording(tmp_path):
+    path = str(tmp_path / "session.jsonl")
+    recorder = SessionRecorder(path)
+    list(recorder.record(live_stream("It is ", "a stack trace.", thought="Looking..."), b"png", "", "GEMINI FLASH"))
+    list(recorder.record(live_stream("O(n)."), None, "Why linear?", "GEMINI FLASH"))
+    return path
+
+def texts(events):
+    return [e.content for e in events if e.event_type == SidecarEventType.TEXT_CHUNK]
+
+def test_recorder_writes_compact_turns(recording):
+    with open(recording) as f:
+        entries = [json.loads(line) for line in f]
+    
+    assert [e["digest"] for e in entries] == [request_digest(b"png", ""), request_digest(None, "Why linear?")]
+    assert [c[1:] for c in entries[0]["chunks"]] == [["Looking...", True], ["It is ", False], ["a stack trace.", False]]
+    assert all(isinstance(c[0], float) for c in entries[0]["chunks"])
+
+def test_replay_matches_turns_by_digest(recording):
+    """Verify that a replayed turn reproduces the recorded chunks and history."""
+    engine = ReplayEngine(recording, speed=0)
+    engine.init_session("System Prompt")
+    
+    events = list(engine.stream_analysis(None, "Why  linear?"))
+    assert texts(events) == ["O(n)."]
+    assert events[-1].event_type == SidecarEventType.FINISH
+    
+    events = list(engine.stream_analysis(b"png"))
+    assert texts(events) == ["Looking...", "It is ", "a stack trace."]
+    assert events[1].metadata == {"is_thought": True}
+    assert [t.text for t in engine.export_history()][-1] == "It is a stack trace."
+
+def test_unknown_requests_replay_in_file_order(recording):
+    engine = ReplayEngine(recording, speed=0)
+    assert texts(engine.stream_analysis(None, "Something new")) == ["Looking...", "It is ", "a stack trace."]
+    assert texts(engine.stream_analysis(None, "Another")) == ["O(n)."]
+
+def test_replay_speed_scales_recorded_timing(tmp_path):
+    path = str(tmp_path / "slow.jsonl")
+    with open(path, "w") as f:
+        f.write(json.dumps({"digest": "x", "model": "", "chunks": [[200.0, "A", False], [200.0, "B", False]]}) + "\n")
+    
+    waits = []
+    class RecordingEvent(threading.Event):
+        def wait(self, timeout=None):
+            waits.append(timeout)
+            return False
+    with patch("core.intelligence.engines.replay.threading.Event", RecordingEvent):
+        events = list(ReplayEngine(path, speed=10).stream_analysis(None, "Go"))
+    
+    assert texts(events) == ["A", "B"]
+    assert waits == [pytest.approx(0.02), pytest.approx(0.02)]
+
+@benchmark
+def test_benchmark_replay_speed_elapsed(tmp_path):
+    path = str(tmp_path / "slow.jsonl")
+    with open(path, "w") as f:
+        f.write(json.dumps({"digest": "x", "model": "", "chunks": [[200.0, "A", False], [200.0, "B", False]]}) + "\n")
+    
+    start = time.perf_counter()
+    list(ReplayEngine(path, speed=10).stream_analysis(None, "Go"))
+    assert 0.03 <= time.perf_counter() - start < 0.35
+
+def test_injected_failure_is_not_committed(recording):
+    engine = ReplayEngine(recording, speed=0, failure_rate=1.0, seed=7)
+    events = list(engine.stream_analysis(None, "Why linear?"))
+    
+    assert events[-1].event_type == SidecarEventType.ERROR
+    assert engine.export_history() == []
+
+def test_cancel_interrupts_replay_delays(tmp_path):
+    path = str(tmp_path / "stall.jsonl")
+    with open(path, "w") as f:
+        f.write(json.dumps({"digest": "x", "model": "", "chunks": [[0, "A", False], [10000.0, "B", False]]}) + "\n")
+    engine = ReplayEngine(path)
+    token = CancellationToken()
+    
+    stream = engine.stream_analysis(None, "Go", token)
+    next(stream)
+    assert next(stream).content == "A"
+    start = time.perf_counter()
+    threading.Timer(0.05, token.cancel).start()
+    rest = list(stream)
+    
+    assert time.perf_counter() - start < 2
+    assert rest[-1].metadata["cancelled"]
+    assert engine.export_history()[-1].text.startswith("A")
+
+def test_brain_runs_offline_on_replay(recording):
+    with patch("core.config.settings.SIDECAR_ENGINE", "replay"), \
+         patch("core.config.settings.REPLAY_PATH", recording), \
+         patch("core.config.settings.REPLAY_SPEED", 0.0):
+        brain = SidecarBrain(google_api_key=None, groq_api_key=None)
+    brain.set_skill({"identity": "", "instructions": "", "context": ""}, "System Prompt")
+    
+    assert brain.active_engine_name == "replay"
+    assert texts(brain.analyze_verbal_stream("Why linear?")) == ["O(n)."]
+
+def test_brain_drops_replayed_thoughts_when_hidden(recording):
+    with patch("core.config.settings.SIDECAR_ENGINE", "replay"), \
+         patch("core.config.settings.REPLAY_PATH", recording), \
+         patch("core.config.settings.REPLAY_SPEED", 0.0):
+        brain = SidecarBrain(google_api_key=None, groq_api_key=None)
+    brain.set_skill({"identity": "", "instructions": "", "context": ""}, "System Prompt")
+    
+    with patch("core.config.settings.SHOW_THOUGHTS", False):
+        assert texts(brain.analyze_image_stream(b"png")) == ["It is ", "a stack trace."]
+
+def test_brain_without_any_engine_fails_clearly():
+    with patch("core.config.settings.SIDECAR_ENGINE", "gemini"):
+        with pytest.raises(ValueError, match="No engine available"):
+            SidecarBrain(google_api_key=None, groq_api_key=None)
+
+def test_replayed_turns_are_not_recorded_again(recording, tmp_path):
+    with patch("core.config.settings.SIDECAR_ENGINE", "replay"), \
+         patch("core.config.settings.REPLAY_PATH", recording), \
+         patch("core.config.settings.REPLAY_SPEED", 0.0), \
+         patch("core.config.settings.RECORD_PATH", str(tmp_path / "again.jsonl")):
+        brain = SidecarBrain(google_api_key=None, groq_api_key=None)
+    brain.set_skill({"identity": "", "instructions": "", "context": ""}, "System Prompt")
+    
+    assert texts(brain.analyze_verbal_stream("Why linear?")) == ["O(n)."]
+    assert not (tmp_path / "again.jsonl").exists()
@@ -0,0 +1,105 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from core.intelligence.model import SidecarBrain
+from core.intelligence.response_cache import ResponseCache
+from core.intelligence.conversation import ConversationTurn
+from core.intelligence.events import SidecarEvent, SidecarEventType
+
+def test_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2, ttl=600)
+    cache.put("a", [("A", False)])
+    cache.put("b", [("B", False)])
+    cache.get("a")
+    cache.put("c", [("C", False)])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [("A", False)]
+    assert cache.get("c") == [("C", False)]
+
+def test_cache_expires_entries():
+    cache = ResponseCache(ttl=10)
+    with patch("core.intelligence.response_cache.time.time", return_value=1000):
+        cache.put("a", [("A", False)])
+    with patch("core.intelligence.response_cache.time.time", return_value=1011):
+        assert cache.get("a") is None
+    assert cache.misses == 1
+
+def test_cache_persists_to_disk(tmp_path):
+    path = str(tmp_path / "responses.json")
+    ResponseCache(disk_path=path).put("a", [("thinking", True), ("Answer", False)])
+
+    assert ResponseCache(disk_path=path).get("a") == [("thinking", True), ("Answer", False)]
+
+def test_history_digest_ignores_whitespace():
+    a = [ConversationTurn("user", "Why  O(n)?\n"), ConversationTurn("assistant", "One pass.")]
+    b = [ConversationTurn("user", "Why O(n)?"), ConversationTurn("assistant", "One  pass.")]
+    assert ResponseCache.digest_history(a) == ResponseCache.digest_history(b)
+
+@pytest.fixture
+def brain():
+    with patch("core.config.settings.RESPONSE_CACHE_ENABLED", True), \
+         patch("core.config.settings.RESPONSE_CACHE_PATH", None):
+        brain = SidecarBrain(google_api_key="fake-key", groq_api_key="fake-key")
+    brain.set_active_engine("groq")
+    brain.set_skill({"identity": "", "instructions": "", "context": ""}, "System Prompt")
+    return brain
+
+def _fake_completion(groq, calls):
+    def run(messages_to_send=None, cancel_token=None):
+        calls.append(groq.messages[-1]["content"])
+        answer = f"Answer {len(calls)}"
+        groq.messages.append({"role": "assistant", "content": answer})
+        yield SidecarEvent(SidecarEventType.TEXT_CHUNK, content=answer)
+        yield SidecarEvent(SidecarEventType.FINISH)
+    return run
+
+def _texts(events):
+    return "".join(e.content for e in events if e.event_type == SidecarEventType.TEXT_CHUNK)
+
+def test_repeated_turn_is_replayed_from_cache(brain):
+    """Verify that pressing T again with the same words replays the answer without a model call."""
+    groq = brain.engines["groq"]
+    calls = []
+    with patch.object(groq, "_execute_chat_completion", side_effect=_fake_completion(groq, calls)):
+        first = list(brain.analyze_verbal_stream("Why O(n)?"))
+        second = list(brain.analyze_verbal_stream("Why O(n)?"))
+
+    assert len(calls) == 1
+    assert _texts(first) == _texts(second) == "Answer 1"
+    assert second[-1].metadata == {"cached": True, "cancelled": False}
+    # The replay does not duplicate the exchange in history
+    assert len(groq.messages) == 3
+
+def test_bypass_and_new_context_reach_the_model(brain):
+    groq = brain.engines["groq"]
+    calls = []
+    with patch.object(groq, "_execute_chat_completion", side_effect=_fake_completion(groq, calls)):
+        list(brain.analyze_verbal_stream("Why O(n)?"))
+        fresh = list(brain.analyze_verbal_stream("Why O(n)?", bypass_cache=True))
+        list(brain.analyze_verbal_stream("And memory?"))
+        after_new_turn = list(brain.analyze_verbal_stream("Why O(n)?"))
+
+    assert len(calls) == 4
+    assert _texts(fresh) == "Answer 2"
+    assert _texts(after_new_turn) == "Answer 4"
+
+def test_failed_turns_are_not_cached(brain):
+    groq = brain.engines["groq"]
+    def failing(messages_to_send=None, cancel_token=None):
+        yield SidecarEvent(SidecarEventType.TEXT_CHUNK, content="Partial")
+        yield SidecarEvent(SidecarEventType.ERROR, content="503")
+
+    with patch.object(groq, "_execute_chat_completion", side_effect=failing) as completion:
+        list(brain.analyze_verbal_stream("Why O(n)?"))
+        list(brain.analyze_verbal_stream("Why O(n)?"))
+
+    assert completion.call_count == 2
+
+def test_cache_bypass_hotkeys_are_registered_only_with_the_cache_on():
+    from core.ui.hotkey_orchestrator import HotkeyOrchestrator, HK_ID_PIXEL_FRESH, HK_ID_TALK_FRESH
+    orchestrator = HotkeyOrchestrator(MagicMock(), None)
+    with patch("core.config.settings.RESPONSE_CACHE_ENABLED", False):
+        assert HK_ID_PIXEL_FRESH not in orchestrator.get_mappings()
+    with patch("core.config.settings.RESPONSE_CACHE_ENABLED", True):
+        mappings = orchestrator.get_mappings()
+    assert HK_ID_PIXEL_FRESH in mappings and HK_ID_TALK_FRESH in mappings
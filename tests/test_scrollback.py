@@ -0,0 +1,55 @@
+import os
+import pytest
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtWidgets import QApplication, QPlainTextEdit
+from core.ui.render_queue import TerminalRenderQueue
+from core.ui.scrollback import Scrollback, ScrollbackArchive
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = ScrollbackArchive(str(tmp_path / "scrollback.log"))
+    yield archive
+    archive.close()
+
+def test_archive_reads_ranges_by_line(archive):
+    archive.append(["first", "zweite Zeile ü", ""])
+    archive.append(["fourth"])
+
+    assert len(archive) == 4
+    assert archive.read(0, 2) == ["first", "zweite Zeile ü"]
+    assert archive.read(2, 10) == ["", "fourth"]
+    assert archive.read(-3, 1) == ["first"]
+    assert archive.read(4, 1) == []
+
+def test_archive_search_returns_line_indices(archive):
+    archive.append(["alpha error", "beta", "gamma error error", "delta"])
+    assert archive.search("error") == [0, 2]
+    assert archive.search("missing") == []
+
+def test_scrollback_evicts_oldest_lines_to_archive(archive):
+    scrollback = Scrollback(3, archive)
+    scrollback.append("one\ntw")
+    scrollback.append("o\nthree\nfour\nfi")
+
+    assert list(scrollback.lines) == ["three", "four", "fi"]
+    assert archive.read(0, 10) == ["one", "two"]
+    assert scrollback.search("o") == ["one", "two", "four"]
+
+def test_mirror_matches_capped_document(archive):
+    """Verify that the mirror evicts exactly the lines Qt drops under maximumBlockCount."""
+    app = QApplication.instance() or QApplication([])
+    view = QPlainTextEdit()
+    view.document().setMaximumBlockCount(50)
+    scrollback = Scrollback(50, archive)
+    queue = TerminalRenderQueue(view, frame_ms=1000, on_flush=scrollback.append)
+
+    for i in range(400):
+        queue.push(f"\x1b[36mline {i}\x1b[0m" + ("\n" if i % 3 else " "))
+        if i % 7 == 0:
+            queue.flush()
+    queue.flush()
+
+    assert view.toPlainText().split("\n") == list(scrollback.lines)
+    assert view.document().blockCount() == 50
+    restored = archive.read(0, len(archive)) + list(scrollback.lines)
+    assert "\n".join(restored).startswith("line 0 line 1\nline 2\n")
@@ -0,0 +1,87 @@
+import io
+import sys
+import threading
+import pytest
+from core.utils.stdout_capture import StdoutCapture
+
+@pytest.fixture
+def capture():
+    console = io.StringIO()
+    emitted = []
+    saved = sys.stdout, sys.stderr
+    sys.stdout = sys.stderr = console
+    capture = StdoutCapture(emitted.append, interval_ms=1000)
+    capture.start()
+    # pytest re-installs its own sys.stdout before each test body, so tests write to the proxy directly
+    capture.out, capture.err = sys.stdout, sys.stderr
+    yield capture, console, emitted
+    capture.stop()
+    sys.stdout, sys.stderr = saved
+
+def test_writes_return_without_waiting_for_the_sink(capture):
+    capture, console, emitted = capture
+    release = threading.Event()
+    def blocking_callback(text):
+        release.wait(2)
+        emitted.append(text)
+    capture.callback = blocking_callback
+
+    capture.out.write("line one\n")
+    # The sink is blocked in the UI callback; further writes still return at once
+    capture.out.write("token")
+    assert capture.out.write(" more") == 5
+
+    release.set()
+    capture.drain()
+    assert "".join(emitted) == "line one\ntoken more"
+    assert console.getvalue() == "line one\ntoken more"
+
+def test_partial_lines_are_batched_until_newline(capture):
+    capture, console, emitted = capture
+    for token in ["The", " answer", " is", " 42."]:
+        capture.out.write(token)
+    capture.out.write("\n")
+    capture.drain()
+
+    assert emitted == ["The answer is 42.\n"]
+    assert capture.batches == 1
+
+def test_writes_during_emission_only_reach_the_console(capture):
+    """Verify the recursion guard: output from inside the UI callback is not re-emitted."""
+    capture, console, emitted = capture
+    def noisy_callback(text):
+        emitted.append(text)
+        capture.out.write("log from slot\n")
+    capture.callback = noisy_callback
+
+    capture.out.write("hello\n")
+    capture.drain()
+
+    assert emitted == ["hello\n"]
+    assert "log from slot\n" in console.getvalue()
+
+def test_synchronous_escape_hatch(capture):
+    capture, console, emitted = capture
+    capture.out.write("queued")
+    capture.set_synchronous(True)
+    # Pending output is delivered first, then writes go straight through
+    assert console.getvalue() == "queued"
+    capture.err.write("Traceback ...\n")
+    assert console.getvalue() == "queued" + "Traceback ...\n"
+    assert emitted == ["queued", "Traceback ...\n"]
+
+def test_stop_delivers_pending_output():
+    console = io.StringIO()
+    emitted = []
+    saved = sys.stdout
+    sys.stdout = console
+    try:
+        capture = StdoutCapture(emitted.append, interval_ms=10000)
+        capture.start()
+        sys.stdout.write("partial")
+        capture.stop()
+        assert sys.stdout is console
+    finally:
+        sys.stdout = saved
+    assert console.getvalue() == "partial"
+    assert emitted == ["partial"]
@@ -0,0 +1,157 @@
+import io
+import json
+import os
+import threading
+import time
+import httpx
+import pytest
+from unittest.mock import patch
+from stub_servers import StubServer, StubBehaviour
+from core.intelligence.engines.gemini import GeminiEngine
+from core.intelligence.engines.groq_engine import GroqEngine
+from core.intelligence.engines.transcription import GroqTranscriptionEngine
+from core.intelligence.cancellation import CancellationToken
+from core.intelligence.events import SidecarEventType
+
+# Wall-clock comparisons only run on request: SIDECAR_BENCHMARK=1 pytest tests/
+benchmark = pytest.mark.skipif(not os.getenv("SIDECAR_BENCHMARK"), reason="timing benchmark; set SIDECAR_BENCHMARK=1")
+
+@pytest.fixture
+def stub(request):
+    behaviour = getattr(request, "param", None) or StubBehaviour()
+    with StubServer(behaviour) as server, \
+         patch("core.config.settings.GROQ_BASE_URL", server.base_url), \
+         patch("core.config.settings.GEMINI_BASE_URL", server.base_url):
+        yield server
+
+def texts(events):
+    return "".join(e.content for e in events if e.event_type == SidecarEventType.TEXT_CHUNK)
+
+def test_groq_streams_over_sse(stub):
+    engine = GroqEngine("test-key")
+    engine.init_session("System Prompt")
+    
+    events = list(engine.stream_analysis(b"png", "Why?"))
+    
+    assert texts(events) == "Hello from the stub."
+    assert engine.messages[-1] == {"role": "assistant", "content": "Hello from the stub."}
+    assert stub.requests == [("POST", "/openai/v1/chat/completions")]
+
+def test_gemini_streams_over_sse(stub):
+    engine = GeminiEngine("test-key")
+    engine.init_session("System Prompt")
+    
+    events = list(engine.stream_analysis(None, "Why?"))
+    
+    assert texts(events) == "Hello from the stub."
+    assert engine.export_history()[-1].text == "Hello from the stub."
+    assert ":streamGenerateContent" in stub.requests[0][1]
+
+@pytest.mark.parametrize("stub", [StubBehaviour(fail_status=429, fail_times=1)], indirect=True)
+def test_groq_retries_rate_limits(stub):
+    engine = GroqEngine("test-key")
+    engine.init_session("System Prompt")
+    
+    assert texts(engine.stream_analysis(None, "Why?")) == "Hello from the stub."
+    assert len(stub.requests) == 2
+
+@pytest.mark.parametrize("stub", [StubBehaviour(fail_status=503, fail_times=1)], indirect=True)
+def test_gemini_surfaces_server_errors(stub):
+    engine = GeminiEngine("test-key")
+    engine.init_session("System Prompt")
+    
+    events = list(engine.stream_analysis(None, "Why?"))
+    assert events[-1].event_type == SidecarEventType.ERROR
+    assert "503" in events[-1].content
+
+@pytest.mark.parametrize("stub", [StubBehaviour(ttft=0.01, tokens_per_sec=500)], indirect=True)
+def test_paced_stream_keeps_sse_framing_and_order(stub):
+    """Verify that a paced stream still sends one well-formed SSE event per token, in order, then [DONE]."""
+    response = httpx.post(f"{stub.base_url}/openai/v1/chat/completions", json={"model": "stub"})
+    
+    assert response.headers["content-type"] == "text/event-stream"
+    assert response.text.endswith("\n\n")
+    events = response.text[:-2].split("\n\n")
+    assert all(event.startswith("data: ") for event in events)
+    payloads = [event[len("data: "):] for event in events]
+    assert payloads[-1] == "[DONE]"
+    deltas = [json.loads(p)["choices"][0]["delta"].get("content") for p in payloads[:-1]]
+    assert deltas == ["Hello", " from", " the", " stub", ".", None]
+
+@benchmark
+@pytest.mark.parametrize("stub", [StubBehaviour(ttft=0.2, tokens_per_sec=50)], indirect=True)
+def test_pacing_is_observable_end_to_end(stub):
+    engine = GroqEngine("test-key")
+    engine.init_session("System Prompt")
+    
+    start = time.perf_counter()
+    arrivals = [time.perf_counter() - start for e in engine.stream_analysis(None, "Why?")
+                if e.event_type == SidecarEventType.TEXT_CHUNK]
+    
+    assert arrivals[0] >= 0.2
+    assert arrivals[-1] - arrivals[0] >= 4 / 50 * 0.8
+
+@pytest.mark.parametrize("stub", [StubBehaviour(tokens_per_sec=1000)], indirect=True)
+def test_finish_carries_stream_metrics(stub):
+    """Verify that both engines attach TTFT and throughput to FINISH (the maths is covered in test_telemetry)."""
+    for engine in (GroqEngine("test-key"), GeminiEngine("test-key")):
+        engine.init_session("System Prompt")
+        metrics = list(engine.stream_analysis(None, "Why?"))[-1].metadata["metrics"]
+        
+        assert metrics["ttfb"] <= metrics["ttft"] <= metrics["total"]
+        assert metrics["chunks"] == 5
+        assert metrics["chars"] == len("Hello from the stub.")
+        assert metrics["tokens"] == 5
+        assert metrics["tokens_per_sec"] > 0
+
+@benchmark
+@pytest.mark.parametrize("stub", [StubBehaviour(ttft=0.2, tokens_per_sec=50)], indirect=True)
+def test_benchmark_stream_metrics_match_stub_pacing(stub):
+    for engine in (GroqEngine("test-key"), GeminiEngine("test-key")):
+        engine.init_session("System Prompt")
+        metrics = list(engine.stream_analysis(None, "Why?"))[-1].metadata["metrics"]
+        
+        assert 0.2 <= metrics["ttfb"]
+        assert 20 < metrics["tokens_per_sec"] < 200
+
+@pytest.mark.parametrize("stub", [StubBehaviour(stall_after=2, stall_seconds=10)], indirect=True)
+def test_cancel_aborts_stalled_groq_stream(stub):
+    """Verify that the cancel hotkey frees a stream stuck in a blocking socket read."""
+    engine = GroqEngine("test-key")
+    engine.init_session("System Prompt")
+    token = CancellationToken()
+    
+    threading.Timer(0.2, token.cancel).start()
+    start = time.perf_counter()
+    events = list(engine.stream_analysis(None, "Why?", token))
+    
+    assert time.perf_counter() - start < 5
+    assert texts(events) == "Hello from"
+    assert events[-1].metadata["cancelled"]
+
+@pytest.mark.parametrize("stub", [StubBehaviour(stall_after=0, stall_seconds=10)], indirect=True)
+def test_cancel_aborts_gemini_stream_waiting_for_first_token(stub):
+    """Verify that a Gemini turn can be cancelled before the server sends anything."""
+    engine = GeminiEngine("test-key")
+    engine.init_session("System Prompt")
+    token = CancellationToken()
+    
+    threading.Timer(0.2, token.cancel).start()
+    start = time.perf_counter()
+    events = list(engine.stream_analysis(None, "Why?", token))
+    
+    assert time.perf_counter() - start < 5
+    assert texts(events) == ""
+    assert events[-1].metadata["cancelled"]
+    assert engine.export_history()[-1].text.endswith("[Response cancelled by user]")
+
+def test_transcription_reuses_pooled_connection(stub):
+    engine = GroqTranscriptionEngine("test-key")
+    
+    engine.warm_up()
+    assert engine.transcribe(io.BytesIO(b"RIFF fake wav")) == "Hello world transcription."
+    assert engine.transcribe(io.BytesIO(b"RIFF fake wav")) == "Hello world transcription."
+    
+    assert [path for _, path in stub.requests] == ["/openai/v1/models"] + ["/openai/v1/audio/transcriptions"] * 2
+    assert b'name="model"' in stub.uploads[0]
+    assert len(stub.connections) == 1
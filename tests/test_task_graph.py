@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+import pytest
+from core.utils.task_graph import TaskGraph
+from core.utils.session_manager import SessionManager
+
+# Wall-clock comparisons only run on request: SIDECAR_BENCHMARK=1 pytest tests/
+benchmark = pytest.mark.skipif(not os.getenv("SIDECAR_BENCHMARK"), reason="timing benchmark; set SIDECAR_BENCHMARK=1")
+
+def slow(value, seconds=0.1):
+    def run(*deps):
+        time.sleep(seconds)
+        return value if not deps else (value, *deps)
+    return run
+
+def test_independent_tasks_overlap_and_dependents_get_results():
+    # Neither task can pass the barrier unless the other runs at the same time
+    both_running = threading.Barrier(2, timeout=2)
+    graph = TaskGraph()
+    graph.add("a", lambda: both_running.wait() is not None and "a")
+    graph.add("b", lambda: both_running.wait() is not None and "b")
+    graph.add("c", slow("c", 0), after=["a", "b"])
+    results = graph.start().wait()
+
+    assert results["c"] == ("c", "a", "b")
+
+def test_failure_propagates_to_dependents():
+    graph = TaskGraph()
+    graph.add("brain", lambda: 1 / 0)
+    graph.add("set_skill", lambda brain: brain, after=["brain"])
+    graph.add("stt", lambda: "ok")
+    graph.start()
+
+    with pytest.raises(ZeroDivisionError):
+        graph.result("set_skill", timeout=1)
+    assert graph.result("stt", timeout=1) == "ok"
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError):
+        TaskGraph().add("warmer", lambda brain: brain, after=["brain"])
+
+def test_discard_skips_pending_and_cleans_up_finished_and_running():
+    started, release, running_cleaned = threading.Event(), threading.Event(), threading.Event()
+    cleaned = []
+    ran = []
+    def cleanup(result):
+        cleaned.append(result)
+        if result == "running":
+            running_cleaned.set()
+    graph = TaskGraph()
+    graph.add("done", lambda: "done", cleanup=cleanup)
+    graph.add("running", lambda: started.set() or (release.wait(1) and "running"), cleanup=cleanup)
+    graph.add("pending", lambda running: ran.append(running), after=["running"], cleanup=cleaned.append)
+    graph.start()
+    graph.result("done", timeout=1)
+    started.wait(1)
+
+    graph.discard()
+    assert cleaned == ["done"]
+    release.set()
+    assert running_cleaned.wait(1)
+    assert cleaned == ["done", "running"]
+    assert ran == [] and graph.future("pending").cancelled()
+
+@pytest.fixture
+def fast_boot():
+    """A SessionManager whose builders and countdown are timed stand-ins."""
+    manager = SessionManager()
+    manager.hardware = MagicMock()
+    manager.knowledge = MagicMock()
+    manager.hardware.validate_cache.side_effect = lambda cache: time.sleep(0.1) or True
+    manager.knowledge.restore_skill.side_effect = lambda *args: time.sleep(0.1) or ({"identity": "x"}, "Prompt")
+    brain, warmer = MagicMock(), MagicMock()
+    warming = threading.Event()
+    recorder = MagicMock()
+    cache = {"monitor_index": 1, "audio_device_id": None, "skill_name": "default",
+             "skill_placeholders": {}, "session_context": ""}
+    with patch.object(SessionManager, "_build_brain", side_effect=lambda: time.sleep(0.3) or brain), \
+         patch.object(SessionManager, "_build_transcription", side_effect=lambda: time.sleep(0.1) or MagicMock()), \
+         patch.object(SessionManager, "_build_capture", side_effect=lambda idx: MagicMock()), \
+         patch.object(SessionManager, "_build_recorder", side_effect=lambda stt: time.sleep(0.2) or recorder), \
+         patch.object(SessionManager, "_start_warmer", side_effect=lambda brain, stt: warming.set() or warmer):
+        yield manager, cache, brain, warmer, warming
+
+def test_fast_boot_overlaps_bootstrap_with_countdown(fast_boot):
+    """Verify that the whole bootstrap, down to the warm-up, runs while the countdown is still open."""
+    manager, cache, brain, warmer, warming = fast_boot
+    with patch("core.ui.cli.CLI.wait_for_interrupt", side_effect=lambda abort=None: not warming.wait(2)):
+        assert manager._attempt_fast_boot(cache)
+
+    assert manager.brain is brain and manager.warmer is warmer
+    brain.set_skill.assert_called_once_with({"identity": "x"}, "Prompt")
+
+@benchmark
+def test_benchmark_fast_boot(fast_boot):
+    """Benchmark: time-to-READY is max(countdown, slowest task chain) rather than their sum."""
+    manager, cache, brain, warmer, warming = fast_boot
+    with patch("core.ui.cli.CLI.wait_for_interrupt", side_effect=lambda abort=None: time.sleep(0.4) or False):
+        start = time.perf_counter()
+        assert manager._attempt_fast_boot(cache)
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.6 # Serial: 0.4s countdown + 0.8s of bootstrap
+
+def test_interrupt_discards_the_bootstrap(fast_boot):
+    manager, cache, brain, warmer, warming = fast_boot
+    with patch("core.ui.cli.CLI.wait_for_interrupt", side_effect=lambda abort=None: warming.wait(1) or True):
+        assert not manager._attempt_fast_boot(cache)
+
+    assert manager.brain is None
+    # The warm-up already running for the abandoned session is stopped
+    assert warmer.stop.called
+
+def test_failed_validation_ends_the_countdown_early(fast_boot):
+    manager, cache, brain, warmer, warming = fast_boot
+    manager.hardware.validate_cache.side_effect = lambda cache: False
+    aborted = []
+    def countdown(abort=None):
+        deadline = time.time() + 2
+        while time.time() < deadline:
+            if abort():
+                aborted.append(True)
+                return True
+            time.sleep(0.01)
+        return False
+    with patch("core.ui.cli.CLI.wait_for_interrupt", side_effect=countdown):
+        assert not manager._attempt_fast_boot(cache)
+    # The countdown was cut short by the failed validation, not run to the end
+    assert aborted == [True]
@@ -0,0 +1,61 @@
+import pytest
+from unittest.mock import patch
+from core.intelligence.telemetry import StreamTimer, StreamTelemetry
+
+def run_stream(clock, ttft, gaps, engine="groq", model="maverick", thought_first=False):
+    clock["now"] = 0.0
+    timer = StreamTimer(engine, model)
+    clock["now"] = ttft
+    if thought_first:
+        timer.mark_chunk("Thinking...", is_thought=True)
+    timer.mark_chunk("abcd")
+    for gap in gaps:
+        clock["now"] += gap
+        timer.mark_chunk("abcd")
+    return timer
+
+def test_stream_timer_metrics():
+    clock = {"now": 0.0}
+    with patch("core.intelligence.telemetry.time.perf_counter", side_effect=lambda: clock["now"]), \
+         patch("core.intelligence.telemetry.telemetry", StreamTelemetry()):
+        timer = run_stream(clock, 0.25, [0.1] * 4, thought_first=True)
+        metrics = timer.finish()
+    
+    assert metrics["ttfb"] == metrics["ttf_thought"] == metrics["ttft"] == 0.25
+    assert metrics["total"] == pytest.approx(0.65)
+    assert metrics["chunks"] == 6
+    assert metrics["chars"] == 20
+    # (20 + 11 chars) / 4 chars per token over 0.4s of streaming
+    assert metrics["tokens"] == 8
+    assert metrics["tokens_per_sec"] == pytest.approx((31 / 4) / 0.4)
+
+def test_reported_token_counts_take_precedence():
+    clock = {"now": 0.0}
+    with patch("core.intelligence.telemetry.time.perf_counter", side_effect=lambda: clock["now"]), \
+         patch("core.intelligence.telemetry.telemetry", StreamTelemetry()):
+        timer = run_stream(clock, 0.1, [0.5])
+        timer.completion_tokens = 50
+        assert timer.finish()["tokens_per_sec"] == 100
+
+def test_rolling_percentiles_per_engine_and_model():
+    registry = StreamTelemetry(window=10)
+    with patch("core.intelligence.telemetry.telemetry", registry):
+        for i in range(20):
+            registry.record({"engine": "gemini", "model": "flash", "ttfb": None, "ttft": i / 10,
+                             "ttf_thought": None, "total": 1.0, "tokens_per_sec": 50.0, "chunks": 1})
+        registry.record({"engine": "groq", "model": "maverick", "ttfb": None, "ttft": 0.05,
+                         "ttf_thought": None, "total": 0.2, "tokens_per_sec": 400.0, "chunks": 1})
+    
+    flash = registry.percentiles("gemini", "flash")
+    # Only the last 10 samples (1.0 .. 1.9s) are kept
+    assert flash["ttft"]["p50"] == 1.4
+    assert flash["ttft"]["p99"] == 1.9
+    assert flash["ttf_thought"]["p50"] is None
+    assert registry.percentiles("groq", "maverick")["tokens_per_sec"]["p90"] == 400.0
+    assert "maverick (groq): n=1 TTFT p50 50ms" in registry.report()
+
+def test_cancelled_streams_are_not_aggregated():
+    registry = StreamTelemetry()
+    with patch("core.intelligence.telemetry.telemetry", registry):
+        StreamTimer("groq", "maverick").finish(cancelled=True)
+    assert registry.samples == {}
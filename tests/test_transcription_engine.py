@@ -13,7 +13,7 @@ def test_transcribe_success(engine):
     mock_response.status_code = 200
     mock_response.json.return_value = {"text": "Hello world transcription."}
     
-    with patch("requests.post", return_value=mock_response):
+    with patch.object(engine.session, "post", return_value=mock_response):
         audio_buffer = io.BytesIO(b"fake wav data")
         result = engine.transcribe(audio_buffer)
         
@@ -24,7 +24,7 @@ def test_transcribe_silence(engine):
     mock_response.status_code = 200
     mock_response.json.return_value = {"text": "."}
     
-    with patch("requests.post", return_value=mock_response):
+    with patch.object(engine.session, "post", return_value=mock_response):
         audio_buffer = io.BytesIO(b"fake wav data")
         result = engine.transcribe(audio_buffer)
         
@@ -35,8 +35,23 @@ def test_transcribe_error(engine):
     mock_response.status_code = 401
     mock_response.text = "Unauthorized"
     
-    with patch("requests.post", return_value=mock_response):
+    with patch.object(engine.session, "post", return_value=mock_response):
         audio_buffer = io.BytesIO(b"fake wav data")
         result = engine.transcribe(audio_buffer)
         
         assert result is None
+
+def test_warm_up_never_shares_the_session_with_a_transcription(engine):
+    """Verify that the warmer skips while a transcription holds the (non thread-safe) session."""
+    mock_response = MagicMock(status_code=200)
+    mock_response.json.return_value = {"text": "Hello world transcription."}
+    def post_while_warming(*args, **kwargs):
+        engine.warm_up()
+        return mock_response
+
+    with patch.object(engine.session, "post", side_effect=post_while_warming), \
+         patch.object(engine.session, "get") as get:
+        assert engine.transcribe(io.BytesIO(b"fake wav data")) == "Hello world transcription."
+        get.assert_not_called()
+        engine.warm_up()
+        get.assert_called_once()
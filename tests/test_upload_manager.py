@@ -0,0 +1,79 @@
+import threading
+from unittest.mock import MagicMock
+from core.intelligence.upload_manager import UploadManager
+
+def test_prefetch_uploads_each_image_once():
+    upload = MagicMock(side_effect=lambda data: f"files/{len(data)}")
+    uploads = UploadManager(upload, ttl=60)
+    
+    uploads.prefetch(b"png-a").result(timeout=2)
+    uploads.prefetch(b"png-a").result(timeout=2)
+    
+    assert upload.call_count == 1
+    assert uploads.reference(b"png-a") == "files/5"
+    assert uploads.reference(b"png-a") == "files/5"
+    assert uploads.hits == 2
+
+def test_unknown_image_falls_back_to_inline():
+    upload = MagicMock(return_value="files/x")
+    uploads = UploadManager(upload, ttl=60)
+    
+    assert uploads.reference(b"never-prefetched") is None
+    upload.assert_not_called()
+
+def test_reference_waits_briefly_for_in_flight_upload():
+    release = threading.Event()
+    def slow_upload(data):
+        release.wait(2)
+        return "files/slow"
+    uploads = UploadManager(slow_upload, ttl=60)
+    uploads.prefetch(b"png")
+    
+    # Not done within the wait budget: send inline instead of blocking the turn
+    assert uploads.reference(b"png", wait_ms=20) is None
+    release.set()
+    assert uploads.reference(b"png", wait_ms=2000) == "files/slow"
+
+def test_only_patient_captures_wait_for_their_upload():
+    release = threading.Event()
+    def slow_upload(data):
+        release.wait(2)
+        return f"files/{data.decode()}"
+    uploads = UploadManager(slow_upload, ttl=60, wait_ms=2000)
+    uploads.prefetch(b"now")
+    uploads.prefetch(b"queued", patient=True)
+    
+    # A turn that starts right away never blocks on an unfinished upload
+    assert uploads.reference(b"now") is None
+    threading.Timer(0.05, release.set).start()
+    assert uploads.reference(b"queued") == "files/queued"
+
+def test_failed_upload_is_forgotten_and_retried():
+    upload = MagicMock(side_effect=[RuntimeError("quota"), "files/ok"])
+    uploads = UploadManager(upload, ttl=60)
+    
+    assert uploads.prefetch(b"png").result(timeout=2) is None
+    assert uploads.reference(b"png") is None
+    assert uploads.prefetch(b"png").result(timeout=2) == "files/ok"
+    assert uploads.reference(b"png") == "files/ok"
+
+def test_expired_reference_is_reuploaded():
+    upload = MagicMock(side_effect=["files/old", "files/new"])
+    uploads = UploadManager(upload, ttl=0)
+    uploads.prefetch(b"png").result(timeout=2)
+    
+    assert uploads.reference(b"png") is None
+    assert uploads.prefetch(b"png").result(timeout=2) == "files/new"
+
+def test_cancelled_upload_is_forgotten():
+    release = threading.Event()
+    upload = MagicMock(side_effect=lambda data: release.wait(2) and "files/ok")
+    uploads = UploadManager(upload, ttl=60)
+    uploads.prefetch(b"busy-1")
+    uploads.prefetch(b"busy-2")
+    queued = uploads.prefetch(b"png")
+    
+    assert queued.cancel()
+    assert uploads.reference(b"png") is None
+    release.set()
+    assert uploads.prefetch(b"png") is not queued